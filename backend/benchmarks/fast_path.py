@@ -0,0 +1,92 @@
+# ruff: noqa: T201
+"""
+Per call CPU of the access token and user by email lookups, ORM vs `FastQuery`.
+
+CPU time is `time.process_time`, the database's share of the wall time is left out. Rows are inserted
+in a transaction that is rolled back at the end. Run from `backend/`:
+
+    python -m benchmarks.fast_path [--url URL] [--calls 5000]
+
+`--url` defaults to the configured database.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from minerva import utils
+from minerva.access_token.models import AccessToken
+from minerva.access_token.repository import AccessTokenRepository
+from minerva.core.config import settings
+from minerva.core.db import Base
+from minerva.users.models import User
+from minerva.users.repository import UserRepository
+
+ROUNDS = 5
+ROWS = 1_000
+
+Lookup = Callable[[AsyncSession, int], Awaitable[Any]]
+
+
+async def measure(connection: AsyncConnection, lookup: Lookup, calls: int) -> tuple[float, float]:
+    async with AsyncSession(connection, expire_on_commit=False) as session:
+        for i in range(100):
+            await lookup(session, i)
+
+    cpu_timings, wall_timings = [], []
+    for _ in range(ROUNDS):
+        # A session per lookup, as the authentication middleware does
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        for i in range(calls):
+            async with AsyncSession(connection, expire_on_commit=False) as session:
+                await lookup(session, i % ROWS)
+        cpu_timings.append(time.process_time() - cpu_start)
+        wall_timings.append(time.perf_counter() - wall_start)
+    return min(cpu_timings) / calls * 1_000_000, min(wall_timings) / calls * 1_000_000
+
+
+async def main(url: str, calls: int) -> None:
+    engine = create_async_engine(url)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        tables = [User.__table__, AccessToken.__table__]
+        await connection.run_sync(Base.metadata.create_all, tables=tables)  # type: ignore[arg-type]
+        users = [{"id": uuid4(), "email": f"user{i}@minerva.dev", "hashed_password": "x"} for i in range(ROWS)]
+        await connection.execute(insert(User), users)
+        expiration_date = utils.datetime_now_utc() + timedelta(days=1)
+        await connection.execute(
+            insert(AccessToken),
+            [
+                {"token": f"token{i}", "user_id": user["id"], "expiration_date": expiration_date}
+                for i, user in enumerate(users)
+            ],
+        )
+
+        cases: dict[str, Lookup] = {
+            "token, ORM": lambda s, i: AccessTokenRepository(s).get_one_or_none(id=f"token{i}", load="with_user"),
+            "token, FastQuery": lambda s, i: AccessTokenRepository(s).get_record_with_user(f"token{i}"),
+            "email, ORM": lambda s, i: UserRepository(s).get_one_or_none_by_email(f"user{i}@minerva.dev"),
+            "email, FastQuery": lambda s, i: UserRepository(s).get_record_by_email(f"user{i}@minerva.dev"),
+        }
+        print(f"{calls} lookups, best of {ROUNDS}")
+        print(f"{'mode':<20}{'CPU (us/call)':>15}{'wall (us/call)':>16}")
+        for name, lookup in cases.items():
+            cpu_us, wall_us = await measure(connection, lookup, calls)
+            print(f"{name:<20}{cpu_us:>15.1f}{wall_us:>16.1f}")
+
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=str(settings.DB_URI))
+    parser.add_argument("--calls", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.calls))
@@ -0,0 +1,123 @@
+# ruff: noqa: T201
+"""
+Loading and serializing users as ORM instances vs `Projection` objects.
+
+Rows are inserted in a transaction that is rolled back at the end. Run from `backend/`:
+
+    python -m benchmarks.projection [--url URL] [--rows 10000]
+
+`--url` defaults to the configured database.
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, NamedTuple
+from uuid import UUID, uuid4
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from minerva.core.config import settings
+from minerva.core.db import Base
+from minerva.core.repository.projection import Projection
+from minerva.users.models import User
+from minerva.users.repository import UserRepository
+from minerva.users.schemas import UserRead
+
+ROUNDS = 5
+
+
+@dataclass(slots=True)
+class UserRow:
+    id: UUID
+    email: str
+
+
+class UserTuple(NamedTuple):
+    id: UUID
+    email: str
+
+
+Load = Callable[[AsyncSession], Awaitable[list[Any]]]
+Serialize = Callable[[list[Any]], bytes]
+
+
+async def load_orm(session: AsyncSession) -> list[Any]:
+    return await UserRepository(session).list_()
+
+
+def serialize_orm(users: list[Any]) -> bytes:
+    # What `response_model=list[UserRead]` does with ORM instances
+    return TypeAdapter(list[UserRead]).dump_json([UserRead.model_validate(user) for user in users])
+
+
+def load_projection(target: type[Any]) -> Load:
+    async def load(session: AsyncSession) -> list[Any]:
+        return await UserRepository(session).list_(projection=Projection(target))
+
+    return load
+
+
+def serialize_projection(target: type[Any]) -> Serialize:
+    return TypeAdapter(list[target]).dump_json  # type: ignore[valid-type]
+
+
+async def measure(connection: AsyncConnection, load: Load, serialize: Serialize) -> tuple[float, float, int, int]:
+    load_timings, total_timings = [], []
+    for _ in range(ROUNDS):
+        async with AsyncSession(connection, expire_on_commit=False) as session:
+            start = time.perf_counter()
+            items = await load(session)
+            load_timings.append(time.perf_counter() - start)
+            serialize(items)
+            total_timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    async with AsyncSession(connection, expire_on_commit=False) as session:
+        tracemalloc.start()
+        items = await load(session)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # The identity map holds weak references, count while `items` is alive
+        tracked = len(session.identity_map)
+        del items
+    return min(load_timings) * 1000, min(total_timings) * 1000, peak, tracked
+
+
+async def main(url: str, rows: int) -> None:
+    engine = create_async_engine(url)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        await connection.run_sync(Base.metadata.create_all, tables=[User.__table__])  # type: ignore[list-item]
+        await connection.execute(
+            insert(User),
+            [{"id": uuid4(), "email": f"user{i}@minerva.dev", "hashed_password": "x"} for i in range(rows)],
+        )
+
+        cases: dict[str, tuple[Load, Serialize]] = {
+            "ORM": (load_orm, serialize_orm),
+            "Projection(UserRead)": (load_projection(UserRead), serialize_projection(UserRead)),
+            "Projection(slots dataclass)": (load_projection(UserRow), serialize_projection(UserRow)),
+            "Projection(NamedTuple)": (load_projection(UserTuple), serialize_projection(UserTuple)),
+        }
+        print(f"{rows} users, best of {ROUNDS}, peak memory of loading")
+        print(f"{'mode':<30}{'load (ms)':>12}{'+ JSON (ms)':>13}{'peak (MiB)':>12}{'ORM objects':>13}")
+        for name, (load, serialize) in cases.items():
+            load_ms, total_ms, peak, tracked = await measure(connection, load, serialize)
+            print(f"{name:<30}{load_ms:>12.1f}{total_ms:>13.1f}{peak / 2**20:>12.1f}{tracked:>13}")
+
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=str(settings.DB_URI))
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.rows))
@@ -0,0 +1,64 @@
+# ruff: noqa: T201
+"""
+Per call overhead of building repository statements, without touching the database.
+
+"before" forces the generic path (a custom `statement` disables templates), which builds the `Select`
+and computes its SQLAlchemy cache key on every call. "after" reuses the statement template of the
+repository class and filter shape, whose cache key is memoized.
+
+Run from `backend/`:
+
+    python -m benchmarks.statement_construction
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from minerva.core.repository.filters import Filter
+from minerva.users.repository import UserRepository
+
+ROUNDS = 20_000
+
+
+async def measure(build: Callable[[], Awaitable[tuple[Any, dict[str, Any]]]]) -> float:
+    for _ in range(100):
+        await build()
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        statement, _ = await build()
+        statement._generate_cache_key()  # done by `session.execute` on every call
+    return (time.perf_counter() - start) / ROUNDS * 1_000_000
+
+
+async def main() -> None:
+    repository = UserRepository(AsyncSession())
+    default_statement = repository.statement
+    since = datetime.now(timezone.utc) - timedelta(days=1)
+
+    cases: dict[str, Callable[[dict[str, Any]], Awaitable[tuple[Any, dict[str, Any]]]]] = {
+        "get (by id)": lambda extra: repository._build_statement("select", {"id": uuid4(), **extra}),
+        "count (email__startswith)": lambda extra: repository._build_statement(
+            "count", {"email__startswith": "a", **extra}
+        ),
+        "list_ (filters)": lambda extra: repository._build_statement(
+            "select",
+            {"filters": Filter(where={"created_at__gte": since}, order_by=["-created_at"], limit=50), **extra},
+            ordered=True,
+        ),
+    }
+
+    print(f"{'statement':<28}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, build in cases.items():
+        before = await measure(lambda build=build: build({"statement": default_statement}))
+        after = await measure(lambda build=build: build({}))
+        print(f"{name:<28}{before:>14.2f}{after:>14.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -13,7 +13,8 @@ from minerva.core.config import settings
 from minerva.core.db import Base
 from minerva.users.models import User
 
-DB_URI = settings.DB_URI
+# Migrations bypass PgBouncer, DDL and their locks need a session of their own
+DB_URI = settings.DB_URI_DIRECT
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
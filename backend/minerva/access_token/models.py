@@ -30,7 +30,8 @@ class AccessToken(Base, db_mixins.TimestampMixin):
         DateTime(timezone=True), default=generate_token_expiration_date_default
     )
 
-    user: Mapped["User"] = relationship("User", lazy="selectin")
+    # Load it explicitly where needed, e.g. with the `with_user` profile of `AccessTokenRepository`
+    user: Mapped["User"] = relationship("User", lazy="raise")
 
     @hybrid_property
     def expiration_date_int_from_now(self) -> int:
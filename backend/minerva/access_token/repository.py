@@ -1,7 +1,52 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar, Mapping
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy.orm import joinedload
+
 from minerva.access_token.models import AccessToken
+from minerva.core.repository.fast_path import FastQuery
+from minerva.core.repository.loading import LoadProfile
 from minerva.core.repository.sqlalchemy import SQLAlchemyRepository
+from minerva.users.repository import UserRecord
+
+
+@dataclass(frozen=True, slots=True)
+class AccessTokenRecord:
+    """Read-only `AccessToken` row with its user, returned by the fast path"""
+
+    token: str
+    user_id: UUID
+    expiration_date: datetime
+    created_at: datetime
+    updated_at: datetime
+    user: UserRecord
+
+
+def _access_token_record(row: asyncpg.Record) -> AccessTokenRecord:
+    (token, user_id, expiration_date, created_at, updated_at, *user) = row
+    return AccessTokenRecord(token, user_id, expiration_date, created_at, updated_at, UserRecord(*user))
+
+
+ACCESS_TOKEN_WITH_USER = FastQuery(
+    "SELECT t.token, t.user_id, t.expiration_date, t.created_at, t.updated_at,"
+    " u.id, u.email, u.hashed_password, u.created_at, u.updated_at"
+    " FROM access_tokens t JOIN users u ON u.id = t.user_id"
+    " WHERE t.token = $1",
+    table=AccessToken.__table__,  # type: ignore[arg-type]
+    build=_access_token_record,
+)
 
 
 class AccessTokenRepository(SQLAlchemyRepository[AccessToken, str]):
     model = AccessToken
     model_id_attr_name = "token"
+    load_profiles: ClassVar[Mapping[str, LoadProfile]] = {
+        "with_user": lambda: [joinedload(AccessToken.user)],
+    }
+
+    async def get_record_with_user(self, token: str) -> AccessTokenRecord | None:
+        """`get_one_or_none(id=token, load="with_user")` on the fast path, see `FastQuery`"""
+        return await ACCESS_TOKEN_WITH_USER.fetch_one_or_none(self.session, token)
@@ -1,6 +1,10 @@
+from uuid import UUID
+
 from minerva import utils
 from minerva.access_token import exceptions, models
-from minerva.access_token.repository import AccessTokenRepository
+from minerva.access_token.repository import AccessTokenRecord, AccessTokenRepository
+from minerva.core.config import settings
+from minerva.core.db.retry import retrying
 from minerva.core.service import Service
 
 
@@ -9,11 +13,15 @@ class AccessTokenService(Service[models.AccessToken, str]):
         """AccessTokenService"""
         self.repository = repository
 
-    async def validate_access_token(self, access_token: str) -> models.AccessToken:
+    async def validate_access_token(self, access_token: str) -> models.AccessToken | AccessTokenRecord:
         if access_token is None:
             raise exceptions.InvalidAccessTokenError()
 
-        db_token = await self.repository.get_one_or_none(id=access_token)
+        db_token: models.AccessToken | AccessTokenRecord | None
+        if settings.DB_FAST_PATH:
+            db_token = await self.repository.get_record_with_user(access_token)
+        else:
+            db_token = await self.repository.get_one_or_none(id=access_token, load="with_user")
 
         if db_token is None:
             raise exceptions.InvalidAccessTokenError()
@@ -22,3 +30,7 @@ class AccessTokenService(Service[models.AccessToken, str]):
             raise exceptions.ExpiredAccessTokenError()
 
         return db_token
+
+    @retrying
+    async def create_for_user(self, user_id: UUID) -> models.AccessToken:
+        return await self.create(models.AccessToken(user_id=user_id))
@@ -0,0 +1,106 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+
+class CacheBackend(ABC):
+    """
+    Storage used by the caches in `minerva.core.cache`.
+
+    Values are plain, picklable data (never `None`), so a shared store can implement the same interface.
+    """
+
+    nowait = False
+    """Whether `set_nowait` and `delete_nowait` can be used, i.e. the backend does no I/O"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """
+        Get a value from the cache.
+
+        Args:
+            key (str): The key to get.
+
+        Returns:
+            Any | None: The value, `None` if the key is missing or expired.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, *, ttl: float | None = None) -> None:
+        """
+        Set a value in the cache.
+
+        Args:
+            key (str): The key to set.
+            value (Any): The value to set.
+            ttl (float | None): Seconds after which the value expires, backend default if `None`.
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Delete a value from the cache.
+
+        Args:
+            key (str): The key to delete.
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Delete every value from the cache"""
+
+    def set_nowait(self, key: str, value: Any, *, ttl: float | None = None) -> None:
+        """Like `set`, without yielding to the event loop. Only available with `nowait`."""
+        raise NotImplementedError
+
+    def delete_nowait(self, key: str) -> None:
+        """Like `delete`, without yielding to the event loop. Only available with `nowait`."""
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per process LRU cache with TTL and a size cap"""
+
+    nowait = True
+
+    def __init__(self, *, maxsize: int = 1024, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Any | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._items[key]
+            return None
+
+        self._items.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, *, ttl: float | None = None) -> None:
+        self.set_nowait(key, value, ttl=ttl)
+
+    def set_nowait(self, key: str, value: Any, *, ttl: float | None = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        self._items[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self.delete_nowait(key)
+
+    def delete_nowait(self, key: str) -> None:
+        self._items.pop(key, None)
+
+    async def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,181 @@
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy import inspect as sqla_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from minerva.core.cache import session as cache_session
+from minerva.core.cache.backends import CacheBackend, MemoryCacheBackend
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+_caches: "weakref.WeakSet[EntityCache]" = weakref.WeakSet()
+
+
+class EntityCache:
+    """
+    Cross request (second-level) cache of entities keyed by primary key.
+
+    Opt in by setting it on a `SQLAlchemyRepository` subclass:
+
+        ```python
+        class UserRepository(SQLAlchemyRepository[User, UUID]):
+            model = User
+            cache = EntityCache(ttl=30, maxsize=10_000)
+        ```
+
+    Only column attributes are cached. Relationships are not, so only use it for models whose
+    relationships are never accessed on instances read through the repository.
+
+    Reads fill the cache, concurrent misses on the same key in this process are coalesced into one query.
+    Repository writes are staged on the session and written through (or invalidated) once the transaction
+    commits; until then the writing session bypasses the cache for those keys. Rows changed outside the
+    repository are picked up once the entry expires.
+
+    With the default in-memory backend every worker process has its own cache and a commit only updates
+    the cache of the worker that made it. The others serve the old row until their entry expires, so
+    reads can be up to `ttl` seconds stale. Keep `ttl` short, or pass a shared `backend`.
+    """
+
+    def __init__(self, *, ttl: float = 60, maxsize: int = 1024, backend: CacheBackend | None = None) -> None:
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
+        self._inflight: dict[str, asyncio.Future[tuple[bool, dict[str, Any] | None]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        _caches.add(self)
+
+    @staticmethod
+    def key(model: type[Any], id: Any) -> str:  # noqa: A002
+        return f"{model.__tablename__}:{id}"
+
+    async def get(
+        self,
+        session: AsyncSession,
+        model: type[T],
+        id: U,  # noqa: A002
+        load: Callable[[U], Awaitable[T | None]],
+    ) -> T | None:
+        """
+        Get an instance from the cache, attached to `session`. Calls `load` on a miss.
+
+        Args:
+            session (AsyncSession): The session to attach the instance to.
+            model (type[T]): The model of the instance.
+            id (U): The primary key of the instance.
+            load (Callable[[U], Awaitable[T | None]]): Loads the instance from the database.
+
+        Returns:
+            T | None: The instance.
+        """
+        key = self.key(model, id)
+        identity_key = sqla_inspect(model).identity_key_from_primary_key((id,))
+
+        if key in cache_session.staged(session, self) or identity_key in session.identity_map:
+            return await load(id)
+
+        values = await self.backend.get(key)
+        if values is not None:
+            self.hits += 1
+            return await cache_session.materialize(session, model, values)
+
+        self.misses += 1
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await self._follow(inflight, session, model, id, load)
+
+        return await self._lead(key, id, load)
+
+    async def _lead(self, key: str, id: U, load: Callable[[U], Awaitable[T | None]]) -> T | None:  # noqa: A002
+        future: asyncio.Future[tuple[bool, dict[str, Any] | None]] = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            instance = await load(id)
+            values = cache_session.snapshot(instance) if instance is not None else None
+            if values is not None:
+                await self.backend.set(key, values, ttl=self.ttl)
+            future.set_result((instance is not None, values))
+            return instance
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _follow(  # noqa: PLR0913
+        self,
+        inflight: asyncio.Future[tuple[bool, dict[str, Any] | None]],
+        session: AsyncSession,
+        model: type[T],
+        id: U,  # noqa: A002
+        load: Callable[[U], Awaitable[T | None]],
+    ) -> T | None:
+        try:
+            found, values = await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            # Only fall back to our own load if the leader was cancelled, not us
+            if not inflight.cancelled():
+                raise
+            return await load(id)
+        except Exception:
+            return await load(id)
+
+        if values is not None:
+            return await cache_session.materialize(session, model, values)
+        return await load(id) if found else None
+
+    def stage(self, session: AsyncSession, model: type[Any], instance: Any, *, write_through: bool = False) -> None:
+        """
+        Stage a written instance, applied to the cache once `session` commits.
+
+        Args:
+            session (AsyncSession): The session the write was made in.
+            model (type[Any]): The model of the instance.
+            instance (Any): The written instance.
+            write_through (bool): Store the instance's committed state instead of invalidating the entry.
+        """
+        mapper = sqla_inspect(model)
+        id = mapper.primary_key_from_instance(instance)[0]  # noqa: A001
+        cache_session.stage(
+            session, self, self.key(model, id), cache_session.snapshot(instance) if write_through else None
+        )
+
+    async def apply(self, entries: dict[str, dict[str, Any] | None]) -> None:
+        for key, values in entries.items():
+            if values is None:
+                await self.backend.delete(key)
+            else:
+                await self.backend.set(key, values, ttl=self.ttl)
+
+    def apply_nowait(self, entries: dict[str, dict[str, Any] | None]) -> bool:
+        if not self.backend.nowait:
+            return False
+        for key, values in entries.items():
+            if values is None:
+                self.backend.delete_nowait(key)
+            else:
+                self.backend.set_nowait(key, values, ttl=self.ttl)
+        return True
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+
+async def clear_entity_caches() -> None:
+    for cache in list(_caches):
+        await cache.clear()
+
+
+def entity_cache_counts() -> tuple[int, int]:
+    """Hits and misses of all entity caches of this process"""
+    caches = list(_caches)
+    return sum(cache.hits for cache in caches), sum(cache.misses for cache in caches)
@@ -0,0 +1,63 @@
+from typing import Any
+
+from sqlalchemy import inspect as sqla_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+IDENTITY_CACHE_KEY = "minerva.identity_cache"
+
+
+class IdentityCache:
+    """
+    Request scoped read cache of ORM instances keyed by `(model, primary key)`.
+
+    It lives in `session.info`, so every repository built around the same session shares it.
+    `minerva.core.db.dependencies.get_session` installs it and drops it when the request ends.
+    """
+
+    def __init__(self) -> None:
+        self._items: dict[tuple[type[Any], Any], Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model: type[Any], id: Any) -> Any | None:  # noqa: A002
+        instance = self._items.get((model, id))
+
+        # Expired (e.g. after a rollback) or deleted instances would need a round trip anyway
+        if instance is not None:
+            state = sqla_inspect(instance)
+            if state.expired_attributes or state.deleted or state.was_deleted:
+                del self._items[(model, id)]
+                instance = None
+
+        if instance is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return instance
+
+    def set(self, model: type[Any], id: Any, instance: Any) -> None:  # noqa: A002
+        self._items[(model, id)] = instance
+
+    def invalidate(self, model: type[Any], id: Any) -> None:  # noqa: A002
+        self._items.pop((model, id), None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def get_identity_cache(session: AsyncSession) -> IdentityCache | None:
+    return session.info.get(IDENTITY_CACHE_KEY)
+
+
+def install_identity_cache(session: AsyncSession) -> IdentityCache:
+    cache = session.info[IDENTITY_CACHE_KEY] = IdentityCache()
+    return cache
+
+
+def drop_identity_cache(session: AsyncSession) -> None:
+    cache = session.info.pop(IDENTITY_CACHE_KEY, None)
+    if cache is not None:
+        cache.clear()
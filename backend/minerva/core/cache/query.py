@@ -0,0 +1,206 @@
+import hashlib
+import json
+import uuid
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Mapping, TypeVar
+
+from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.util import find_tables
+from sqlalchemy.util import LRUCache
+
+from minerva.core.cache import session as cache_session
+from minerva.core.cache.backends import CacheBackend, MemoryCacheBackend
+
+R = TypeVar("R")
+
+_dialect = postgresql.dialect()
+_caches: "weakref.WeakSet[QueryCache]" = weakref.WeakSet()
+_statements: LRUCache[Any, str] = LRUCache(512)
+"""SQL of each statement shape by its SQLAlchemy cache key, so a lookup doesn't compile the statement"""
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """
+    Per call query cache settings.
+
+    Attributes:
+        ttl (float): Seconds the result is cached for.
+        max_rows (int | None): Results with more rows than this are not cached.
+    """
+
+    ttl: float
+    max_rows: int | None = None
+
+
+@dataclass(slots=True)
+class QueryCacheStats:
+    statement: str
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class QueryCache:
+    """
+    Cache of query results keyed by a hash of the compiled statement and its parameters.
+
+    Every entry is tagged with the tables the statement reads from. Repository writes bump the
+    versions of their model's table tag once the transaction commits, which invalidates all entries
+    carrying that tag; the writing session bypasses the cache for those tags until then. With the default
+    in-memory backend this only happens in the worker that wrote, the others serve results up to the
+    policy's `ttl` old.
+
+    Hits and misses are counted per statement shape (`stats`) to tell which queries are worth caching.
+    """
+
+    def __init__(self, *, maxsize: int = 4096, backend: CacheBackend | None = None) -> None:
+        self.backend = backend if backend is not None else MemoryCacheBackend(maxsize=maxsize)
+        self._stats: dict[str, QueryCacheStats] = {}
+        _caches.add(self)
+
+    async def get_or_execute(  # noqa: PLR0913
+        self,
+        session: AsyncSession,
+        statement: Select[Any],
+        execute: Callable[[], Awaitable[R]],
+        *,
+        policy: CachePolicy,
+        tags: Iterable[str] = (),
+        params: Mapping[str, Any] | None = None,
+        namespace: str = "",
+        dump: Callable[[R], Any] = lambda result: result,
+        load: Callable[[Any], Awaitable[R]] | None = None,
+    ) -> R:
+        """
+        Get the result of `statement` from the cache, `execute` it on a miss.
+
+        Args:
+            session (AsyncSession): The session the statement is executed in.
+            statement (Select[Any]): The statement, used to build the cache key and tags.
+            execute (Callable[[], Awaitable[R]]): Executes the statement.
+            policy (CachePolicy): TTL and size limit of the entry.
+            tags (Iterable[str]): Tags on top of the tables `statement` reads from.
+            params (Mapping[str, Any] | None): Parameters `statement` is executed with.
+            namespace (str): Separates results of the same statement cached in different shapes.
+            dump (Callable[[R], Any]): Converts the result into a cacheable value, `None` to skip caching.
+            load (Callable[[Any], Awaitable[R]] | None): Converts a cached value back into a result.
+
+        Returns:
+            R: The result.
+        """
+        sql, values = _statement_key(statement, params or {})
+        params_json = json.dumps(values, sort_keys=True, default=str)
+        key = "query:" + hashlib.sha256(f"{namespace}\0{sql}\0{params_json}".encode()).hexdigest()
+        tags = {*tags, *(table.name for table in find_tables(statement, include_joins=True))}
+        stats = self._stats.setdefault(sql, QueryCacheStats(sql))
+
+        if any(self._tag_key(tag) in cache_session.staged(session, self) for tag in tags):
+            stats.misses += 1
+            return await execute()
+
+        versions = await self._tag_versions(tags)
+        entry = await self.backend.get(key)
+        if entry is not None and entry["tags"] == versions:
+            stats.hits += 1
+            return await load(entry["value"]) if load is not None else entry["value"]
+
+        stats.misses += 1
+        result = await execute()
+
+        value = dump(result)
+        too_large = policy.max_rows is not None and isinstance(value, list) and len(value) > policy.max_rows
+        if value is not None and not too_large:
+            await self.backend.set(key, {"tags": versions, "value": value}, ttl=policy.ttl)
+
+        return result
+
+    def invalidate(self, session: AsyncSession, *tags: str) -> None:
+        """Invalidate entries tagged with any of `tags` once `session` commits"""
+        for tag in tags:
+            cache_session.stage(session, self, self._tag_key(tag))
+
+    async def apply(self, entries: dict[str, Any]) -> None:
+        for tag_key in entries:
+            await self.backend.set(tag_key, uuid.uuid4().hex)
+
+    def apply_nowait(self, entries: dict[str, Any]) -> bool:
+        if not self.backend.nowait:
+            return False
+        for tag_key in entries:
+            self.backend.set_nowait(tag_key, uuid.uuid4().hex)
+        return True
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+        self._stats.clear()
+
+    def stats(self) -> list[QueryCacheStats]:
+        return list(self._stats.values())
+
+    async def _tag_versions(self, tags: Iterable[str]) -> dict[str, str]:
+        versions = {}
+        for tag in sorted(tags):
+            tag_key = self._tag_key(tag)
+            version = await self.backend.get(tag_key)
+            if version is None:
+                # Never reuse a version, even when the tag itself was evicted
+                version = uuid.uuid4().hex
+                await self.backend.set(tag_key, version)
+            versions[tag] = version
+        return versions
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"tag:{tag}"
+
+
+def _statement_key(statement: Select[Any], params: Mapping[str, Any]) -> tuple[str, Any]:
+    """
+    SQL and parameter values identifying `statement`, the same in every process.
+
+    Like `CacheKey.to_offline_string`: the statement is only compiled the first time its shape is seen,
+    SQLAlchemy memoizes the cache key on the statement so reused templates don't even rebuild that.
+    """
+    cache_key = statement._generate_cache_key()
+    if cache_key is None:
+        compiled = statement.compile(dialect=_dialect)
+        return str(compiled), compiled.construct_params(params)
+
+    sql = _statements.get(cache_key.key)
+    if sql is None:
+        sql = _statements[cache_key.key] = str(statement.compile(dialect=_dialect))
+    if not cache_key.bindparams:
+        return sql, dict(params)
+    return sql, [params.get(bindparam.key, bindparam.effective_value) for bindparam in cache_key.bindparams]
+
+
+query_cache = QueryCache()
+
+
+async def clear_query_caches() -> None:
+    for cache in list(_caches):
+        await cache.clear()
+
+
+def query_cache_counts() -> tuple[int, int]:
+    """Hits and misses of all query caches of this process"""
+    stats = [shape for cache in list(_caches) for shape in cache.stats()]
+    return sum(shape.hits for shape in stats), sum(shape.misses for shape in stats)
+
+
+def query_cache_shape_counts() -> dict[str, tuple[int, int]]:
+    """Hits and misses of all query caches of this process by statement shape, on one line"""
+    counts: dict[str, tuple[int, int]] = {}
+    for shape in (shape for cache in list(_caches) for shape in cache.stats()):
+        statement = " ".join(shape.statement.split())
+        hits, misses = counts.get(statement, (0, 0))
+        counts[statement] = (hits + shape.hits, misses + shape.misses)
+    return counts
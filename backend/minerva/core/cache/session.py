@@ -0,0 +1,85 @@
+import asyncio
+from logging import getLogger
+from typing import Any, Protocol, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy import inspect as sqla_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+log = getLogger(__name__)
+
+T = TypeVar("T")
+
+PENDING_KEY = "minerva.cache.pending"
+
+_tasks: set[asyncio.Task[None]] = set()
+
+
+class StagedCache(Protocol):
+    async def apply(self, entries: dict[str, Any]) -> None: ...
+
+    def apply_nowait(self, entries: dict[str, Any]) -> bool:
+        """Apply `entries` right away if the backend allows it, returns whether it did"""
+        ...
+
+
+def stage(session: AsyncSession | Session, cache: StagedCache, key: str, value: Any = None) -> None:
+    """Stage a cache entry, `cache.apply` receives it once the session's transaction commits"""
+    session.info.setdefault(PENDING_KEY, {}).setdefault(cache, {})[key] = value
+
+
+def staged(session: AsyncSession | Session, cache: StagedCache) -> dict[str, Any]:
+    return session.info.get(PENDING_KEY, {}).get(cache, {})
+
+
+def snapshot(instance: Any) -> dict[str, Any] | None:
+    """Column state of `instance`, `None` if any column attribute is not loaded"""
+    state = sqla_inspect(instance)
+    keys = [attr.key for attr in state.mapper.column_attrs]
+    if state.unloaded.intersection(keys):
+        return None
+    return {key: state.dict[key] for key in keys}
+
+
+async def materialize(session: AsyncSession, model: type[T], values: dict[str, Any]) -> T:
+    """Attach an instance built from `snapshot` values to `session` without emitting SQL"""
+    mapper = sqla_inspect(model)
+    identity_key = mapper.identity_key_from_primary_key(
+        tuple(values[mapper.get_property_by_column(column).key] for column in mapper.primary_key)
+    )
+    # Like a regular query, an instance already in the identity map wins
+    if (existing := session.identity_map.get(identity_key)) is not None:
+        return existing
+
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    return await session.merge(instance, load=False)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    # Applied before the commit returns when possible, a task would leave the old entries readable until it runs
+    pending = {cache: entries for cache, entries in pending.items() if not cache.apply_nowait(entries)}
+    if not pending:
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        log.warning("No running event loop, staged cache entries will expire on their own")
+        return
+
+    for cache, entries in pending.items():
+        task = loop.create_task(cache.apply(entries))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
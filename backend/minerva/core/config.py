@@ -1,8 +1,9 @@
 # ruff: noqa: N802
 
 from enum import StrEnum
+from typing import Literal
 
-from pydantic import SecretStr, computed_field
+from pydantic import BaseModel, ConfigDict, Field, SecretStr, computed_field
 from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -34,6 +35,66 @@ class Environment(StrEnum):
         return self == "PRODUCTION"
 
 
+class PoolProfile(BaseModel):
+    """Connection pool and asyncpg connection options of an engine"""
+
+    model_config = ConfigDict(frozen=True)
+
+    size: int = Field(ge=1)
+    max_overflow: int = Field(ge=0)
+    timeout: float = Field(gt=0)
+    """Seconds to wait for a connection when the pool is exhausted"""
+    recycle: int = Field(ge=-1)
+    """Seconds after which a connection is replaced, -1 to keep it"""
+    pre_ping: bool
+    """Check connections with a round trip on checkout, to never hand out one dropped while idle"""
+    statement_cache_size: int = Field(ge=0)
+    """Prepared statements cached per connection, 0 disables prepared statement caching"""
+    server_settings: dict[str, str] = {}
+
+
+POOL_PRESETS: dict[Environment, PoolProfile] = {
+    Environment.LOCAL: PoolProfile(
+        size=5,
+        max_overflow=5,
+        timeout=30,
+        recycle=-1,
+        pre_ping=False,
+        statement_cache_size=100,
+        server_settings={"application_name": "minerva"},
+    ),
+    Environment.TESTING: PoolProfile(
+        size=5,
+        max_overflow=5,
+        timeout=30,
+        recycle=-1,
+        pre_ping=False,
+        statement_cache_size=100,
+        server_settings={"application_name": "minerva-tests"},
+    ),
+    Environment.STAGING: PoolProfile(
+        size=10,
+        max_overflow=10,
+        timeout=10,
+        recycle=1800,
+        pre_ping=True,
+        statement_cache_size=500,
+        server_settings={"application_name": "minerva", "jit": "off"},
+    ),
+    Environment.PRODUCTION: PoolProfile(
+        size=20,
+        max_overflow=10,
+        timeout=5,
+        recycle=1800,
+        pre_ping=True,
+        statement_cache_size=500,
+        # JIT compilation costs more than it saves on short OLTP queries
+        server_settings={"application_name": "minerva", "jit": "off"},
+    ),
+}
+"""Pool profile of each environment, `DB_POOL_*` settings override single options"""
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=(
@@ -49,19 +110,100 @@ class Settings(BaseSettings):
 
     ENVIRONMENT: Environment = Environment.LOCAL
 
+    SERVER_HOST: str = "0.0.0.0"  # noqa: S104
+    SERVER_PORT: int = 8080
+    SERVER_WORKERS: int | None = Field(default=None, ge=1)
+    """Worker processes of `minerva.serve`, one per CPU by default"""
+    SERVER_MAX_REQUESTS: int = Field(default=0, ge=0)
+    """Requests after which a worker is replaced, 0 to never replace it"""
+    SERVER_MAX_REQUESTS_JITTER: int = Field(default=0, ge=0)
+    SERVER_MAX_MEMORY_MB: int = Field(default=0, ge=0)
+    """Resident memory above which a worker is replaced, 0 for no limit"""
+
+    REQUEST_TIMEOUT: float = Field(default=10, gt=0)
+    """Default time budget of a request in seconds, routes may set their own"""
+    REQUEST_TIMEOUT_MAX: float = Field(default=60, gt=0)
+    """Upper bound of the budget a client may ask for with `REQUEST_TIMEOUT_HEADER`"""
+    REQUEST_TIMEOUT_HEADER: str = "X-Request-Timeout"
+
+    LOAD_SHEDDING_ENABLED: bool = True
+    LOAD_SHEDDING_POOL_USAGE: float = Field(default=0.9, gt=0, le=1)
+    """Share of the pool's connections in use, overflow included, from which requests are turned away"""
+    LOAD_SHEDDING_RETRY_AFTER: int = Field(default=1, ge=0)
+
+    TRACING_EXPORTER: Literal["console", "file", "otlp", "logfire"] | None = None
+    """Where spans are sent, tracing is off without an exporter"""
+    TRACING_SAMPLE_RATE: float = Field(default=1.0, ge=0, le=1)
+    """Share of traces kept, decided once per trace"""
+    TRACING_FILE: str = "traces.jsonl"
+    """File the `file` exporter appends spans to, one JSON object per line"""
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    """OTLP/HTTP endpoint of the `otlp` exporter, e.g. a local OpenTelemetry collector"""
+    LOGFIRE_TOKEN: SecretStr | None = None
+
+    METRICS_ENABLED: bool = True
+    METRICS_ENDPOINT: bool = False
+    """Serve `/metrics`, unauthenticated, only enable it where the app's port is not reachable from outside"""
+    METRICS_DIR: str | None = None
+    """Directory the workers share their metrics through, `minerva.serve` makes a temporary one if unset"""
+    METRICS_FLUSH_INTERVAL: float = Field(default=5, gt=0)
+    """Seconds between writes of a worker's metrics to `METRICS_DIR`, how stale the other workers' part is"""
+
+    SHUTDOWN_DRAIN_TIMEOUT: float = Field(default=20, ge=0)
+    """Seconds uvicorn waits for in-flight requests on shutdown before the pool is closed"""
+
+    HEALTH_PROBE_INTERVAL: float = Field(default=5, gt=0)
+    HEALTH_PROBE_TIMEOUT: float = Field(default=2, gt=0)
+    HEALTH_DEGRADED_LATENCY: float = Field(default=0.25, gt=0)
+    """Seconds a database round trip may take before the app reports degraded"""
+    HEALTH_DEGRADED_POOL_USAGE: float = Field(default=0.8, gt=0, le=1)
+    """Share of the pool's connections in use above which the app reports degraded"""
+
     DB_HOST: str
     DB_PORT: int = 5432
     DB_DATABASE: str
     DB_USER: str
     DB_PASSWORD: SecretStr
-
-    def _db_uri(self, *, async_: bool = True) -> MultiHostUrl:
+    DB_ECHO: bool | None = None
+    DB_FAST_PATH: bool = False
+    """Run the access token and user by email lookups directly on asyncpg, see `FastQuery`"""
+
+    DB_PGBOUNCER: bool = False
+    """`DB_HOST` is a PgBouncer in transaction pooling mode, see `engine_kwargs`"""
+    DB_DIRECT_HOST: str | None = None
+    DB_DIRECT_PORT: int | None = None
+    """Postgres itself behind PgBouncer, for migrations and database administration"""
+
+    DB_POOL_SIZE: int | None = Field(default=None, ge=1)
+    DB_POOL_MAX_OVERFLOW: int | None = Field(default=None, ge=0)
+    DB_POOL_TIMEOUT: float | None = Field(default=None, gt=0)
+    DB_POOL_RECYCLE: int | None = Field(default=None, ge=-1)
+    DB_POOL_PRE_PING: bool | None = None
+    DB_STATEMENT_CACHE_SIZE: int | None = Field(default=None, ge=0)
+    DB_SERVER_SETTINGS: dict[str, str] = {}
+    DB_WARMUP_CONNECTIONS: int | None = Field(default=None, ge=0)
+    """Connections opened on startup, the pool size by default"""
+
+    DB_REPLICA_URIS: list[str] = []
+    DB_REPLICA_SELECTION: Literal["round_robin", "least_busy"] = "round_robin"
+    DB_REPLICA_EJECT_SECONDS: float = Field(default=30, gt=0)
+
+    DB_RETRY_ATTEMPTS: int = Field(default=3, ge=1)
+    DB_RETRY_BACKOFF_BASE: float = Field(default=0.02, ge=0)
+    DB_RETRY_BACKOFF_MAX: float = Field(default=0.5, ge=0)
+    DB_RETRY_BUDGET_RATIO: float = Field(default=0.1, ge=0)
+    DB_RETRY_BUDGET_CAPACITY: float = Field(default=10, ge=1)
+
+    DB_FAN_OUT_CONCURRENCY: int = Field(default=4, ge=1)
+    DB_FAN_OUT_MAX_CONNECTIONS: int = Field(default=8, ge=1)
+
+    def _db_uri(self, *, async_: bool = True, direct: bool = False) -> MultiHostUrl:
         return MultiHostUrl.build(
             scheme=f"postgresql+{'asyncpg' if async_ else 'psycopg'}",
             username=self.DB_USER,
             password=self.DB_PASSWORD.get_secret_value(),
-            host=self.DB_HOST,
-            port=self.DB_PORT,
+            host=(direct and self.DB_DIRECT_HOST) or self.DB_HOST,
+            port=(direct and self.DB_DIRECT_PORT) or self.DB_PORT,
             path=self.DB_DATABASE,
         )
 
@@ -69,9 +211,36 @@ class Settings(BaseSettings):
     def DB_URI(self) -> MultiHostUrl:
         return self._db_uri()
 
+    @computed_field
+    def DB_URI_DIRECT(self) -> MultiHostUrl:
+        return self._db_uri(direct=True)
+
     @computed_field
     def DB_URI_SYNC(self) -> MultiHostUrl:
-        return self._db_uri(async_=False)
+        return self._db_uri(async_=False, direct=True)
+
+    @computed_field
+    def DB_POOL(self) -> PoolProfile:
+        preset = POOL_PRESETS[self.ENVIRONMENT]
+        overrides = {
+            "size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_POOL_MAX_OVERFLOW,
+            "timeout": self.DB_POOL_TIMEOUT,
+            "recycle": self.DB_POOL_RECYCLE,
+            "pre_ping": self.DB_POOL_PRE_PING,
+            "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+        }
+        return preset.model_copy(
+            update={
+                **{name: value for name, value in overrides.items() if value is not None},
+                "server_settings": {**preset.server_settings, **self.DB_SERVER_SETTINGS},
+            }
+        )
+
+    @computed_field
+    def DB_ECHO_SQL(self) -> bool:
+        # Full SQL logging is for local development only, unless asked for
+        return self.ENVIRONMENT.is_local if self.DB_ECHO is None else self.DB_ECHO
 
 
 settings = Settings()  # type: ignore
@@ -0,0 +1,64 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from minerva.core.config import settings
+from minerva.core.db.main import read_only_session as db_read_only_session
+
+R = TypeVar("R")
+
+# Shared by all fan-outs of the process, so requests that already hold a pooled connection can't
+# take the rest of the pool while waiting for more and starve each other
+_connections = asyncio.Semaphore(settings.DB_FAN_OUT_MAX_CONNECTIONS)
+
+
+async def _read(
+    call: Callable[[AsyncSession], Awaitable[R]],
+    limit: asyncio.Semaphore,
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> R:
+    async with limit, _connections, sessionmaker() as session:
+        # Closing the session rolls the read-only transaction back, there is nothing to commit
+        return await call(session)
+
+
+async def gather_reads(
+    *calls: Callable[[AsyncSession], Awaitable[R]],
+    limit: int | None = None,
+    sessionmaker: async_sessionmaker[AsyncSession] = db_read_only_session,
+) -> list[R]:
+    """
+    Run independent reads concurrently, each in a read-only transaction of its own session.
+
+    An `AsyncSession` runs one statement at a time, so reads made through the request session add up.
+    Here every call gets its own pooled connection and the fan-out takes as long as the slowest call.
+    If a call fails the others are cancelled and the error is raised.
+
+    Returned instances are detached from the closed sessions, load the relationships they need with `load`.
+
+    Example:
+        ```python
+        users, tokens = await gather_reads(
+            lambda session: UserRepository(session).count(),
+            lambda session: AccessTokenRepository(session).count(),
+        )
+        ```
+
+    Args:
+        *calls (Callable[[AsyncSession], Awaitable[R]]): Read-only calls, each called with its own session.
+        limit (int | None): Maximum number of calls running at once, `DB_FAN_OUT_CONCURRENCY` by default.
+        sessionmaker (async_sessionmaker[AsyncSession]): Factory of the sessions, read-only by default.
+
+    Returns:
+        list[R]: The results, in the order of `calls`.
+    """
+    semaphore = asyncio.Semaphore(limit or settings.DB_FAN_OUT_CONCURRENCY)
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(_read(call, semaphore, sessionmaker)) for call in calls]
+    except* Exception as group_exc:
+        # Surface the first failure like `asyncio.gather` would, the rest were cancelled or failed after it
+        raise group_exc.exceptions[0] from None
+
+    return [task.result() for task in tasks]
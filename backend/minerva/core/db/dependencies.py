@@ -2,25 +2,77 @@ from logging import getLogger
 from typing import Annotated
 
 from fastapi import Depends
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from minerva.core.cache.identity import drop_identity_cache, install_identity_cache
+from minerva.core.db.main import read_only_session as db_read_only_session
 from minerva.core.db.main import session as db_session
 from minerva.core.exceptions import MinervaError
-from minerva.core.repository.exceptions import RepositoryError
+from minerva.core.repository.base import is_transient, sqlstate
+from minerva.core.repository.exceptions import RepositoryError, TransientError
+from minerva.core.repository.unit_of_work import begin_unit_of_work, flush_unit_of_work, is_deferred
 from minerva.core.service.exceptions import ServiceError
 
 log = getLogger(__name__)
 
 
 async def get_session():
+    # No `session.begin()` here, a connection is checked out by the first statement the request executes.
+    # It is held until the transaction ends, services commit before CPU bound work (`UserService.authenticate`).
     async with db_session() as session:
-        async with session.begin():
-            try:
-                yield session
-            except (MinervaError, RepositoryError, ServiceError) as exc:
-                log.error(str(exc))
-                await session.rollback()
-                raise exc
+        install_identity_cache(session)
+        try:
+            yield session
+            if is_deferred(session):
+                statements = await flush_unit_of_work(session)
+                log.debug("Unit of work flushed with %d statements", statements)
+            if session.in_transaction():
+                await session.commit()
+        except (MinervaError, RepositoryError, ServiceError) as exc:
+            log.error(str(exc))
+            await session.rollback()
+            raise exc
+        except DBAPIError as exc:
+            # Raised by the commit, the request can't be retried from here so let the client do it
+            if is_transient(exc):
+                msg = "Transaction could not be committed"
+                raise TransientError(msg, sqlstate=sqlstate(exc)) from exc
+            raise
+        finally:
+            drop_identity_cache(session)
 
 
 DbSession = Annotated[AsyncSession, Depends(get_session)]
+
+
+async def get_read_only_session():
+    """
+    Request session in a read-only transaction, for handlers that don't write.
+
+    Writes fail in the database. There is nothing to commit, closing the session ends the transaction
+    and returns the connection to the pool. That takes the one ROLLBACK round trip, a COMMIT would cost
+    the same and the pool would otherwise reset the connection with it anyway.
+    """
+    async with db_read_only_session() as session:
+        install_identity_cache(session)
+        try:
+            yield session
+        finally:
+            drop_identity_cache(session)
+
+
+ReadOnlySession = Annotated[AsyncSession, Depends(get_read_only_session)]
+
+
+async def get_unit_of_work(session: DbSession) -> AsyncSession:
+    """
+    Request session whose repository writes are flushed once, right before the commit.
+
+    Use it on write-heavy endpoints that don't read generated values back, see `begin_unit_of_work`.
+    """
+    begin_unit_of_work(session)
+    return session
+
+
+UnitOfWork = Annotated[AsyncSession, Depends(get_unit_of_work)]
@@ -1,11 +1,140 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import NullPool
 from sqlalchemy.ext.asyncio import AsyncAttrs, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from minerva.core import metrics
+from minerva.core.config import PoolProfile, settings
 
-from minerva.core.config import settings
+log = getLogger(__name__)
 
 
 class Base(AsyncAttrs, DeclarativeBase):
     pass
 
 
-engine = create_async_engine(str(settings.DB_URI), echo=settings.ENVIRONMENT.is_debug)
+@dataclass(slots=True)
+class PoolWait:
+    seconds: float = 0.0
+    """Time spent waiting for connections, summed over the checkouts"""
+
+
+_pool_wait: ContextVar[PoolWait | None] = ContextVar("minerva.pool_wait", default=None)
+
+
+def track_pool_wait() -> PoolWait:
+    """Sum the checkout waits of the current request (and the tasks it starts) into the returned `PoolWait`"""
+    wait = PoolWait()
+    _pool_wait.set(wait)
+    return wait
+
+
+def current_pool_wait() -> PoolWait | None:
+    return _pool_wait.get()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Records how long checkouts wait for a connection, in `metrics.POOL_CHECKOUT` and the request's `PoolWait`"""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            if (wait := current_pool_wait()) is not None:
+                wait.seconds += elapsed
+            if metrics.state.enabled:
+                metrics.POOL_CHECKOUT.observe((), elapsed)
+
+
+PGBOUNCER_STARTUP_PARAMETERS = frozenset({"application_name"})
+"""Server settings PgBouncer accepts on connect, it rejects the others"""
+
+
+def _prepared_statement_name() -> str:
+    # PgBouncer runs the statement on any server connection, where a generated name may already be taken
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_kwargs(pool: PoolProfile | None = None, *, pgbouncer: bool | None = None) -> dict[str, Any]:
+    """
+    `create_async_engine` keyword arguments.
+
+    In PgBouncer transaction pooling mode, consecutive transactions of a connection may run on different
+    server connections. Prepared statements are not cached and are named uniquely, pooling is left to
+    PgBouncer and server settings it doesn't track are dropped, they would leak to other clients.
+
+    Args:
+        pool (PoolProfile | None): The pool profile, `settings.DB_POOL` by default.
+        pgbouncer (bool | None): Whether connections go through PgBouncer, `settings.DB_PGBOUNCER` by default.
+
+    Returns:
+        dict[str, Any]: The keyword arguments.
+    """
+    pool = pool or settings.DB_POOL  # type: ignore[assignment]
+    if pgbouncer is None:
+        pgbouncer = settings.DB_PGBOUNCER
+
+    if pgbouncer:
+        return {
+            "echo": settings.DB_ECHO_SQL,
+            "poolclass": NullPool,
+            "connect_args": {
+                "prepared_statement_cache_size": 0,
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": _prepared_statement_name,
+                "server_settings": {
+                    name: value for name, value in pool.server_settings.items() if name in PGBOUNCER_STARTUP_PARAMETERS
+                },
+            },
+        }
+
+    return {
+        "echo": settings.DB_ECHO_SQL,
+        "poolclass": TimedQueuePool,
+        "pool_size": pool.size,
+        "max_overflow": pool.max_overflow,
+        "pool_timeout": pool.timeout,
+        "pool_recycle": pool.recycle,
+        "pool_pre_ping": pool.pre_ping,
+        "connect_args": {
+            # SQLAlchemy prepares statements itself, asyncpg's own cache only serves its `fetch` calls
+            "prepared_statement_cache_size": pool.statement_cache_size,
+            "statement_cache_size": pool.statement_cache_size,
+            "server_settings": pool.server_settings,
+        },
+    }
+
+
+def log_pool_profile() -> None:
+    pool: PoolProfile = settings.DB_POOL  # type: ignore[assignment]
+    if settings.DB_PGBOUNCER:
+        log.info("Database pool (%s): PgBouncer transaction pooling, no client side pool", settings.ENVIRONMENT)
+        return
+
+    log.info(
+        "Database pool (%s): size=%d max_overflow=%d timeout=%ss recycle=%ss pre_ping=%s statement_cache_size=%d "
+        "server_settings=%s replicas=%d echo=%s",
+        settings.ENVIRONMENT,
+        pool.size,
+        pool.max_overflow,
+        pool.timeout,
+        pool.recycle,
+        pool.pre_ping,
+        pool.statement_cache_size,
+        pool.server_settings,
+        len(settings.DB_REPLICA_URIS),
+        settings.DB_ECHO_SQL,
+    )
+
+
+engine = create_async_engine(str(settings.DB_URI), **engine_kwargs())
+replica_engines = [create_async_engine(uri, **engine_kwargs()) for uri in settings.DB_REPLICA_URIS]
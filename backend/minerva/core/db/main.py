@@ -1,5 +1,15 @@
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from minerva.core.db.engine import engine
+from minerva.core.db.routing import RoutingSession
 
-session = async_sessionmaker(engine, expire_on_commit=False)
+session = async_sessionmaker(engine, expire_on_commit=False, sync_session_class=RoutingSession)
+
+# Transactions are started as `BEGIN READ ONLY`, the flag is reset when the connection goes back to the pool.
+# Only these sessions read from replicas, see `RoutingSession`.
+read_only_session = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    replica_reads=True,
+)
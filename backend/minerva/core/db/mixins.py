@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
+from typing import Any
 
 from sqlalchemy import DateTime
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column
 
 
 def datetime_now_utc() -> datetime:
@@ -13,3 +14,19 @@ class TimestampMixin:
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime_now_utc, onupdate=datetime_now_utc
     )
+
+
+class VersionMixin:
+    """
+    Optimistic concurrency through a `version` counter.
+
+    Every update is sent as `UPDATE ... WHERE id = :id AND version = :version` and bumps the version, so
+    concurrent writers don't lock the row and the one that lost the race gets `StaleVersionError` from the
+    repository instead of silently overwriting the other write.
+    """
+
+    version: Mapped[int] = mapped_column(nullable=False, default=1)
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, Any]:  # noqa: N805
+        return {"version_id_col": cls.__table__.c.version}  # type: ignore[attr-defined]
@@ -0,0 +1,230 @@
+import asyncio
+import random
+from dataclasses import dataclass, field
+from functools import wraps
+from logging import getLogger
+from typing import Any, Awaitable, Callable, Concatenate, ParamSpec, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from minerva.core.cache.identity import drop_identity_cache, get_identity_cache, install_identity_cache
+from minerva.core.config import settings
+from minerva.core.db.main import session as db_session
+from minerva.core.repository.base import is_transient, sqlstate
+from minerva.core.repository.unit_of_work import begin_unit_of_work, flush_unit_of_work, is_deferred
+
+log = getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+S = TypeVar("S", bound=Any)
+
+RETRYING_KEY = "minerva.retry.retrying"
+
+
+@dataclass(slots=True)
+class RetryStats:
+    transactions: int = 0
+    retries: int = 0
+    recovered: int = 0
+    """Transactions that committed after at least one retry"""
+    exhausted: int = 0
+    """Transactions that failed with a transient error after all attempts"""
+    budget_exhausted: int = 0
+    """Transient errors not retried because the retry budget was spent"""
+    sqlstates: dict[str, int] = field(default_factory=dict)
+
+
+stats = RetryStats()
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries to a share of all transactions.
+
+    Every transaction adds `ratio` tokens, up to `capacity`, and every retry takes one. When the database
+    is overloaded most transactions fail, the bucket empties and retries stop multiplying the load.
+    """
+
+    def __init__(self, ratio: float, capacity: float) -> None:
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = capacity
+
+    def deposit(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+budget = RetryBudget(settings.DB_RETRY_BUDGET_RATIO, settings.DB_RETRY_BUDGET_CAPACITY)
+
+
+def backoff(attempt: int) -> float:
+    # Full jitter, so transactions that collided once don't retry in lockstep and collide again
+    ceiling = min(settings.DB_RETRY_BACKOFF_MAX, settings.DB_RETRY_BACKOFF_BASE * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)  # noqa: S311
+
+
+async def run_in_transaction(
+    work: Callable[[AsyncSession], Awaitable[R]],
+    *,
+    attempts: int | None = None,
+    sessionmaker: async_sessionmaker[AsyncSession] = db_session,
+) -> R:
+    """
+    Run `work` in a transaction of its own, retrying it with a new session when it fails with a transient error.
+
+    Serialization failures (40001), deadlocks (40P01) and lost connections are retried with jittered
+    exponential backoff, as long as the retry budget allows. `work` must not have side effects outside
+    the database, since it may run more than once.
+
+    Example:
+        ```python
+        async def transfer(session: AsyncSession) -> None: ...
+
+
+        await run_in_transaction(transfer)
+        ```
+
+    Args:
+        work (Callable[[AsyncSession], Awaitable[R]]): The unit of work, called with the session.
+        attempts (int | None): Maximum number of attempts, `DB_RETRY_ATTEMPTS` by default.
+        sessionmaker (async_sessionmaker[AsyncSession]): Factory of the sessions.
+
+    Returns:
+        R: The result of `work`.
+    """
+    return await _retry(lambda: _attempt(work, sessionmaker), attempts)
+
+
+async def retry_in_session(
+    session: AsyncSession,
+    work: Callable[[], Awaitable[R]],
+    *,
+    attempts: int | None = None,
+) -> R:
+    """
+    Like `run_in_transaction`, in a session that is already open, e.g. the request's.
+
+    The session's open transaction is committed first, a retry rolls back and only `work` is repeated.
+    `work` then runs in a transaction of its own, committed before this returns. Called again from
+    within `work`, it just runs the inner work as part of the outer transaction.
+
+    Args:
+        session (AsyncSession): The session `work` uses.
+        work (Callable[[], Awaitable[R]]): The unit of work.
+        attempts (int | None): Maximum number of attempts, `DB_RETRY_ATTEMPTS` by default.
+
+    Returns:
+        R: The result of `work`.
+    """
+    if session.info.get(RETRYING_KEY):
+        return await work()
+
+    if session.in_transaction():
+        await session.commit()
+    deferred = is_deferred(session)
+
+    async def attempt() -> R:
+        session.info[RETRYING_KEY] = True
+        if deferred:
+            begin_unit_of_work(session)
+        try:
+            result = await work()
+            if is_deferred(session):
+                await flush_unit_of_work(session)
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            # Instances cached before the rollback are expired
+            if get_identity_cache(session) is not None:
+                drop_identity_cache(session)
+                install_identity_cache(session)
+            raise
+        finally:
+            session.info.pop(RETRYING_KEY, None)
+        if deferred:
+            begin_unit_of_work(session)
+        return result
+
+    return await _retry(attempt, attempts)
+
+
+async def _retry(attempt_work: Callable[[], Awaitable[R]], attempts: int | None) -> R:
+    if attempts is None:
+        attempts = settings.DB_RETRY_ATTEMPTS
+    if attempts < 1:
+        msg = f"attempts must be at least 1, got {attempts}"
+        raise ValueError(msg)
+
+    stats.transactions += 1
+    budget.deposit()
+
+    attempt = 1
+    while True:
+        try:
+            result = await attempt_work()
+        except Exception as exc:
+            if not is_transient(exc):
+                raise
+
+            code = sqlstate(exc) or "connection"
+            stats.sqlstates[code] = stats.sqlstates.get(code, 0) + 1
+            if attempt >= attempts:
+                stats.exhausted += 1
+                raise
+            if not budget.withdraw():
+                stats.budget_exhausted += 1
+                raise
+
+            delay = backoff(attempt)
+            log.warning("Transient database error (%s), retrying attempt %d in %.3fs", code, attempt + 1, delay)
+            stats.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+        else:
+            if attempt > 1:
+                stats.recovered += 1
+            return result
+
+
+async def _attempt(work: Callable[[AsyncSession], Awaitable[R]], sessionmaker: async_sessionmaker[AsyncSession]) -> R:
+    async with sessionmaker() as session:
+        install_identity_cache(session)
+        try:
+            async with session.begin():
+                result = await work(session)
+                if is_deferred(session):
+                    await flush_unit_of_work(session)
+                return result
+        finally:
+            drop_identity_cache(session)
+
+
+def transactional(fn: Callable[Concatenate[AsyncSession, P], Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+    """Decorator running `fn` through `run_in_transaction`, `fn` takes the session as its first argument"""
+
+    @wraps(fn)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        return await run_in_transaction(lambda session: fn(session, *args, **kwargs))
+
+    return wrapper
+
+
+def retrying(method: Callable[Concatenate[S, P], Awaitable[R]]) -> Callable[Concatenate[S, P], Awaitable[R]]:
+    """
+    Decorator running a write method of a service through `retry_in_session`, with its repository's session.
+
+    Use it on the method that makes the whole write of a request, e.g. `UserService.create_from_schema`.
+    """
+
+    @wraps(method)
+    async def wrapper(self: S, *args: P.args, **kwargs: P.kwargs) -> R:
+        return await retry_in_session(self.repository.session, lambda: method(self, *args, **kwargs))
+
+    return wrapper
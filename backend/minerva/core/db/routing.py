@@ -0,0 +1,146 @@
+import itertools
+import time
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Literal, Sequence
+
+from sqlalchemy import Engine, QueuePool, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import SelectBase
+
+from minerva.core.config import settings
+from minerva.core.db.engine import replica_engines
+
+log = getLogger(__name__)
+
+PRIMARY_KEY = "minerva.routing.primary"
+REPLICA_KEY = "minerva.routing.replica"
+
+
+@dataclass(slots=True)
+class Replica:
+    engine: AsyncEngine
+    ejected_until: float = 0.0
+    reads: int = 0
+    ejections: int = 0
+
+    @property
+    def is_healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+    @property
+    def busy(self) -> int:
+        pool = self.engine.sync_engine.pool
+        # Without a client side pool, e.g. behind PgBouncer, there is nothing to compare
+        return pool.checkedout() if isinstance(pool, QueuePool) else 0
+
+
+class ReplicaSet:
+    """
+    Read replicas reads are spread over.
+
+    A replica whose connection fails is ejected for `eject_seconds` and reads go to the others, or
+    to the primary when none is left.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        selection: Literal["round_robin", "least_busy"] = "round_robin",
+        eject_seconds: float = 30,
+    ) -> None:
+        self.replicas = [Replica(engine) for engine in engines]
+        self.selection = selection
+        self.eject_seconds = eject_seconds
+        self.primary_fallbacks = 0
+        self._next = itertools.count()
+        self._by_engine = {replica.engine.sync_engine: replica for replica in self.replicas}
+        for sync_engine in self._by_engine:
+            event.listen(sync_engine, "handle_error", self._on_error)
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Engine | None:
+        """Engine of the replica for the next read, `None` if every replica is ejected"""
+        healthy = [replica for replica in self.replicas if replica.is_healthy]
+        if not healthy:
+            self.primary_fallbacks += 1
+            return None
+
+        if self.selection == "least_busy":
+            replica = min(healthy, key=lambda replica: replica.busy)
+        else:
+            replica = healthy[next(self._next) % len(healthy)]
+        replica.reads += 1
+        return replica.engine.sync_engine
+
+    def is_healthy(self, sync_engine: Engine) -> bool:
+        replica = self._by_engine.get(sync_engine)
+        return replica is not None and replica.is_healthy
+
+    def eject(self, sync_engine: Engine) -> None:
+        if (replica := self._by_engine.get(sync_engine)) is None:
+            return
+        log.warning("Ejecting replica %s for %.0fs", sync_engine.url.render_as_string(), self.eject_seconds)
+        replica.ejected_until = time.monotonic() + self.eject_seconds
+        replica.ejections += 1
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        if context.is_disconnect or context.connection is None:
+            # Lost or never established connection, other errors are the statement's fault
+            self.eject(context.engine)  # type: ignore[arg-type]
+
+
+replicas = ReplicaSet(replica_engines, settings.DB_REPLICA_SELECTION, settings.DB_REPLICA_EJECT_SECONDS)
+
+
+class RoutingSession(Session):
+    """
+    Session sending reads to one of `replicas` and everything else to the primary, its configured bind.
+
+    Only sessions created with `replica_reads=True`, the read-only ones, read from replicas. A session
+    that may write stays on the primary from the start, so the rows it updates are never read from a
+    replica that lags behind, e.g. with a stale `version_id`. The replica is chosen once and kept for
+    the session, so its reads see one point in time.
+
+    If the session locks rows with `SELECT ... FOR UPDATE`, or `use_primary` was called, it goes to
+    the primary from then on, and so it does once the replica it was pinned to is ejected.
+
+    Args:
+        replica_reads (bool): Send reads to a replica.
+        **kwargs (Any): Passed to `Session`.
+    """
+
+    def __init__(self, *args: Any, replica_reads: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica_reads = replica_reads
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Any:
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if not self.replica_reads or not replicas or self.info.get(PRIMARY_KEY):
+            return primary
+
+        if self._flushing or not isinstance(clause, SelectBase) or _is_locking(clause):
+            self.info[PRIMARY_KEY] = True
+            return primary
+
+        if REPLICA_KEY not in self.info:
+            self.info[REPLICA_KEY] = replicas.choose()
+        replica = self.info[REPLICA_KEY]
+        if replica is None or not replicas.is_healthy(replica):
+            # Staying on the primary, going back to the replica later could read older data
+            self.info[PRIMARY_KEY] = True
+            return primary
+        return replica
+
+
+def _is_locking(clause: SelectBase) -> bool:
+    return getattr(clause, "_for_update_arg", None) is not None
+
+
+def use_primary(session: AsyncSession | Session) -> None:
+    """Send every later statement of `session` to the primary, e.g. to read a row written by another request"""
+    session.info[PRIMARY_KEY] = True
@@ -0,0 +1,49 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+
+@dataclass(slots=True)
+class Deadline:
+    expires_at: float | None
+    """`time.monotonic()` the request must be done by, `None` once the request no longer has a budget"""
+
+    def remaining(self) -> float | None:
+        return None if self.expires_at is None else self.expires_at - time.monotonic()
+
+
+SET_STATEMENT_TIMEOUT = text("SELECT set_config('statement_timeout', :timeout, true)")
+"""One statement for every timeout, so the driver prepares it once instead of per value"""
+
+_deadline: ContextVar[Deadline | None] = ContextVar("minerva.deadline", default=None)
+
+
+def set_deadline(timeout: float) -> Deadline:
+    deadline = Deadline(time.monotonic() + timeout)
+    _deadline.set(deadline)
+    return deadline
+
+
+def remaining() -> float | None:
+    """Seconds left of the current request's budget, `None` outside of a request with a deadline"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def statement_timeout_ms() -> int | None:
+    """The remaining budget as `statement_timeout`, at least 1ms as 0 would disable the timeout"""
+    left = remaining()
+    return None if left is None else max(1, int(left * 1000))
+
+
+@event.listens_for(Session, "after_begin")
+def _set_statement_timeout(session: Session, transaction: Any, connection: Any) -> None:  # noqa: ARG001
+    # The server cancels statements running past the deadline instead of leaving them to finish
+    # for a client that gave up. Set locally, it ends with the transaction, so it is safe with PgBouncer.
+    if connection.dialect.name != "postgresql" or (timeout := statement_timeout_ms()) is None:
+        return
+    connection.execute(SET_STATEMENT_TIMEOUT, {"timeout": str(timeout)})
@@ -30,3 +30,13 @@ class NotFound(MinervaError):
 class Conflict(MinervaError):
     def __init__(self, detail: Any = None, headers: Dict[str, str] | None = None) -> None:
         super().__init__(status.HTTP_409_CONFLICT, detail, headers)
+
+
+class ServiceUnavailable(MinervaError):
+    def __init__(self, detail: Any = None, headers: Dict[str, str] | None = None) -> None:
+        super().__init__(status.HTTP_503_SERVICE_UNAVAILABLE, detail, headers)
+
+
+class GatewayTimeout(MinervaError):
+    def __init__(self, detail: Any = None, headers: Dict[str, str] | None = None) -> None:
+        super().__init__(status.HTTP_504_GATEWAY_TIMEOUT, detail, headers)
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from logging import getLogger
+
+from sqlalchemy import QueuePool, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from minerva.core.config import settings
+from minerva.core.db import engine
+from minerva.core.db.routing import replicas
+
+log = getLogger(__name__)
+
+
+class HealthStatus(StrEnum):
+    OK = "ok"
+    DEGRADED = "degraded"
+    FAILING = "failing"
+
+
+@dataclass(frozen=True, slots=True)
+class Probe:
+    status: HealthStatus
+    checked_at: float
+    """`time.monotonic()` of the probe"""
+    db_latency: float | None = None
+    pool_usage: float = 0.0
+    replicas_ejected: int = 0
+    error: str | None = None
+
+
+def pool_usage(engine: AsyncEngine) -> float:
+    """Share of the pool's connections, overflow included, that are checked out"""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0.0
+    return pool.checkedout() / (pool.size() + max(pool._max_overflow, 0))
+
+
+class HealthProber:
+    """
+    Probes the database in the background and keeps the latest result.
+
+    Health endpoints read `latest`, so they cost no query however often they are called. The app is
+    degraded when a round trip gets slow, the pool fills up or a replica is ejected, which happens
+    before requests start failing on timeouts.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.latest = Probe(HealthStatus.FAILING, checked_at=time.monotonic(), error="Not probed yet")
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        # A prober that stopped running can't vouch for the database anymore
+        return time.monotonic() - self.latest.checked_at <= 3 * settings.HEALTH_PROBE_INTERVAL
+
+    async def probe(self) -> Probe:
+        usage = pool_usage(self.engine)
+        ejected = sum(not replica.is_healthy for replica in replicas.replicas)
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(settings.HEALTH_PROBE_TIMEOUT), self.engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        except Exception as exc:
+            return Probe(HealthStatus.FAILING, time.monotonic(), pool_usage=usage, error=repr(exc))
+        latency = time.perf_counter() - started
+
+        degraded = (
+            latency > settings.HEALTH_DEGRADED_LATENCY or usage >= settings.HEALTH_DEGRADED_POOL_USAGE or ejected > 0
+        )
+        status = HealthStatus.DEGRADED if degraded else HealthStatus.OK
+        return Probe(status, time.monotonic(), latency, usage, ejected)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.HEALTH_PROBE_INTERVAL)
+            probe = await self.probe()
+            if probe.status != self.latest.status:
+                log.warning("Health changed from %s to %s: %s", self.latest.status, probe.status, probe)
+            self.latest = probe
+
+    async def start(self) -> None:
+        """Probe once, so readiness is known right away, then keep probing in the background"""
+        self.latest = await self.probe()
+        self._task = asyncio.create_task(self.run(), name="health-prober")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+prober = HealthProber(engine)
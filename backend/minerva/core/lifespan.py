@@ -1,11 +1,135 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from logging import getLogger
+from typing import Any, AsyncIterator, Awaitable, Callable, Sequence
 
 from fastapi import FastAPI
+from sqlalchemy import NullPool
+from sqlalchemy import inspect as sqla_inspect
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
 
-from minerva.core.db import engine
+from minerva.core.config import settings
+from minerva.core.db import Base, engine
+from minerva.core.db.engine import log_pool_profile, replica_engines
+from minerva.core.health import HealthProber
+from minerva.core.metrics import MetricsFlusher, enable_metrics, metrics_store
+from minerva.core.middleware.drain import in_flight
+from minerva.core.tracing import configure_tracing, instrument_methods, shutdown_tracing
 
+log = getLogger(__name__)
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):  # noqa: ARG001
-    yield
-    await engine.dispose()
+Primer = Callable[[AsyncSession], Awaitable[Any]]
+"""Runs a hot query, so its statement is prepared on every warmed up connection"""
+
+
+async def check_schema(connection: AsyncConnection) -> None:
+    tables = set(await connection.run_sync(lambda conn: sqla_inspect(conn).get_table_names()))
+    if missing := sorted(set(Base.metadata.tables) - tables):
+        msg = f"Database is missing tables: {', '.join(missing)}, run the migrations"
+        raise RuntimeError(msg)
+
+
+async def _prime(connection: AsyncConnection, primers: Sequence[Primer]) -> None:
+    async with AsyncSession(bind=connection, expire_on_commit=False) as session:
+        for primer in primers:
+            await primer(session)
+        await session.rollback()
+
+
+async def warm_up(engine: AsyncEngine, primers: Sequence[Primer] = ()) -> int:
+    """
+    Open pooled connections up front and prepare hot statements on them.
+
+    Connections are held at the same time so the pool opens distinct ones, and go back to it idle.
+
+    Returns:
+        int: The number of connections warmed up.
+    """
+    pool = engine.sync_engine.pool
+    if isinstance(pool, NullPool):
+        # Nothing to keep, PgBouncer holds the server connections
+        return 0
+
+    count = settings.DB_WARMUP_CONNECTIONS
+    if count is None:
+        count = settings.DB_POOL.size  # type: ignore[attr-defined]
+
+    connections = await asyncio.gather(*(engine.connect() for _ in range(count)))
+    try:
+        await asyncio.gather(*(_prime(connection, primers) for connection in connections))
+    finally:
+        await asyncio.gather(*(connection.close() for connection in connections))
+    return len(connections)
+
+
+async def _instrument() -> MetricsFlusher | None:
+    sync_engines = [db_engine.sync_engine for db_engine in (engine, *replica_engines)]
+    if configure_tracing(sync_engines):
+        log.info("Tracing to %s, sampling %s", settings.TRACING_EXPORTER, settings.TRACING_SAMPLE_RATE)
+    if not settings.METRICS_ENABLED:
+        return None
+
+    enable_metrics(sync_engines)
+    instrument_methods()
+    if (store := metrics_store()) is None:
+        return None
+    flusher = MetricsFlusher(store, settings.METRICS_FLUSH_INTERVAL)
+    await flusher.start()
+    return flusher
+
+
+def create_lifespan(
+    primers: Sequence[Primer] = (),
+    *,
+    prober: HealthProber | None = None,
+) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
+    """
+    Lifespan checking the database and warming up the pools before the app reports ready.
+
+    Tracing and metrics are set up here rather than at import, so each worker starts its own exporter
+    and metrics flusher after the fork. Shutdown runs once uvicorn has stopped accepting connections and
+    waited for in-flight requests (`SHUTDOWN_DRAIN_TIMEOUT` under `minerva.serve`). The pools are closed
+    and pending spans and metrics are flushed.
+
+    Args:
+        primers (Sequence[Primer]): Hot queries to prepare on the warmed up connections.
+        prober (HealthProber | None): Background health prober, run while the app is up.
+
+    Returns:
+        Callable[[FastAPI], AbstractAsyncContextManager[None]]: The lifespan, for `FastAPI(lifespan=...)`.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        app.state.ready = False
+        log_pool_profile()
+        async with engine.connect() as connection:
+            await check_schema(connection)
+
+        for warmed_engine in (engine, *replica_engines):
+            warmed = await warm_up(warmed_engine, primers)
+            log.info("Warmed up %d connections to %s", warmed, warmed_engine.url.render_as_string())
+        flusher = await _instrument()
+        if prober is not None:
+            await prober.start()
+        app.state.ready = True
+
+        try:
+            yield
+        finally:
+            app.state.ready = False
+            in_flight.start_draining()
+            if prober is not None:
+                await prober.stop()
+            if in_flight.count:
+                log.warning("%d requests still in flight after the graceful shutdown, closing anyway", in_flight.count)
+            for disposed_engine in (engine, *replica_engines):
+                await disposed_engine.dispose()
+            if flusher is not None:
+                await flusher.stop()
+            shutdown_tracing()
+
+    return lifespan
+
+
+lifespan = create_lifespan()
@@ -0,0 +1,457 @@
+import asyncio
+import contextlib
+import fcntl
+import functools
+import json
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Iterable, Mapping, ParamSpec, Sequence, TypeVar
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from minerva.core.config import settings
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+Labels = tuple[str, ...]
+Snapshot = dict[str, dict[str, Any]]
+"""Metrics of a process by name, JSON serializable, see `Registry.snapshot`"""
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+"""Upper bounds of histogram buckets in seconds, `+Inf` is implied"""
+
+STARTS_KEY = "minerva.metrics.starts"
+ARCHIVE = "archive"
+"""Worker name of the metrics of exited workers, merged into one file"""
+
+
+class MetricsState:
+    def __init__(self) -> None:
+        self.enabled = False
+
+
+state = MetricsState()
+
+operation: ContextVar[str] = ContextVar("minerva.metrics.operation", default="other")
+"""Repository method being run, statements are counted under it"""
+
+
+class Metric:
+    kind: ClassVar[str]
+
+    def __init__(
+        self,
+        name: str,
+        help: str,  # noqa: A002
+        labelnames: Sequence[str] = (),
+        *,
+        collect: Callable[[], Iterable[tuple[Labels, Any]]] | None = None,
+    ) -> None:
+        """
+        A metric of this process.
+
+        Args:
+            name (str): The name.
+            help (str): What is measured.
+            labelnames (Sequence[str]): Names of the labels, values are passed in the same order.
+            collect (Callable[[], Iterable[tuple[Labels, Any]]] | None): Reads the values on snapshot instead,
+                for stats kept elsewhere.
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self.values: dict[Labels, Any] = {}
+
+    def snapshot(self) -> dict[str, Any]:
+        values = self.collect() if self.collect is not None else self.values.items()
+        return {
+            "kind": self.kind,
+            "help": self.help,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(labels), value] for labels, value in values],
+        }
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    """Current value of this process, e.g. checked out connections. Only live workers are aggregated."""
+
+    kind = "gauge"
+
+    def set(self, labels: Labels, value: float) -> None:
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,  # noqa: A002
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels: Labels, value: float) -> None:
+        # Count of each bucket, not cumulative, then the `+Inf` bucket and the sum
+        counts = self.values.get(labels)
+        if counts is None:
+            counts = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def snapshot(self) -> dict[str, Any]:
+        return {**super().snapshot(), "buckets": list(self.buckets)}
+
+
+class Registry:
+    """In-process metrics, plain dicts updated in place with no locking as each worker runs one event loop"""
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Any:
+        if metric.name in self.metrics:
+            msg = f"Metric {metric.name!r} is already registered"
+            raise ValueError(msg)
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> Snapshot:
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def reset(self) -> None:
+        for metric in self.metrics.values():
+            metric.values.clear()
+
+
+registry = Registry()
+
+HTTP_REQUESTS: Counter = registry.register(
+    Counter("http_requests_total", "Requests by route and status code", ("method", "route", "status"))
+)
+HTTP_DURATION: Histogram = registry.register(
+    Histogram("http_request_duration_seconds", "Time to handle a request", ("method", "route"))
+)
+POOL_CHECKOUT: Histogram = registry.register(
+    Histogram("db_pool_checkout_seconds", "Time to get a connection from the pool, connecting included")
+)
+DB_STATEMENTS: Histogram = registry.register(
+    Histogram("db_statement_duration_seconds", "Statements by the repository method running them", ("method",))
+)
+PASSWORD_HASHING: Histogram = registry.register(
+    Histogram(
+        "password_hashing_seconds",
+        "Argon2 time, the event loop is blocked meanwhile",
+        ("operation",),
+        buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+    )
+)
+
+
+def timed(histogram: Histogram, *labels: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Observe the run time of the decorated function while metrics are enabled"""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not state.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(labels, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def _before_cursor_execute(conn: Any, *args: Any) -> None:  # noqa: ARG001
+    if state.enabled:
+        conn.info.setdefault(STARTS_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, *args: Any) -> None:  # noqa: ARG001
+    if starts := conn.info.get(STARTS_KEY):
+        DB_STATEMENTS.observe((operation.get(),), time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context: Any) -> None:
+    conn = exception_context.connection
+    if conn is not None and (starts := conn.info.get(STARTS_KEY)):
+        DB_STATEMENTS.observe((operation.get(),), time.perf_counter() - starts.pop())
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements executed by `engine` and their latency, by repository method"""
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
+
+
+class MetricsMiddleware:
+    """
+    Latency and status code of requests by route.
+
+    Unmatched paths are counted as one route, so scanners can't grow the number of series.
+
+    Args:
+        app (ASGIApp): The app.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not state.enabled:
+            return await self.app(scope, receive, send)
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope["route"].path if "route" in scope else "unmatched"
+            HTTP_DURATION.observe((scope["method"], route), time.perf_counter() - start)
+            HTTP_REQUESTS.inc((scope["method"], route, str(status_code)))
+
+
+def merge(snapshots: Iterable[Snapshot]) -> Snapshot:
+    """Sum the samples of `snapshots` with the same labels, histograms bucket by bucket"""
+    merged: Snapshot = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "samples": {}})
+            samples: dict[tuple[str, ...], Any] = target["samples"]
+            for labels, value in metric["samples"]:
+                key = tuple(labels)
+                if key not in samples:
+                    samples[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    samples[key] = [a + b for a, b in zip(samples[key], value, strict=True)]
+                else:
+                    samples[key] += value
+    for metric in merged.values():
+        metric["samples"] = [[list(labels), value] for labels, value in metric["samples"].items()]
+    return merged
+
+
+def _without_gauges(snapshot: Snapshot) -> Snapshot:
+    return {name: metric for name, metric in snapshot.items() if metric["kind"] != "gauge"}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiProcessStore:
+    """
+    Snapshots of the workers of `minerva.serve` in a shared directory, a JSON file per worker.
+
+    Each worker writes its own file every `METRICS_FLUSH_INTERVAL` seconds and before answering a scrape.
+    Files of exited workers are merged into one archive file, so counters keep growing across worker
+    restarts while their gauges are dropped.
+
+    Args:
+        directory (Path): The directory, created if missing.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, worker: str) -> Path:
+        return self.directory / f"{worker}.json"
+
+    def write(self, snapshot: Snapshot, worker: str | None = None) -> None:
+        path = self._path(worker or str(os.getpid()))
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(snapshot, separators=(",", ":")))
+        os.replace(tmp, path)
+
+    def _load(self, path: Path) -> Snapshot:
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _archive(self, paths: list[Path]) -> None:
+        archive = self._path(ARCHIVE)
+        snapshots = [self._load(archive), *(_without_gauges(self._load(path)) for path in paths)]
+        self.write(merge(snapshots), ARCHIVE)
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def read(self) -> dict[str, Snapshot]:
+        """Snapshots by worker, exited workers archived first"""
+        # Under the lock, a file archived by another worker between the glob and the load would
+        # drop out of this read and come back with the archive in the next, a counter reset
+        with (self.directory / ".lock").open("w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            workers = {path.stem: path for path in self.directory.glob("*.json")}
+            exited = [path for worker, path in workers.items() if worker.isdigit() and not _pid_alive(int(worker))]
+            if exited:
+                self._archive(exited)
+                workers = {path.stem: path for path in self.directory.glob("*.json")}
+            return {worker: self._load(path) for worker, path in workers.items()}
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Mapping[str, str] | None = None) -> str:
+    pairs = [*zip(names, values, strict=True), *(extra or {}).items()]
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _render_samples(name: str, metric: dict[str, Any], extra: Mapping[str, str] | None) -> Iterable[str]:
+    names = metric["labelnames"]
+    for values, value in metric["samples"]:
+        if metric["kind"] != "histogram":
+            yield f"{name}{_labels(names, values, extra)} {_number(value)}"
+            continue
+        cumulative = 0
+        for bound, count in zip([*metric["buckets"], "+Inf"], value[:-1], strict=True):
+            cumulative += count
+            le = bound if isinstance(bound, str) else _number(bound)
+            yield f"{name}_bucket{_labels(names, values, {**(extra or {}), 'le': le})} {cumulative}"
+        yield f"{name}_sum{_labels(names, values, extra)} {_number(value[-1])}"
+        yield f"{name}_count{_labels(names, values, extra)} {cumulative}"
+
+
+def render(snapshots: Mapping[str, Snapshot], *, per_worker: bool = False) -> str:
+    """
+    Prometheus text format of the snapshots of workers.
+
+    Args:
+        snapshots (Mapping[str, Snapshot]): Snapshots by worker.
+        per_worker (bool): Keep the samples of each worker apart under a `worker` label instead of
+            summing them.
+
+    Returns:
+        str: The exposition.
+    """
+    merged = None if per_worker else merge(snapshots.values())
+    names = sorted({name for snapshot in snapshots.values() for name in snapshot})
+    lines = []
+    for name in names:
+        metric = next(snapshot[name] for snapshot in snapshots.values() if name in snapshot)
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        if merged is not None:
+            lines.extend(_render_samples(name, merged[name], None))
+            continue
+        for worker, snapshot in snapshots.items():
+            if name in snapshot:
+                lines.extend(_render_samples(name, snapshot[name], {"worker": worker}))
+    return "\n".join(lines) + "\n"
+
+
+@functools.lru_cache(maxsize=1)
+def _store(directory: str) -> MultiProcessStore:
+    return MultiProcessStore(Path(directory))
+
+
+def metrics_store() -> MultiProcessStore | None:
+    """The store shared by the workers, `None` without `METRICS_DIR` as there is only this process"""
+    return None if settings.METRICS_DIR is None else _store(settings.METRICS_DIR)
+
+
+def snapshots(own: Snapshot) -> dict[str, Snapshot]:
+    """
+    Snapshots of all workers, blocking on file IO.
+
+    Args:
+        own (Snapshot): This worker's snapshot, written first so its part is current. Taken on the event
+            loop, the registry is not thread safe.
+
+    Returns:
+        dict[str, Snapshot]: Snapshots by worker.
+    """
+    store = metrics_store()
+    if store is None:
+        return {str(os.getpid()): own}
+    store.write(own)
+    return store.read()
+
+
+def enable_metrics(engines: Iterable[Engine] = ()) -> None:
+    """Record requests, password hashing, pool checkouts and the statements of `engines`"""
+    state.enabled = True
+    for engine in engines:
+        instrument_engine(engine)
+
+
+def disable_metrics() -> None:
+    state.enabled = False
+
+
+class MetricsFlusher:
+    """Writes this worker's snapshot to the store every `interval` seconds, for the others to serve"""
+
+    def __init__(self, store: MultiProcessStore, interval: float) -> None:
+        self.store = store
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.store.write(registry.snapshot())
+
+    async def start(self) -> None:
+        self.store.write(registry.snapshot())
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        # Counters of this worker are archived from its last snapshot once it has exited
+        self.store.write(registry.snapshot())
@@ -2,35 +2,50 @@ from fastapi.requests import HTTPConnection
 from starlette.authentication import AuthCredentials, SimpleUser
 from starlette.authentication import AuthenticationBackend as StarletteAuthenticationBackend
 
+from minerva.access_token.exceptions import InvalidAccessTokenError
 from minerva.access_token.models import AccessToken
-from minerva.access_token.repository import AccessTokenRepository
+from minerva.access_token.repository import AccessTokenRecord, AccessTokenRepository
 from minerva.access_token.service import AccessTokenService
 from minerva.core.config import settings
 from minerva.core.db import main as db
+from minerva.core.db.routing import replicas, use_primary
+from minerva.core.middleware.paths import is_internal
 from minerva.users.models import User
+from minerva.users.repository import UserRecord
 
 
 class AuthenticatedUser(SimpleUser):
-    user: User
-    access_token: AccessToken
+    # Records with `DB_FAST_PATH`, detached from any session either way
+    user: User | UserRecord
+    access_token: AccessToken | AccessTokenRecord
 
-    def __init__(self, access_token: AccessToken) -> None:
+    def __init__(self, access_token: AccessToken | AccessTokenRecord) -> None:
         super().__init__(access_token.user.email)
         self.user = access_token.user
         self.access_token = access_token
 
 
 class AuthenticationBackend(StarletteAuthenticationBackend):
-    def __init__(self) -> None:
-        super().__init__()
-        self.access_token_service = AccessTokenService(AccessTokenRepository(db.session()))
-
     async def authenticate(self, conn: HTTPConnection) -> tuple[AuthCredentials, AuthenticatedUser] | None:
+        if is_internal(conn.url.path):
+            # Probes must not touch the database
+            return None
+
         request_access_token = conn.headers.get("Authentication") or conn.cookies.get(settings.ACCESS_TOKEN_COOKIE_NAME)
 
         if request_access_token is None:
             return None
 
-        access_token = await self.access_token_service.validate_access_token(request_access_token)
+        # A session per request, released as soon as the token is validated instead of holding a connection
+        async with db.read_only_session() as session:
+            access_token_service = AccessTokenService(AccessTokenRepository(session))
+            try:
+                access_token = await access_token_service.validate_access_token(request_access_token)
+            except InvalidAccessTokenError:
+                if not replicas:
+                    raise
+                # The token may have been created moments ago and not be replicated yet
+                use_primary(session)
+                access_token = await access_token_service.validate_access_token(request_access_token)
 
         return AuthCredentials(["authenticated"]), AuthenticatedUser(access_token)
@@ -0,0 +1,107 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Mapping
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from minerva.core.config import settings
+from minerva.core.deadline import Deadline, set_deadline
+
+
+@dataclass(slots=True)
+class DeadlineStats:
+    timeouts: int = 0
+    disconnects: int = 0
+
+
+stats = DeadlineStats()
+
+
+class DeadlineMiddleware:
+    """
+    Gives every request a time budget and cancels it once the budget is spent or the client disconnects.
+
+    The budget is taken from the `REQUEST_TIMEOUT_HEADER` header, capped at `REQUEST_TIMEOUT_MAX`, or the
+    route's default. Transactions of the request get what is left of it as `statement_timeout`, see
+    `minerva.core.deadline`, and cancelling the request cancels its running query. A request out of time
+    gets 504.
+
+    Args:
+        app (ASGIApp): The app.
+        routes (Mapping[str, float] | None): Budget in seconds of paths, others get `REQUEST_TIMEOUT`.
+    """
+
+    def __init__(self, app: ASGIApp, routes: Mapping[str, float] | None = None) -> None:
+        self.app = app
+        self.routes = routes or {}
+        self.header = settings.REQUEST_TIMEOUT_HEADER.lower().encode()
+
+    def timeout(self, scope: Scope) -> float:
+        for name, value in scope["headers"]:
+            if name != self.header:
+                continue
+            try:
+                requested = float(value)
+            except ValueError:
+                break
+            if requested > 0:
+                return min(requested, settings.REQUEST_TIMEOUT_MAX)
+            break
+        return self.routes.get(scope["path"], settings.REQUEST_TIMEOUT)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timeout = self.timeout(scope)
+        call = _Call(set_deadline(timeout), asyncio.timeout(timeout), send)
+        # The app reads the messages through the queue, so a disconnect is seen while it is still working
+        call.task = asyncio.create_task(self.app(scope, call.messages.get, call.send))
+        watcher = asyncio.create_task(call.watch_disconnect(receive))
+        try:
+            async with call.budget:
+                await call.task
+        except TimeoutError:
+            stats.timeouts += 1
+            if not call.response_started:
+                response = JSONResponse({"detail": "Request ran out of time"}, status_code=504)
+                await response(scope, receive, send)
+        except asyncio.CancelledError:
+            if not call.disconnected:
+                raise
+        finally:
+            watcher.cancel()
+
+
+class _Call:
+    def __init__(self, deadline: Deadline, budget: asyncio.Timeout, send: Send) -> None:
+        self.deadline = deadline
+        self.budget = budget
+        self._send = send
+        self.messages: asyncio.Queue[Message] = asyncio.Queue()
+        self.task: asyncio.Task[None] | None = None
+        self.response_started = False
+        self.response_complete = False
+        self.disconnected = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.response_started = True
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            self.response_complete = True
+            # Background tasks run after the response and are not bound by the request's budget
+            self.deadline.expires_at = None
+            self.budget.reschedule(None)
+        await self._send(message)
+
+    async def watch_disconnect(self, receive: Receive) -> None:
+        while True:
+            message = await receive()
+            self.messages.put_nowait(message)
+            if message["type"] == "http.disconnect":
+                if not self.response_complete and self.task is not None and not self.task.done():
+                    self.disconnected = True
+                    stats.disconnects += 1
+                    self.task.cancel()
+                return
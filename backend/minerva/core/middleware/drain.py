@@ -0,0 +1,63 @@
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from minerva.core.middleware.paths import is_internal
+
+
+class InFlightRequests:
+    """
+    Count of requests being handled and whether the server is shutting down.
+
+    Waiting for the in-flight requests is left to uvicorn's graceful shutdown
+    (`timeout_graceful_shutdown`), which runs before the lifespan shutdown.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.draining = False
+
+    def enter(self) -> None:
+        self.count += 1
+
+    def exit(self) -> None:
+        self.count -= 1
+
+    def start_draining(self) -> None:
+        """
+        Fail readiness and turn new requests away.
+
+        Called from the worker's exit signal handler, see `minerva.serve.WorkerServer`, so this happens
+        before uvicorn stops accepting connections. Requests still arriving on open keep-alive connections
+        get a 503 that closes the connection.
+        """
+        self.draining = True
+
+
+in_flight = InFlightRequests()
+
+
+class DrainMiddleware:
+    """Tracks in-flight HTTP requests and turns new ones away with 503 once draining started"""
+
+    def __init__(self, app: ASGIApp, requests: InFlightRequests = in_flight) -> None:
+        self.app = app
+        self.requests = requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or is_internal(scope["path"]):
+            # Served while draining, liveness must keep passing and readiness reports the drain itself
+            return await self.app(scope, receive, send)
+
+        if self.requests.draining:
+            response = JSONResponse(
+                {"detail": "Server is shutting down"},
+                status_code=503,
+                headers={"Connection": "close", "Retry-After": "1"},
+            )
+            return await response(scope, receive, send)
+
+        self.requests.enter()
+        try:
+            return await self.app(scope, receive, send)
+        finally:
+            self.requests.exit()
@@ -0,0 +1,179 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Mapping
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from minerva.core.config import settings
+from minerva.core.db import engine as db_engine
+from minerva.core.db.engine import track_pool_wait
+from minerva.core.health import pool_usage
+from minerva.core.middleware.paths import is_internal
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit adjusted by AIMD on request latency and database pool wait.
+
+    Requests faster than `target_latency` grow the limit by about one per round of requests while it is
+    in use, slower ones shrink it by `decrease`, at most once per `target_latency` so a burst of slow
+    completions counts as one signal. Requests that waited longer than `target_pool_wait` for database
+    connections shrink it the same way, the pool saturates before latency shows it.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        initial: float,
+        *,
+        min_limit: float = 1,
+        max_limit: float = 1000,
+        target_latency: float = 0.5,
+        target_pool_wait: float = 0.05,
+        decrease: float = 0.9,
+    ) -> None:
+        self.limit = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.target_pool_wait = target_pool_wait
+        self.decrease = decrease
+        self._last_decrease = 0.0
+
+    def update(self, latency: float, in_flight: int, pool_wait: float = 0.0) -> None:
+        if latency > self.target_latency or pool_wait > self.target_pool_wait:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.target_latency:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self._last_decrease = now
+        elif in_flight + 1 >= self.limit / 2:
+            # Only grow a limit that is actually in use, an idle one says nothing about capacity
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+@dataclass(slots=True)
+class BulkheadStats:
+    admitted: int = 0
+    queued: int = 0
+    rejected: int = 0
+
+
+class Bulkhead:
+    """
+    Concurrency limit of a group of routes, isolating them from the others.
+
+    Requests over the limit wait in a queue of at most `max_queue` for up to `queue_timeout` seconds
+    and are rejected after that, or right away when the queue is full.
+    """
+
+    def __init__(self, name: str, limit: AdaptiveLimit, *, max_queue: int = 100, queue_timeout: float = 1) -> None:
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.stats = BulkheadStats()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def acquire(self) -> bool:
+        if self.in_flight < int(self.limit.limit) and not self._waiters:
+            self.in_flight += 1
+            self.stats.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.stats.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except TimeoutError:
+            if not waiter.done() or waiter.cancelled():
+                self.stats.rejected += 1
+                return False
+            # The slot was handed over in the same tick the wait timed out, take it instead of leaking it
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as the request got cancelled, pass it on
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        self.stats.admitted += 1
+        return True
+
+    def release(self, latency: float | None = None, pool_wait: float = 0.0) -> None:
+        self.in_flight -= 1
+        if latency is not None:
+            self.limit.update(latency, self.in_flight, pool_wait)
+
+        while self._waiters and self.in_flight < int(self.limit.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.in_flight += 1
+
+
+class LoadSheddingMiddleware:
+    """
+    Per-route bulkheads with adaptive limits, shedding load with 503 and `Retry-After`.
+
+    Requests are also turned away while the database pool is nearly exhausted, instead of queueing on
+    pool checkout until they time out.
+
+    Args:
+        app (ASGIApp): The app.
+        bulkheads (Mapping[str, Bulkhead]): Bulkheads by name, must include `default`.
+        routes (Mapping[str, str]): Bulkhead name of each path, other paths go to `default`.
+        engine (AsyncEngine): Engine whose pool usage is watched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        bulkheads: Mapping[str, Bulkhead],
+        routes: Mapping[str, str],
+        engine: AsyncEngine = db_engine,
+    ) -> None:
+        self.app = app
+        self.bulkheads = bulkheads
+        self.routes = routes
+        self.engine = engine
+        self.pool_rejected = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.LOAD_SHEDDING_ENABLED or is_internal(scope["path"]):
+            return await self.app(scope, receive, send)
+
+        if pool_usage(self.engine) >= settings.LOAD_SHEDDING_POOL_USAGE:
+            self.pool_rejected += 1
+            return await self._reject(scope, receive, send)
+
+        bulkhead = self.bulkheads[self.routes.get(scope["path"], "default")]
+        if not await bulkhead.acquire():
+            return await self._reject(scope, receive, send)
+
+        pool_wait = track_pool_wait()
+        started = time.perf_counter()
+        try:
+            return await self.app(scope, receive, send)
+        finally:
+            bulkhead.release(time.perf_counter() - started, pool_wait.seconds)
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            {"detail": "Server is overloaded, try again"},
+            status_code=503,
+            headers={"Retry-After": str(settings.LOAD_SHEDDING_RETRY_AFTER)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,8 @@
+INTERNAL_PATH_PREFIXES = ("/health/",)
+"""Probes and metrics: no authentication, load shedding or draining, and no database access"""
+INTERNAL_PATHS = ("/metrics",)
+"""Like `INTERNAL_PATH_PREFIXES`, matched exactly"""
+
+
+def is_internal(path: str) -> bool:
+    return path in INTERNAL_PATHS or path.startswith(INTERNAL_PATH_PREFIXES)
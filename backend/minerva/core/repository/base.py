@@ -2,16 +2,52 @@
 
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager
+from functools import cached_property
 from logging import getLogger
 from typing import Any, Generic, TypeVar
 
 from sqlalchemy import Column
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-
-from minerva.core.repository.exceptions import ConflictError, NotFoundError, RepositoryError
+from sqlalchemy.exc import DBAPIError, IntegrityError, SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
+
+from minerva.core.repository.exceptions import (
+    ConflictError,
+    DeadlineExceededError,
+    NotFoundError,
+    RepositoryError,
+    StaleVersionError,
+    TransientError,
+)
+from minerva.core.repository.loader import DataLoader
+from minerva.core.tracing import trace_methods
 
 log = getLogger(__name__)
 
+RETRYABLE_SQLSTATES = frozenset({"40001", "40P01", "57P01", "57P02", "57P03"})
+"""serialization_failure, deadlock_detected and server shutdown, connection exceptions (class 08) are added"""
+QUERY_CANCELED = "57014"
+
+
+def sqlstate(exc: BaseException) -> str | None:
+    if isinstance(exc, TransientError):
+        return exc.sqlstate
+    if isinstance(exc, DBAPIError):
+        return getattr(exc.orig, "sqlstate", None)
+    return None
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether retrying the whole transaction that raised `exc` may succeed"""
+    if isinstance(exc, TransientError):
+        return True
+    if not isinstance(exc, DBAPIError):
+        return False
+    if exc.connection_invalidated:
+        return True
+
+    code = sqlstate(exc)
+    return code is not None and (code in RETRYABLE_SQLSTATES or code.startswith("08"))
+
 
 @asynccontextmanager
 async def sql_error_handler():
@@ -20,7 +56,19 @@ async def sql_error_handler():
     except IntegrityError as exc:
         log.error(str(exc))
         raise ConflictError from exc
+    except StaleDataError as exc:
+        log.info(str(exc))
+        msg = "Record was modified since it was read"
+        raise StaleVersionError(msg) from exc
     except SQLAlchemyError as exc:
+        if sqlstate(exc) == QUERY_CANCELED:
+            log.warning(str(exc))
+            msg = "SQL statement was cancelled, the request ran out of time"
+            raise DeadlineExceededError(msg) from exc
+        if is_transient(exc):
+            log.warning(str(exc))
+            msg = "A transient error occured while executing SQL statement"
+            raise TransientError(msg, sqlstate=sqlstate(exc)) from exc
         log.error(str(exc))
         msg = "An exception occured while executing SQL statement"
         raise RepositoryError(msg) from exc
@@ -38,6 +86,10 @@ class Repository(Generic[T, U], ABC):
     model_id_attr_name: str = "id"
     model_id_type: type[U]
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        trace_methods(cls, "repository")
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         pass
 
@@ -45,6 +97,15 @@ class Repository(Generic[T, U], ABC):
     def model_id_attr(self) -> Column[U]:
         return getattr(self.model, self.model_id_attr_name)
 
+    @cached_property
+    def loader(self) -> DataLoader[U, T]:
+        """
+        `DataLoader` batching concurrent `load` calls into `get_many`.
+
+        Repositories are built per request, so the loader is request scoped as well.
+        """
+        return DataLoader(self.get_many)
+
     @staticmethod
     async def check_not_found(item: T | None) -> T:
         if item is None:
@@ -112,6 +173,18 @@ class Repository(Generic[T, U], ABC):
             list[T]: The deleted records.
         """
 
+    @abstractmethod
+    async def estimated_count(self, **kwargs: Any) -> int:
+        """
+        Estimate the number of records in the table.
+
+        Args:
+            **kwargs (Any): The query parameters to filter by.
+
+        Returns:
+            int: The estimated number of records in the table.
+        """
+
     @abstractmethod
     async def exists(self, **kwargs: Any) -> bool:
         """
@@ -140,6 +213,19 @@ class Repository(Generic[T, U], ABC):
             NotFoundError: If no record is found.
         """
 
+    @abstractmethod
+    async def get_many(self, ids: list[U], **kwargs: Any) -> list[T | None]:
+        """
+        Get many records from the table in a single query.
+
+        Args:
+            ids (list[U]): The IDs of the records to get.
+            **kwargs (Any): The query parameters to get the records with.
+
+        Returns:
+            list[T | None]: The records in the order of `ids`, `None` for IDs with no record.
+        """
+
     @abstractmethod
     async def get_one(self, id: U, **kwargs: Any) -> T:
         """
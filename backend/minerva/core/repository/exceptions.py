@@ -1,7 +1,23 @@
 class RepositoryError(Exception): ...
 
 
+class TransientError(RepositoryError):
+    """Serialization failure, deadlock or lost connection, the transaction can be retried as a whole"""
+
+    def __init__(self, msg: str = "", sqlstate: str | None = None) -> None:
+        super().__init__(msg)
+        self.sqlstate = sqlstate
+
+
+class DeadlineExceededError(RepositoryError):
+    """The statement was cancelled by `statement_timeout`, the request ran out of time"""
+
+
 class ConflictError(Exception): ...
 
 
+class StaleVersionError(ConflictError):
+    """The record was changed by someone else since it was read, see `VersionMixin`"""
+
+
 class NotFoundError(Exception): ...
@@ -0,0 +1,82 @@
+from contextlib import asynccontextmanager
+from logging import getLogger
+from typing import Any, Callable, Generic, TypeVar
+
+import asyncpg
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from minerva.core.repository.base import QUERY_CANCELED, RETRYABLE_SQLSTATES, sql_error_handler
+from minerva.core.repository.exceptions import (
+    ConflictError,
+    DeadlineExceededError,
+    RepositoryError,
+    TransientError,
+)
+
+log = getLogger(__name__)
+
+R = TypeVar("R")
+
+
+@asynccontextmanager
+async def driver_error_handler():
+    """`sql_error_handler` for errors raised by asyncpg itself"""
+    try:
+        yield
+    except asyncpg.PostgresError as exc:
+        code = exc.sqlstate
+        if code == QUERY_CANCELED:
+            log.warning(str(exc))
+            msg = "SQL statement was cancelled, the request ran out of time"
+            raise DeadlineExceededError(msg) from exc
+        if code is not None and (code in RETRYABLE_SQLSTATES or code.startswith("08")):
+            log.warning(str(exc))
+            msg = "A transient error occured while executing SQL statement"
+            raise TransientError(msg, sqlstate=code) from exc
+        if code is not None and code.startswith("23"):
+            log.error(str(exc))
+            raise ConflictError from exc
+        log.error(str(exc))
+        msg = "An exception occured while executing SQL statement"
+        raise RepositoryError(msg) from exc
+    except (asyncpg.ConnectionDoesNotExistError, OSError) as exc:
+        log.warning(str(exc))
+        msg = "Connection was lost while executing SQL statement"
+        raise TransientError(msg) from exc
+
+
+class FastQuery(Generic[R]):
+    """
+    A fixed query run directly on the asyncpg connection of a session, skipping SQLAlchemy.
+
+    The ORM path compiles (or looks up) the statement, processes the result and builds instances with
+    their identity map entries on every call. Here the row is decoded by asyncpg and handed to `build`,
+    usually a slots dataclass. The statement is prepared once per connection and kept in asyncpg's
+    statement cache, with PgBouncer that cache is off and it is prepared unnamed on each call.
+
+    The connection is the session's, checked out from the same pool and routed like a `select` from
+    `table`, so replicas, `statement_timeout` of the request and read-your-writes of the session's
+    transaction apply. Before the session sent any statement there is no transaction on the connection
+    yet and the query runs on its own.
+
+    Args:
+        sql (str): The query, with `$1`, `$2`... parameters.
+        table (Table): The table the query reads, used to route it.
+        build (Callable[[asyncpg.Record], R]): Builds the result from a row.
+    """
+
+    def __init__(self, sql: str, *, table: Table, build: Callable[[asyncpg.Record], R]) -> None:
+        self.sql = sql
+        self.build = build
+        self._route = select(table)
+
+    async def _driver_connection(self, session: AsyncSession) -> asyncpg.Connection:
+        connection = await session.connection(bind_arguments={"clause": self._route})
+        return (await connection.get_raw_connection()).driver_connection
+
+    async def fetch_one_or_none(self, session: AsyncSession, *args: Any) -> R | None:
+        async with sql_error_handler(), driver_error_handler():
+            connection = await self._driver_connection(session)
+            row = await connection.fetchrow(self.sql, *args)
+        return None if row is None else self.build(row)
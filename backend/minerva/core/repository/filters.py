@@ -0,0 +1,189 @@
+import operator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Sequence, TypeVar
+
+from sqlalchemy import BindParameter, ColumnElement, Integer, Select, UnaryExpression, bindparam
+from sqlalchemy import inspect as sqla_inspect
+
+from minerva.core.repository.exceptions import RepositoryError
+
+SelectT = TypeVar("SelectT", bound=Select[Any])
+
+LOOKUP_SEP = "__"
+LIKE_ESCAPE = "/"
+LIMIT_PARAM = "filter_limit"
+
+
+def _like_prefix_pattern(value: str) -> str:
+    escaped = (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", f"{LIKE_ESCAPE}%").replace("_", f"{LIKE_ESCAPE}_")
+    )
+    return f"{escaped}%"
+
+
+def _like_prefix(column: Any, value: str | BindParameter[str]) -> ColumnElement[bool]:
+    # Pattern built in Python, so the planner sees a constant prefix and can use a `text_pattern_ops`
+    # (or "C" collation) btree index
+    pattern = value if isinstance(value, BindParameter) else _like_prefix_pattern(value)
+    return column.like(pattern, escape=LIKE_ESCAPE)
+
+
+def _is_null(column: Any, value: bool) -> ColumnElement[bool]:  # noqa: FBT001
+    return column.is_(None) if value else column.is_not(None)
+
+
+def _range(column: Any, value: tuple[Any, Any]) -> ColumnElement[bool]:
+    lower, upper = value
+    if lower is None:
+        return column <= upper
+    if upper is None:
+        return column >= lower
+    return column.between(lower, upper)
+
+
+OPERATORS: dict[str, Callable[[Any, Any], ColumnElement[bool]]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda column, value: column.in_(value),
+    "not_in": lambda column, value: column.not_in(value),
+    "range": _range,
+    "startswith": _like_prefix,
+    "is_null": _is_null,
+}
+# Operators whose SQL does not depend on the value, so they can be bound to a statement template
+TEMPLATE_OPERATORS = frozenset({"eq", "ne", "gt", "gte", "lt", "lte", "in", "not_in", "startswith"})
+
+
+@dataclass(frozen=True, slots=True)
+class Filter:
+    """
+    Declarative filter pushed down to SQL by `SQLAlchemyRepository` methods that take kwargs.
+
+    `where` keys are `<field>` (equality) or `<field>__<operator>`, operators are the keys of `OPERATORS`.
+    `order_by` fields are ascending, or descending when prefixed with `-`. `order_by` and `limit` only
+    apply to methods returning records.
+
+    Example:
+        ```python
+        await repository.list_(
+            filters=Filter(
+                where={
+                    "created_at__gte": since,
+                    "email__startswith": "admin",
+                    "id__in": ids,
+                },
+                order_by=["-created_at"],
+                limit=50,
+            )
+        )
+        ```
+
+    Plain kwargs accept the same lookups: `repository.count(created_at__gte=since)`.
+    """
+
+    where: Mapping[str, Any] = field(default_factory=dict)
+    order_by: Sequence[str] = ()
+    limit: int | None = None
+
+
+@lru_cache(maxsize=1024)
+def _split(lookup: str) -> tuple[str, str]:
+    name, sep, op = lookup.rpartition(LOOKUP_SEP)
+    if not sep or op not in OPERATORS:
+        return lookup, "eq"
+    return name, op
+
+
+@lru_cache(maxsize=1024)
+def _compile_where(model: type[Any], lookups: tuple[str, ...]) -> tuple[tuple[Any, str], ...]:
+    descriptors = sqla_inspect(model).all_orm_descriptors
+    compiled = []
+    for lookup in lookups:
+        name, op = _split(lookup)
+        if name not in descriptors:
+            msg = f"{model.__name__} has no attribute {name!r} to filter by"
+            raise RepositoryError(msg)
+        compiled.append((getattr(model, name), op))
+    return tuple(compiled)
+
+
+@lru_cache(maxsize=1024)
+def compile_order_by(model: type[Any], order_by: tuple[str, ...]) -> tuple[UnaryExpression[Any], ...]:
+    descriptors = sqla_inspect(model).all_orm_descriptors
+    compiled = []
+    for field_ in order_by:
+        name = field_.removeprefix("-")
+        if name not in descriptors:
+            msg = f"{model.__name__} has no attribute {name!r} to order by"
+            raise RepositoryError(msg)
+        column = getattr(model, name)
+        compiled.append(column.desc() if field_.startswith("-") else column.asc())
+    return tuple(compiled)
+
+
+def where_clauses(model: type[Any], where: Mapping[str, Any]) -> list[ColumnElement[bool]]:
+    """
+    Build WHERE clauses for `where` lookups.
+
+    Resolving and validating lookups is cached per model and filter shape, each call only binds values.
+    """
+    lookups = tuple(where)
+    return [
+        OPERATORS[op](column, value)
+        for (column, op), value in zip(_compile_where(model, lookups), where.values(), strict=True)
+    ]
+
+
+def apply_where(statement: SelectT, model: type[Any], where: Mapping[str, Any]) -> SelectT:
+    if not where:
+        return statement
+    return statement.where(*where_clauses(model, where))
+
+
+def apply_order_by_and_limit(statement: SelectT, model: type[Any], filters: Filter | None) -> SelectT:
+    if filters is None:
+        return statement
+    if filters.order_by:
+        statement = statement.order_by(*compile_order_by(model, tuple(filters.order_by)))
+    if filters.limit is not None:
+        statement = statement.limit(filters.limit)
+    return statement
+
+
+def template_shape(where: Sequence[tuple[str, Any]]) -> tuple[str, ...] | None:
+    """Lookups of `where` if they can be bound to a statement template, `None` if their SQL depends on values"""
+    lookups = []
+    for lookup, value in where:
+        if value is None or _split(lookup)[1] not in TEMPLATE_OPERATORS:
+            return None
+        lookups.append(lookup)
+    return tuple(lookups)
+
+
+@lru_cache(maxsize=1024)
+def where_template(model: type[Any], lookups: tuple[str, ...]) -> tuple[ColumnElement[bool], ...]:
+    """
+    WHERE clauses for `lookups` with unbound parameters, named by the position of the lookup.
+
+    Bind values with `template_params`.
+    """
+    return tuple(
+        OPERATORS[op](column, bindparam(f"filter_{i}", expanding=op in {"in", "not_in"}))
+        for i, (column, op) in enumerate(_compile_where(model, lookups))
+    )
+
+
+def template_params(lookups: tuple[str, ...], values: Sequence[Any]) -> dict[str, Any]:
+    return {
+        f"filter_{i}": _like_prefix_pattern(value) if _split(lookup)[1] == "startswith" else value
+        for i, (lookup, value) in enumerate(zip(lookups, values, strict=True))
+    }
+
+
+def limit_template() -> BindParameter[int]:
+    return bindparam(LIMIT_PARAM, type_=Integer)
@@ -0,0 +1,84 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchLoadFn = Callable[[list[K]], Awaitable[list[V | None]]]
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Coalesce `load` calls made in the same event loop tick into a single `batch_load_fn` call.
+
+    `batch_load_fn` receives unique keys and must return values in the same order, `None` for
+    missing keys. Batches are executed one at a time, so a loader built around a repository never
+    issues concurrent statements on its session.
+
+    Example:
+        ```python
+        loader = DataLoader(repository.get_many)
+        a, b = await asyncio.gather(
+            loader.load(1), loader.load(2)
+        )  # one query
+        ```
+    """
+
+    def __init__(self, batch_load_fn: BatchLoadFn[K, V], *, max_batch_size: int | None = None) -> None:
+        self.batch_load_fn = batch_load_fn
+        self.max_batch_size = max_batch_size
+        self._queue: list[tuple[K, asyncio.Future[V | None]]] = []
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: K) -> V | None:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[V | None] = loop.create_future()
+        self._queue.append((key, future))
+
+        if len(self._queue) == 1:
+            loop.call_soon(self._schedule_dispatch)
+
+        return await future
+
+    async def load_many(self, keys: list[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _schedule_dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+        batch_size = self.max_batch_size or len(queue)
+
+        for i in range(0, len(queue), batch_size):
+            task = asyncio.ensure_future(self._dispatch(queue[i : i + batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: list[tuple[K, asyncio.Future[V | None]]]) -> None:
+        keys = list(dict.fromkeys(key for key, _ in batch))
+
+        try:
+            async with self._lock:
+                values = await self.batch_load_fn(keys)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:
+            self._set_exception(batch, exc)
+            return
+
+        if len(values) != len(keys):
+            msg = f"batch_load_fn must return {len(keys)} values, got {len(values)}"
+            self._set_exception(batch, ValueError(msg))
+            return
+
+        results = dict(zip(keys, values, strict=True))
+        for key, future in batch:
+            if not future.done():
+                future.set_result(results[key])
+
+    @staticmethod
+    def _set_exception(batch: list[tuple[K, asyncio.Future[V | None]]], exc: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
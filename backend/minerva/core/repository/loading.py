@@ -0,0 +1,65 @@
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Sequence
+
+from sqlalchemy import inspect as sqla_inspect
+from sqlalchemy.orm import joinedload, noload, raiseload, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+
+from minerva.core.repository.exceptions import RepositoryError
+
+Load = str | Sequence[ExecutableOption]
+"""A named load profile or loader options, e.g. `[joinedload(AccessToken.user)]`"""
+LoadProfile = Callable[[], Sequence[ExecutableOption]]
+"""Builds the loader options of a profile, called on use as options need configured mappers"""
+
+
+def _each_relationship(
+    strategy: Callable[[Any], ExecutableOption],
+) -> Callable[[type[Any]], tuple[ExecutableOption, ...]]:
+    def options(model: type[Any]) -> tuple[ExecutableOption, ...]:
+        return tuple(strategy(relationship.class_attribute) for relationship in sqla_inspect(model).relationships)
+
+    return options
+
+
+BUILTIN_PROFILES: dict[str, Callable[[type[Any]], tuple[ExecutableOption, ...]]] = {
+    "noload": lambda _: (noload("*"),),
+    "raiseload": lambda _: (raiseload("*"),),
+    "joinedload": _each_relationship(joinedload),
+    "selectinload": _each_relationship(selectinload),
+}
+"""Profiles every repository has, applied to all relationships of the model"""
+
+
+@lru_cache(maxsize=256)
+def _builtin_profile(model: type[Any], name: str) -> tuple[ExecutableOption, ...]:
+    return BUILTIN_PROFILES[name](model)
+
+
+def resolve_load(
+    model: type[Any],
+    load: Load | None,
+    profiles: Mapping[str, LoadProfile],
+) -> tuple[ExecutableOption, ...]:
+    """
+    Loader options for `load`.
+
+    Args:
+        model (type[Any]): The model being loaded.
+        load (Load | None): A profile name, looked up in `profiles` and then `BUILTIN_PROFILES`, or loader options.
+        profiles (Mapping[str, LoadProfile]): Named profiles of the repository.
+
+    Returns:
+        tuple[ExecutableOption, ...]: The loader options.
+    """
+    if load is None:
+        return ()
+    if not isinstance(load, str):
+        return tuple(load)
+    if load in profiles:
+        return tuple(profiles[load]())
+    if load in BUILTIN_PROFILES:
+        return _builtin_profile(model, load)
+
+    msg = f"Unknown load profile {load!r}, expected one of: {', '.join([*profiles, *BUILTIN_PROFILES])}"
+    raise RepositoryError(msg)
@@ -0,0 +1,79 @@
+import dataclasses
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Generic, Iterable, Sequence, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import inspect as sqla_inspect
+
+from minerva.core.repository.exceptions import RepositoryError
+
+P = TypeVar("P")
+
+
+def _target_fields(target: type[Any]) -> tuple[str, ...]:
+    if isinstance(target, type) and issubclass(target, BaseModel):
+        return tuple(target.model_fields)
+    if dataclasses.is_dataclass(target):
+        return tuple(field.name for field in dataclasses.fields(target) if field.init)
+    if isinstance(target, type) and issubclass(target, tuple) and hasattr(target, "_fields"):
+        return target._fields  # type: ignore[no-any-return, attr-defined]
+
+    msg = f"Projection target must be a dataclass, NamedTuple or pydantic model, found: {target!r}"
+    raise RepositoryError(msg)
+
+
+def _row_factory(target: type[P], fields: tuple[str, ...], columns: tuple[str, ...]) -> Callable[[Any], P]:
+    if isinstance(target, type) and issubclass(target, BaseModel):
+        # Values come from typed columns, validating them again is what this mode avoids
+        construct = target.model_construct
+        return lambda row: construct(**dict(zip(columns, row, strict=True)))
+    if columns == fields:
+        return lambda row: target(*row)
+    return lambda row: target(**dict(zip(columns, row, strict=True)))
+
+
+@lru_cache(maxsize=1024)
+def _compile(model: type[Any], target: type[P], columns: tuple[str, ...]) -> tuple[tuple[Any, ...], Callable[[Any], P]]:
+    fields = _target_fields(target)
+    columns = columns or fields
+    descriptors = sqla_inspect(model).all_orm_descriptors
+    for name in columns:
+        if name not in descriptors:
+            msg = f"{model.__name__} has no attribute {name!r} to project"
+            raise RepositoryError(msg)
+
+    return tuple(getattr(model, name) for name in columns), _row_factory(target, fields, columns)
+
+
+@dataclass(frozen=True, slots=True)
+class Projection(Generic[P]):
+    """
+    Read columns straight into lightweight `target` objects instead of ORM instances.
+
+    Accepted by `SQLAlchemyRepository.get`, `list_` and `list_and_count` as `projection`. Only `columns`
+    are selected and rows are turned into detached `target` objects, skipping identity map registration
+    and instrumentation. Pydantic models are built with `model_construct`, without validation.
+
+    Example:
+        ```python
+        users = await user_repository.list_(
+            projection=Projection(UserRead)
+        )
+        ```
+
+    Attributes:
+        target (type[P]): A dataclass, NamedTuple or pydantic model.
+        columns (Sequence[str]): Model attributes to select, the fields of `target` by default.
+    """
+
+    target: type[P]
+    columns: Sequence[str] = ()
+
+    def compile(self, model: type[Any]) -> tuple[tuple[Any, ...], Callable[[Any], P]]:
+        """Columns to select and the row factory, cached per model, target and columns"""
+        return _compile(model, self.target, tuple(self.columns))
+
+    def build(self, model: type[Any], rows: Iterable[Any]) -> list[P]:
+        _, factory = self.compile(model)
+        return [factory(row) for row in rows]
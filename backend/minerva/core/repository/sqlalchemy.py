@@ -1,19 +1,66 @@
 # ruff:  noqa: A001 A002
-from typing import Any, Iterable, Literal, TypeVar
+import json
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, ClassVar, Iterable, Literal, Mapping, TypeVar, overload
 
-from sqlalchemy import Select, delete, select
+from sqlalchemy import ARRAY, Executable, Result, Select, any_, bindparam, delete, literal_column, select, text
 from sqlalchemy import func as sqla_func
 from sqlalchemy.ext.asyncio import AsyncSession
-
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import raiseload
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.expression import ClauseElement
+
+from minerva.core.cache import session as cache_session
+from minerva.core.cache.entity import EntityCache
+from minerva.core.cache.identity import get_identity_cache
+from minerva.core.cache.query import CachePolicy, QueryCache, query_cache
 from minerva.core.repository.base import Repository, sql_error_handler
 from minerva.core.repository.exceptions import RepositoryError
+from minerva.core.repository.filters import (
+    LIMIT_PARAM,
+    Filter,
+    apply_order_by_and_limit,
+    apply_where,
+    compile_order_by,
+    limit_template,
+    template_params,
+    template_shape,
+    where_template,
+)
+from minerva.core.repository.loading import Load, LoadProfile, resolve_load
+from minerva.core.repository.projection import P, Projection
+from minerva.core.repository.unit_of_work import is_deferred
 
 T = TypeVar("T")
 U = TypeVar("U")
 SelectT = TypeVar("SelectT", bound=Select[Any])
 
+_templates: dict[tuple[Any, ...], Select[Any]] = {}
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
 
 class SQLAlchemyRepository(Repository[T, U]):
+    cache: EntityCache | None = None
+    """Opt-in second-level cache for reads by primary key, see `EntityCache`"""
+    query_cache: QueryCache = query_cache
+    """Cache used by `count` and `list_` when called with a `cache_policy`, see `QueryCache`"""
+    load_profiles: ClassVar[Mapping[str, LoadProfile]] = {}
+    """Named profiles accepted as `load` on top of `BUILTIN_PROFILES`, see `AccessTokenRepository`"""
+    strict_loading: bool = False
+    """Raise on every relationship not loaded by `load` instead of lazy loading it"""
+
     def __init__(  # noqa: PLR0913
         self,
         session: "AsyncSession",
@@ -27,6 +74,7 @@ class SQLAlchemyRepository(Repository[T, U]):
         super().__init__(**kwargs)
         self.session = session
         self.statement = statement if statement is not None else select(self.model)
+        self._default_statement = statement is None
         self.auto_expunge = auto_expunge
         self.auto_refresh = auto_refresh
         self.auto_commit = auto_commit
@@ -38,19 +86,35 @@ class SQLAlchemyRepository(Repository[T, U]):
             self.session.add(model)
             return model
         if strategy == "merge":
-            return await self.session.merge(model)
+            with self._staging():
+                return await self.session.merge(model)
 
         msg = f"Strategy must be 'add' or 'merge', found:{strategy!r}"
         raise RepositoryError(msg)
 
+    def _staging(self) -> AbstractContextManager[Any]:
+        # A unit of work should not be flushed by the lookups writes make on their own
+        return self.session.no_autoflush if is_deferred(self.session) else nullcontext()
+
     async def _flush_or_commit(self, auto_commit: bool | None = None) -> None:
+        await self._flush(auto_commit=auto_commit)
+        await self._commit(auto_commit=auto_commit)
+
+    async def _flush(self, auto_commit: bool | None = None) -> None:
         if auto_commit is None:
             auto_commit = self.auto_commit
 
-        if auto_commit:
-            return await self.session.commit()
+        # The commit would flush anyway. Flushing first lets writes stage cache entries, which need
+        # the generated keys, before the commit applies them.
+        if auto_commit or not is_deferred(self.session):
+            await self.session.flush()
 
-        return await self.session.flush()
+    async def _commit(self, auto_commit: bool | None = None) -> None:
+        if auto_commit is None:
+            auto_commit = self.auto_commit
+
+        if auto_commit:
+            await self.session.commit()
 
     async def _refresh(
         self,
@@ -60,7 +124,8 @@ class SQLAlchemyRepository(Repository[T, U]):
         auto_refresh: bool,
         with_for_update: bool | None = None,
     ) -> None:
-        if auto_refresh:
+        # Staged instances are not in the database yet
+        if auto_refresh and not is_deferred(self.session):
             await self.session.refresh(instance, attribute_names=attribute_names, with_for_update=with_for_update)
 
     async def _expunge(self, instance: T, auto_expunge: bool | None = None) -> None:
@@ -68,16 +133,148 @@ class SQLAlchemyRepository(Repository[T, U]):
             auto_expunge = self.auto_expunge
 
         if auto_expunge:
+            # The identity cache only holds instances of the session
+            if (cache := get_identity_cache(self.session)) is not None:
+                cache.invalidate(self.model, getattr(instance, self.model_id_attr_name))
             return self.session.expunge(instance)
 
         return None
 
+    # Identity cache methods
+
+    def _identity_cache_get(self, id: U) -> T | None:
+        cache = get_identity_cache(self.session)
+        if cache is None or not self._default_statement:
+            return None
+        return cache.get(self.model, id)
+
+    def _identity_cache_set(self, instance: T) -> None:
+        cache = get_identity_cache(self.session)
+        if cache is not None and self._default_statement:
+            cache.set(self.model, getattr(instance, self.model_id_attr_name), instance)
+
+    def _invalidate_caches(self, *instances: T) -> None:
+        cache = get_identity_cache(self.session)
+        if instances:
+            self.query_cache.invalidate(self.session, self.model.__tablename__)  # type: ignore[attr-defined]
+        for instance in instances:
+            if cache is not None:
+                cache.invalidate(self.model, getattr(instance, self.model_id_attr_name))
+            if self.cache is not None:
+                self.cache.stage(self.session, self.model, instance)
+
+    def _write_through_caches(self, instance: T) -> None:
+        if self.cache is not None:
+            # Staged instances miss values set on flush, like `onupdate` columns
+            write_through = not is_deferred(self.session)
+            self.cache.stage(self.session, self.model, instance, write_through=write_through)
+
+    async def _select_one_or_none(self, id: U, load: Load | None = None) -> T | None:
+        statement, params = await self._build_statement("select", {self.model_id_attr_name: id}, load=load)
+        return (await self._execute(statement, params, load)).scalar_one_or_none()
+
+    async def _get_by_id(self, id: U) -> T | None:
+        if self.cache is None or not self._default_statement:
+            return await self._select_one_or_none(id)
+        return await self.cache.get(self.session, self.model, id, self._select_one_or_none)
+
     # Statement methods
 
+    def _loader_options(self, load: Load | None) -> tuple[ExecutableOption, ...]:
+        options = resolve_load(self.model, load, self.load_profiles)
+        if self.strict_loading:
+            options = (*options, raiseload("*"))
+        return options
+
+    async def _execute(self, statement: Select[Any], params: dict[str, Any], load: Load | None) -> Result[Any]:
+        result = await self.session.execute(statement, params)
+        # Joined eager loads of collections repeat the parent rows
+        return result.unique() if load is not None else result
+
     async def _where_from_kwargs(self, statement: SelectT, **kwargs: Any) -> SelectT:
-        for k, v in kwargs.items():
-            statement = statement.where(getattr(self.model, k) == v)
-        return statement
+        filters: Filter | None = kwargs.pop("filters", None)
+        if filters is not None:
+            statement = apply_where(statement, self.model, filters.where)
+        return apply_where(statement, self.model, kwargs)
+
+    def _template(  # noqa: PLR0913
+        self,
+        kind: Literal["select", "count"],
+        kwargs: dict[str, Any],
+        *,
+        ordered: bool = False,
+        projection: Projection[Any] | None = None,
+        load: Load | None = None,
+    ) -> tuple[Select[Any], dict[str, Any]] | None:
+        """
+        Statement built once per repository class and filter shape, with the parameters to execute it with.
+
+        Returns `None` when `kwargs` can't be bound to a template, e.g. a custom `statement` or `is_null` lookups.
+        """
+        if not self._default_statement or "statement" in kwargs or not isinstance(load, str | None):
+            return None
+
+        filters: Filter | None = kwargs.get("filters")
+        where = [
+            *(filters.where.items() if filters is not None else ()),
+            *((k, v) for k, v in kwargs.items() if k != "filters"),
+        ]
+        lookups = template_shape(where)
+        if lookups is None:
+            return None
+
+        order_by = tuple(filters.order_by) if ordered and filters is not None else ()
+        limit = filters.limit if ordered and filters is not None else None
+
+        columns = projection.compile(self.model)[0] if projection is not None and kind == "select" else ()
+
+        key = (type(self), kind, lookups, order_by, limit is not None, columns, load)
+        statement = _templates.get(key)
+        if statement is None:
+            if kind == "count":
+                statement = select(sqla_func.count()).select_from(self.model)
+            elif columns:
+                statement = select(*columns)
+            else:
+                statement = select(self.model).options(*self._loader_options(load))
+            statement = statement.where(*where_template(self.model, lookups))
+            if order_by:
+                statement = statement.order_by(*compile_order_by(self.model, order_by))
+            if limit is not None:
+                statement = statement.limit(limit_template())
+            _templates[key] = statement
+
+        params = template_params(lookups, [value for _, value in where])
+        if limit is not None:
+            params[LIMIT_PARAM] = limit
+        return statement, params
+
+    async def _build_statement(  # noqa: PLR0913
+        self,
+        kind: Literal["select", "count"],
+        kwargs: dict[str, Any],
+        *,
+        ordered: bool = False,
+        projection: Projection[Any] | None = None,
+        load: Load | None = None,
+    ) -> tuple[Select[Any], dict[str, Any]]:
+        template = self._template(kind, kwargs, ordered=ordered, projection=projection, load=load)
+        if template is not None:
+            return template
+
+        kwargs = dict(kwargs)
+        statement = kwargs.pop("statement", self.statement)
+        filters: Filter | None = kwargs.get("filters")
+        if kind == "count":
+            statement = statement.with_only_columns(sqla_func.count()).select_from(self.model)
+        elif projection is not None:
+            statement = statement.with_only_columns(*projection.compile(self.model)[0]).select_from(self.model)
+        elif options := self._loader_options(load):
+            statement = statement.options(*options)
+        statement = await self._where_from_kwargs(statement, **kwargs)
+        if ordered:
+            statement = apply_order_by_and_limit(statement, self.model, filters)
+        return statement, {}
 
     # Repository methods
 
@@ -86,19 +283,26 @@ class SQLAlchemyRepository(Repository[T, U]):
         Count the number of records in the table. Optionally filter by kwargs.
 
         Args:
-            **kwargs (Any): The kwargs to filter by.
+            cache_policy (CachePolicy | None): Cache the result in `query_cache` according to this policy.
+            filters (Filter | None): Lookups, see `Filter`.
+            **kwargs (Any): The kwargs to filter by, `<field>` or `<field>__<operator>` lookups.
 
         Returns:
             int: The number of records in the table.
         """
-        statement = kwargs.pop("statement", self.statement)
-        statement = statement.with_only_columns(sqla_func.count()).select_from(self.model)
+        cache_policy: CachePolicy | None = kwargs.pop("cache_policy", None)
 
         async with sql_error_handler():
-            statement = await self._where_from_kwargs(statement, **kwargs)
+            statement, params = await self._build_statement("count", kwargs)
 
-            result = await self.session.execute(statement)
-            return result.scalar_one()
+            async def execute() -> int:
+                return (await self.session.execute(statement, params)).scalar_one()
+
+            if cache_policy is None:
+                return await execute()
+            return await self.query_cache.get_or_execute(
+                self.session, statement, execute, policy=cache_policy, params=params
+            )
 
     async def create(self, data: T, **kwargs: Any) -> T:
         auto_commit = kwargs.pop("auto_commit", self.auto_commit)
@@ -107,7 +311,9 @@ class SQLAlchemyRepository(Repository[T, U]):
 
         async with sql_error_handler():
             instance = await self._attach_to_session(data)
-            await self._flush_or_commit(auto_commit=auto_commit)
+            await self._flush(auto_commit=auto_commit)
+            self._invalidate_caches(instance)
+            await self._commit(auto_commit=auto_commit)
             await self._refresh(instance, auto_refresh=auto_refresh)
             await self._expunge(instance, auto_expunge=auto_expunge)
             return instance
@@ -118,7 +324,9 @@ class SQLAlchemyRepository(Repository[T, U]):
 
         async with sql_error_handler():
             self.session.add_all(data)
-            await self._flush_or_commit(auto_commit=auto_commit)
+            await self._flush(auto_commit=auto_commit)
+            self._invalidate_caches(*data)
+            await self._commit(auto_commit=auto_commit)
             for d in data:
                 await self._expunge(d, auto_expunge=auto_expunge)
         return data
@@ -133,7 +341,9 @@ class SQLAlchemyRepository(Repository[T, U]):
         async with sql_error_handler():
             instance = await self.get(id)  # raises
             await self.session.delete(instance)
-            await self._flush_or_commit(auto_commit=auto_commit)
+            await self._flush(auto_commit=auto_commit)
+            self._invalidate_caches(instance)
+            await self._commit(auto_commit=auto_commit)
             await self._expunge(instance, auto_expunge=auto_expunge)
             return instance
 
@@ -150,7 +360,9 @@ class SQLAlchemyRepository(Repository[T, U]):
                 instances.extend(
                     await self.session.scalars(delete(self.model).where(self.model_id_attr == id).returning(self.model))
                 )
-            await self._flush_or_commit(auto_commit=auto_commit)
+            await self._flush(auto_commit=auto_commit)
+            self._invalidate_caches(*instances)
+            await self._commit(auto_commit=auto_commit)
             for instance in instances:
                 await self._expunge(
                     instance,
@@ -158,55 +370,189 @@ class SQLAlchemyRepository(Repository[T, U]):
                 )
             return instances
 
+    async def estimated_count(self, **kwargs: Any) -> int:
+        """
+        Estimate the number of records in the table without scanning it. Optionally filter by kwargs.
+
+        Unfiltered counts are read from `pg_class.reltuples`, filtered ones from the planner's
+        row estimate (`EXPLAIN`). Use it where an approximate number is good enough.
+        Tables without statistics yet are counted exactly with `count`.
+
+        Args:
+            filters (Filter | None): Lookups, see `Filter`.
+            **kwargs (Any): The kwargs to filter by, `<field>` or `<field>__<operator>` lookups.
+
+        Returns:
+            int: The estimated number of records.
+        """
+        statement = kwargs.pop("statement", self.statement)
+
+        async with sql_error_handler():
+            statement = await self._where_from_kwargs(statement, **kwargs)
+
+            if statement.whereclause is None:
+                reltuples = (
+                    await self.session.execute(
+                        text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                        {"table": self.model.__table__.fullname},  # type: ignore[attr-defined]
+                    )
+                ).scalar_one_or_none()
+                if reltuples is not None and reltuples > 0:
+                    return reltuples
+                # -1 (0 before Postgres 14) until the table is vacuumed or analyzed for the first time, or an
+                # empty table. New tables are small, the planner's guess for them is far off but a count is cheap.
+                return await self.count()
+
+            plan = (await self.session.execute(_Explain(statement))).scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
     async def exists(self, **kwargs: Any) -> bool:
         """
         Check if a record exists in the table. Optionally filter by kwargs.
 
         Args:
-            **kwargs (Any): The kwargs to filter by.
+            filters (Filter | None): Lookups, see `Filter`.
+            **kwargs (Any): The kwargs to filter by, `<field>` or `<field>__<operator>` lookups.
 
         Returns:
             bool: Whether or not the record exists.
         """
-        exists = await self.count(**kwargs)
-        return exists > 0
+        statement = kwargs.pop("statement", self.statement)
+
+        async with sql_error_handler():
+            statement = await self._where_from_kwargs(statement, **kwargs)
+            statement = statement.with_only_columns(literal_column("1")).select_from(self.model).limit(1)
+
+            result = await self.session.execute(select(statement.exists()))
+            return result.scalar_one()
+
+    @overload
+    async def get(self, id: U, auto_expunge: bool | None = None, *, projection: Projection[P], **kwargs: Any) -> P: ...
 
-    async def get(self, id: U, auto_expunge: bool | None = None, **kwargs: Any) -> T:
+    @overload
+    async def get(self, id: U, auto_expunge: bool | None = None, *, projection: None = None, **kwargs: Any) -> T: ...
+
+    async def get(
+        self, id: U, auto_expunge: bool | None = None, *, projection: Projection[P] | None = None, **kwargs: Any
+    ) -> T | P:
         """
         Get a record from the table. Optionally filter by kwargs.
 
         Args:
             id (U): The ID of the record to get.
-            **kwargs (Any): The kwargs to filter by.
+            projection (Projection[P] | None): Return a `projection.target` object instead of an ORM instance.
+            load (Load | None): Load profile name or loader options, see `resolve_load`.
+            filters (Filter | None): Lookups, see `Filter`.
+            **kwargs (Any): The kwargs to filter by, `<field>` or `<field>__<operator>` lookups.
 
         Returns:
-            T: The record.
+            T | P: The record.
         """
-        statement = kwargs.pop("statement", self.statement)
-        statement = await self._where_from_kwargs(statement, **kwargs, **{self.model_id_attr_name: id})
+        load: Load | None = kwargs.pop("load", None)
+        if projection is not None:
+            async with sql_error_handler():
+                statement, params = await self._build_statement(
+                    "select", {**kwargs, self.model_id_attr_name: id}, projection=projection
+                )
+                row = await self.check_not_found((await self.session.execute(statement, params)).one_or_none())
+                return projection.build(self.model, [row])[0]
+
+        if auto_expunge is None:
+            auto_expunge = self.auto_expunge
+        by_id = not kwargs and load is None
+        # The identity cache only holds instances of the session, see `_expunge`
+        use_identity_cache = by_id and not auto_expunge
+        if use_identity_cache and (instance := self._identity_cache_get(id)) is not None:
+            return instance
 
         async with sql_error_handler():
-            instance = (await self.session.execute(statement)).scalar_one_or_none()
+            if by_id:
+                instance = await self._get_by_id(id)
+            else:
+                statement, params = await self._build_statement(
+                    "select", {**kwargs, self.model_id_attr_name: id}, load=load
+                )
+                instance = (await self._execute(statement, params, load)).scalar_one_or_none()
             instance = await self.check_not_found(instance)
+            if use_identity_cache:
+                self._identity_cache_set(instance)
             await self._expunge(instance, auto_expunge=auto_expunge)
 
             return instance
 
+    async def get_many(self, ids: list[U], **kwargs: Any) -> list[T | None]:
+        """
+        Get many records from the table with a single `WHERE id = ANY(:ids)` query. Optionally filter by kwargs.
+
+        Args:
+            ids (list[U]): The IDs of the records to get.
+            load (Load | None): Load profile name or loader options, see `resolve_load`.
+            filters (Filter | None): Lookups, see `Filter`.
+            **kwargs (Any): The kwargs to filter by, `<field>` or `<field>__<operator>` lookups.
+
+        Returns:
+            list[T | None]: The records in the order of `ids`, `None` for IDs with no record.
+        """
+        auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
+        load: Load | None = kwargs.pop("load", None)
+        use_identity_cache = not kwargs and load is None and not auto_expunge
+        statement = kwargs.pop("statement", self.statement)
+
+        items: dict[U, T] = {}
+        if use_identity_cache:
+            for id in ids:
+                if (instance := self._identity_cache_get(id)) is not None:
+                    items[id] = instance
+
+        missing_ids = [id for id in dict.fromkeys(ids) if id not in items]
+        if not missing_ids:
+            return [items.get(id) for id in ids]
+
+        statement = await self._where_from_kwargs(statement, **kwargs)
+        statement = statement.where(
+            self.model_id_attr == any_(bindparam("ids", missing_ids, type_=ARRAY(self.model_id_attr.type)))
+        )
+        if options := self._loader_options(load):
+            statement = statement.options(*options)
+
+        async with sql_error_handler():
+            result = await self._execute(statement, {}, load)
+            for item in result.scalars():
+                items[getattr(item, self.model_id_attr_name)] = item
+                if use_identity_cache:
+                    self._identity_cache_set(item)
+                await self._expunge(item, auto_expunge=auto_expunge)
+
+            return [items.get(id) for id in ids]
+
     async def get_one(self, id: U, **kwargs: Any) -> T:
         """
         Get one record from the table. Optionally filter by kwargs.
 
         Args:
             id (U): The ID of the record to get.
+            load (Load | None): Load profile name or loader options, see `resolve_load`.
 
         Returns:
             T: The record.
         """
         auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
+        load: Load | None = kwargs.pop("load", None)
+        if load is not None:
+            async with sql_error_handler():
+                instance = await self.check_not_found(await self._select_one_or_none(id, load))
+                await self._expunge(instance, auto_expunge=auto_expunge)
+                return instance
+
+        if not auto_expunge and (instance := self._identity_cache_get(id)) is not None:
+            return instance
 
         async with sql_error_handler():
-            instance = (await self.session.execute(self.statement.where(self.model_id_attr == id))).scalar_one_or_none()
-            instance = await self.check_not_found(instance)
+            instance = await self.check_not_found(await self._get_by_id(id))
+            if not auto_expunge:
+                self._identity_cache_set(instance)
             await self._expunge(instance, auto_expunge=auto_expunge)
             return instance
 
@@ -216,60 +562,131 @@ class SQLAlchemyRepository(Repository[T, U]):
 
         Args:
             id (U): The ID of the record to get.
+            load (Load | None): Load profile name or loader options, see `resolve_load`.
 
         Returns:
             T | None: The record.
         """
         auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
+        load: Load | None = kwargs.pop("load", None)
+        use_identity_cache = load is None and not auto_expunge
+        if use_identity_cache and (instance := self._identity_cache_get(id)) is not None:
+            return instance
 
         async with sql_error_handler():
-            instance = (await self.session.execute(self.statement.where(self.model_id_attr == id))).scalar_one_or_none()
-            if instance:
+            instance = await self._get_by_id(id) if load is None else await self._select_one_or_none(id, load)
+            if instance and load is None:
+                if use_identity_cache:
+                    self._identity_cache_set(instance)
                 await self._expunge(instance, auto_expunge=auto_expunge)
             return instance
 
-    async def list_(self, **kwargs: Any) -> list[T]:
+    @overload
+    async def list_(self, *, projection: Projection[P], **kwargs: Any) -> list[P]: ...
+
+    @overload
+    async def list_(self, *, projection: None = None, **kwargs: Any) -> list[T]: ...
+
+    async def list_(self, *, projection: Projection[P] | None = None, **kwargs: Any) -> list[T] | list[P]:
         """
         List records from the table. Optionally filter by kwargs.
 
         Args:
-            **kwargs (Any): The kwargs to filter by.
+            projection (Projection[P] | None): Return `projection.target` objects instead of ORM instances.
+            load (Load | None): Load profile name or loader options, see `resolve_load`.
+            cache_policy (CachePolicy | None): Cache the result in `query_cache` according to this policy,
+                ignored with `load` as only column values are cached.
+            filters (Filter | None): Lookups, ordering and limit, see `Filter`.
+            **kwargs (Any): The kwargs to filter by, `<field>` or `<field>__<operator>` lookups.
 
         Returns:
-            list[T]: The records.
+            list[T] | list[P]: The records.
         """
         auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
-        statement = kwargs.pop("statement", self.statement)
-        statement = await self._where_from_kwargs(statement, **kwargs)
+        cache_policy: CachePolicy | None = kwargs.pop("cache_policy", None)
+        load: Load | None = kwargs.pop("load", None)
+        if projection is not None:
+            return await self._list_projected(projection, cache_policy, kwargs)
+
+        statement, params = await self._build_statement("select", kwargs, ordered=True, load=load)
+
+        async def execute() -> list[T]:
+            return list((await self._execute(statement, params, load)).scalars())
+
+        def dump(items: list[T]) -> list[dict[str, Any]] | None:
+            snapshots = [cache_session.snapshot(item) for item in items]
+            return None if None in snapshots else snapshots  # type: ignore[return-value]
+
+        async def restore(snapshots: list[dict[str, Any]]) -> list[T]:
+            return [await cache_session.materialize(self.session, self.model, values) for values in snapshots]
 
         async with sql_error_handler():
-            items = list((await self.session.execute(statement)).scalars())
+            if cache_policy is None or load is not None:
+                items = await execute()
+            else:
+                items = await self.query_cache.get_or_execute(
+                    self.session, statement, execute, policy=cache_policy, params=params, dump=dump, load=restore
+                )
             for item in items:
                 await self._expunge(item, auto_expunge=auto_expunge)
 
             return items
 
+    async def _list_projected(
+        self, projection: Projection[P], cache_policy: CachePolicy | None, kwargs: dict[str, Any]
+    ) -> list[P]:
+        statement, params = await self._build_statement("select", kwargs, ordered=True, projection=projection)
+
+        async def execute() -> list[Any]:
+            return list((await self.session.execute(statement, params)).all())
+
+        async with sql_error_handler():
+            if cache_policy is None:
+                rows = await execute()
+            else:
+                # Rows are immutable, cache them rather than the built objects
+                rows = await self.query_cache.get_or_execute(
+                    self.session, statement, execute, policy=cache_policy, params=params, namespace="rows"
+                )
+            return projection.build(self.model, rows)
+
+    @overload
+    async def list_and_count(self, *, projection: Projection[P], **kwargs: Any) -> tuple[list[P], int]: ...
+
+    @overload
+    async def list_and_count(self, *, projection: None = None, **kwargs: Any) -> tuple[list[T], int]: ...
+
     async def list_and_count(
         self,
+        *,
+        projection: Projection[P] | None = None,
         **kwargs: Any,
-    ) -> tuple[list[T], int]:
+    ) -> tuple[list[T], int] | tuple[list[P], int]:
         """
         List records from the table. Optionally filter by kwargs.
 
         Args:
-            **kwargs (Any): The kwargs to filter by.
+            projection (Projection[P] | None): Return `projection.target` objects instead of ORM instances.
+            load (Load | None): Load profile name or loader options, see `resolve_load`.
+            filters (Filter | None): Lookups, ordering and limit, see `Filter`.
+            **kwargs (Any): The kwargs to filter by, `<field>` or `<field>__<operator>` lookups.
 
         Returns:
-            tuple[list[T], int]: The records and the count of the records.
+            tuple[list[T], int] | tuple[list[P], int]: The records and the count of the records.
         """
         auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
-        statement = kwargs.pop("statement", self.statement)
-        statement = await self._where_from_kwargs(statement, **kwargs)
-        count_statement = statement.with_only_columns(sqla_func.count()).select_from(self.model)
+        load: Load | None = kwargs.pop("load", None)
+        count_statement, count_params = await self._build_statement("count", kwargs)
+        statement, params = await self._build_statement(
+            "select", kwargs, ordered=True, projection=projection, load=load
+        )
 
         async with sql_error_handler():
-            count_result = (await self.session.execute(count_statement)).scalar_one()
-            items = list((await self.session.execute(statement)).scalars())
+            count_result = (await self.session.execute(count_statement, count_params)).scalar_one()
+            if projection is not None:
+                return projection.build(self.model, (await self.session.execute(statement, params)).all()), count_result
+
+            items = list((await self._execute(statement, params, load)).scalars())
 
             for item in items:
                 await self._expunge(item, auto_expunge=auto_expunge)
@@ -288,9 +705,13 @@ class SQLAlchemyRepository(Repository[T, U]):
 
         async with sql_error_handler():
             data_id = getattr(data, self.model_id_attr_name)
-            await self.get(data_id)  # raises `NotFound`
+            with self._staging():
+                await self.get(data_id)  # raises `NotFound`
             instance = await self._attach_to_session(data, strategy="merge")
-            await self._flush_or_commit(auto_commit=auto_commit)
+            await self._flush(auto_commit=auto_commit)
+            self._invalidate_caches(instance)
+            self._write_through_caches(instance)
+            await self._commit(auto_commit=auto_commit)
             await self._refresh(
                 instance,
                 attribute_names=attribute_names,
@@ -300,7 +721,6 @@ class SQLAlchemyRepository(Repository[T, U]):
             await self._expunge(instance, auto_expunge=auto_expunge)
             return instance
 
-    # TODO: many at once
     async def update_many(
         self,
         data: list[T],
@@ -312,11 +732,14 @@ class SQLAlchemyRepository(Repository[T, U]):
         auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
         auto_refresh = kwargs.pop("auto_refresh", self.auto_refresh)
 
-        instances: list[T] = []
         async with sql_error_handler():
-            for d in data:
-                instance = await self._attach_to_session(d, strategy="merge")
-                await self._flush_or_commit(auto_commit=auto_commit)
+            instances = [await self._attach_to_session(d, strategy="merge") for d in data]
+            await self._flush(auto_commit=auto_commit)
+            self._invalidate_caches(*instances)
+            for instance in instances:
+                self._write_through_caches(instance)
+            await self._commit(auto_commit=auto_commit)
+            for instance in instances:
                 await self._refresh(
                     instance,
                     attribute_names=attribute_names,
@@ -324,7 +747,6 @@ class SQLAlchemyRepository(Repository[T, U]):
                     auto_refresh=auto_refresh,
                 )
                 await self._expunge(instance, auto_expunge=auto_expunge)
-                instances.append(instance)
             return instances
 
     async def upsert(
@@ -353,7 +775,10 @@ class SQLAlchemyRepository(Repository[T, U]):
 
         async with sql_error_handler():
             instance = await self._attach_to_session(data, strategy="merge")
-            await self._flush_or_commit(auto_commit=auto_commit)
+            await self._flush(auto_commit=auto_commit)
+            self._invalidate_caches(instance)
+            self._write_through_caches(instance)
+            await self._commit(auto_commit=auto_commit)
             await self._refresh(
                 instance,
                 attribute_names=attribute_names,
@@ -374,11 +799,14 @@ class SQLAlchemyRepository(Repository[T, U]):
         auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
         auto_refresh = kwargs.pop("auto_refresh", self.auto_refresh)
 
-        instances: list[T] = []
         async with sql_error_handler():
-            for d in data:
-                instance = await self._attach_to_session(d, strategy="merge")
-                await self._flush_or_commit(auto_commit=auto_commit)
+            instances = [await self._attach_to_session(d, strategy="merge") for d in data]
+            await self._flush(auto_commit=auto_commit)
+            self._invalidate_caches(*instances)
+            for instance in instances:
+                self._write_through_caches(instance)
+            await self._commit(auto_commit=auto_commit)
+            for instance in instances:
                 await self._refresh(
                     instance,
                     attribute_names=attribute_names,
@@ -386,6 +814,5 @@ class SQLAlchemyRepository(Repository[T, U]):
                     auto_refresh=auto_refresh,
                 )
                 await self._expunge(instance, auto_expunge=auto_expunge)
-                instances.append(instance)
 
             return instances
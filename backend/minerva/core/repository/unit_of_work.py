@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from minerva.core.repository.base import sql_error_handler
+
+DEFERRED_KEY = "minerva.unit_of_work.deferred"
+STATEMENT_COUNT_KEY = "minerva.unit_of_work.statements"
+
+
+@dataclass(slots=True)
+class UnitOfWorkStats:
+    flushes: int = 0
+    statements: int = 0
+
+
+stats = UnitOfWorkStats()
+
+
+def begin_unit_of_work(session: AsyncSession | Session) -> None:
+    """
+    Defer repository flushes on `session` until `flush_unit_of_work`.
+
+    Repository writes only stage changes in the session. Server generated values (autoincrement keys,
+    server defaults) are not available on staged instances and `auto_refresh` is skipped, so only use it
+    for writes whose results are not read back before the flush. Queries still autoflush pending changes.
+    """
+    session.info[DEFERRED_KEY] = True
+
+
+def is_deferred(session: AsyncSession | Session) -> bool:
+    return session.info.get(DEFERRED_KEY, False)
+
+
+async def flush_unit_of_work(session: AsyncSession) -> int:
+    """
+    Flush all staged changes at once, in dependency order, and end the unit of work.
+
+    Returns:
+        int: The number of statements sent to the database, an `executemany` batch counts as one.
+    """
+    session.info.pop(DEFERRED_KEY, None)
+    if not (session.new or session.dirty or session.deleted):
+        return 0
+
+    info = (await session.connection()).info
+    info[STATEMENT_COUNT_KEY] = 0
+    try:
+        async with sql_error_handler():
+            await session.flush()
+    finally:
+        count = info.pop(STATEMENT_COUNT_KEY)
+
+    stats.flushes += 1
+    stats.statements += count
+    return count
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn: Any, *args: Any) -> None:  # noqa: ARG001
+    if (count := conn.info.get(STATEMENT_COUNT_KEY)) is not None:
+        conn.info[STATEMENT_COUNT_KEY] = count + 1
@@ -4,12 +4,17 @@ from typing import Any, Generic, TypeVar
 from minerva.core.repository import exceptions as repository_exceptions
 from minerva.core.repository.base import Repository
 from minerva.core.service import exceptions as service_exceptions
+from minerva.core.tracing import trace_methods
 
 T = TypeVar("T")
 U = TypeVar("U")
 
 
 class Service(Generic[T, U]):
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        trace_methods(cls, "service")
+
     def __init__(self, repository: Repository[T, U]) -> None:
         """# Override this and set `self.repository` to some `Repository` subclass"""
         self.repository = repository
@@ -32,6 +37,9 @@ class Service(Generic[T, U]):
     async def delete_many(self, ids: list[U]) -> list[T]:
         return await self.repository.delete_many(ids)
 
+    async def estimated_count(self, **kwargs: Any) -> int:
+        return await self.repository.estimated_count(**kwargs)
+
     async def exists(self, **kwargs: Any) -> bool:
         return await self.repository.exists(**kwargs)
 
@@ -41,6 +49,9 @@ class Service(Generic[T, U]):
         except repository_exceptions.NotFoundError as exc:
             raise service_exceptions.NotFoundError() from exc
 
+    async def get_many(self, ids: list[U], **kwargs: Any) -> list[T | None]:
+        return await self.repository.get_many(ids, **kwargs)
+
     async def get_one(self, id: U, **kwargs: Any) -> T:
         try:
             return await self.repository.get_one(id, **kwargs)
@@ -56,17 +67,42 @@ class Service(Generic[T, U]):
     async def list_and_count(self, **kwargs: Any) -> tuple[list[T], int]:
         return await self.repository.list_and_count(**kwargs)
 
+    async def load(self, id: U) -> T:
+        """Like `get`, but concurrent calls made in the same event loop tick are batched into one query"""
+        item = await self.repository.loader.load(id)
+        if item is None:
+            raise service_exceptions.NotFoundError()
+        return item
+
+    async def load_many(self, ids: list[U]) -> list[T | None]:
+        return await self.repository.loader.load_many(ids)
+
     async def update(self, data: T) -> T:
         try:
             return await self.repository.update(data)
         except repository_exceptions.NotFoundError as exc:
             raise service_exceptions.NotFoundError() from exc
+        except repository_exceptions.StaleVersionError as exc:
+            raise service_exceptions.StaleVersionError() from exc
 
     async def update_many(self, data: list[T]) -> list[T]:
-        return await self.repository.update_many(data)
+        try:
+            return await self.repository.update_many(data)
+        except repository_exceptions.StaleVersionError as exc:
+            raise service_exceptions.StaleVersionError() from exc
 
     async def upsert(self, data: T) -> T:
-        return await self.repository.upsert(data)
+        try:
+            return await self.repository.upsert(data)
+        except repository_exceptions.StaleVersionError as exc:
+            raise service_exceptions.StaleVersionError() from exc
 
     async def upsert_many(self, data: list[T]) -> list[T]:
-        return await self.repository.upsert_many(data)
+        try:
+            return await self.repository.upsert_many(data)
+        except repository_exceptions.StaleVersionError as exc:
+            raise service_exceptions.StaleVersionError() from exc
+
+
+# Subclasses register themselves, the generic methods are defined here
+trace_methods(Service, "service")
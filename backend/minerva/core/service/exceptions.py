@@ -3,3 +3,7 @@ class ServiceError(Exception):
 
 
 class NotFoundError(ServiceError): ...
+
+
+class StaleVersionError(ServiceError):
+    """The record was changed by someone else since it was read"""
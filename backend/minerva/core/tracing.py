@@ -0,0 +1,271 @@
+import functools
+import inspect
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, ParamSpec, TypeVar
+
+import logfire
+from opentelemetry import context as otel_context
+from opentelemetry import propagate
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace import SpanProcessor
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from minerva.core import metrics
+from minerva.core.config import settings
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+SPANS_KEY = "minerva.tracing.spans"
+
+
+class TracingState:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.methods_instrumented = False
+        self.classes: list[tuple[type, str]] = []
+        """Classes whose public coroutine methods are traced once tracing is enabled, see `trace_methods`"""
+
+
+state = TracingState()
+
+
+def _processors() -> list[SpanProcessor]:
+    if settings.TRACING_EXPORTER == "file":
+        out = Path(settings.TRACING_FILE).open("a")
+        exporter = ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+        return [BatchSpanProcessor(exporter)]
+    if settings.TRACING_EXPORTER == "otlp":
+        return [BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT))]
+    return []
+
+
+def configure_tracing(engines: Iterable[Engine] = ()) -> bool:
+    """
+    Set up Logfire with the `TRACING_*` settings and enable tracing.
+
+    Called by the lifespan, so in each worker after the fork: exporters run threads that would not
+    survive it.
+
+    Args:
+        engines (Iterable[Engine]): Engines whose statements are traced.
+
+    Returns:
+        bool: Whether tracing is on, it is off without `TRACING_EXPORTER`.
+    """
+    if settings.TRACING_EXPORTER is None:
+        return False
+
+    logfire.configure(
+        send_to_logfire=settings.TRACING_EXPORTER == "logfire",
+        token=settings.LOGFIRE_TOKEN.get_secret_value() if settings.LOGFIRE_TOKEN is not None else None,
+        service_name="minerva",
+        trace_sample_rate=settings.TRACING_SAMPLE_RATE,
+        console=logfire.ConsoleOptions(span_style="indented") if settings.TRACING_EXPORTER == "console" else False,
+        processors=_processors(),
+        collect_system_metrics=False,
+        show_summary=False,
+    )
+    enable_tracing(engines)
+    return True
+
+
+def instrument_methods() -> None:
+    """Wrap the methods of the classes registered with `trace_methods`, for tracing or metrics"""
+    state.methods_instrumented = True
+    for cls, layer in state.classes:
+        _wrap_methods(cls, layer)
+
+
+def enable_tracing(engines: Iterable[Engine] = ()) -> None:
+    """Trace requests, repository and service methods, password hashing and the statements of `engines`"""
+    state.enabled = True
+    instrument_methods()
+    for engine in engines:
+        instrument_engine(engine)
+
+
+def disable_tracing() -> None:
+    """Stop creating spans, instrumented code keeps running without them"""
+    state.enabled = False
+
+
+def shutdown_tracing() -> None:
+    if state.enabled:
+        disable_tracing()
+        logfire.shutdown()
+
+
+def traced(msg_template: str, **attributes: Any) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Run the decorated function in a span while tracing is enabled, e.g. CPU heavy calls"""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not state.enabled:
+                return func(*args, **kwargs)
+            with logfire.span(msg_template, **attributes):  # type: ignore[arg-type]
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _row_count(result: Any) -> int | None:
+    if result is None:
+        return 0
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return len(result[0])  # `list_and_count`
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if isinstance(result, (bool, int, float, str)):
+        return None
+    return 1
+
+
+def _model_name(instance: Any) -> str | None:
+    model = getattr(instance, "model", None) or getattr(getattr(instance, "repository", None), "model", None)
+    return None if model is None else model.__name__
+
+
+def _trace_method(method: Callable[..., Awaitable[Any]], layer: str) -> Callable[..., Awaitable[Any]]:
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        token = None
+        if layer == "repository" and metrics.state.enabled:
+            token = metrics.operation.set(f"{type(self).__name__}.{method.__name__}")
+        try:
+            if not state.enabled:
+                return await method(self, *args, **kwargs)
+            with logfire.span(
+                "{layer} {model}.{method}",
+                _span_name=f"{layer}.{method.__name__}",
+                layer=layer,
+                model=_model_name(self),
+                method=method.__name__,
+            ) as span:
+                result = await method(self, *args, **kwargs)
+                if (rows := _row_count(result)) is not None:
+                    span.set_attribute("rows", rows)
+                return result
+        finally:
+            if token is not None:
+                metrics.operation.reset(token)
+
+    wrapper.__traced__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _wrap_methods(cls: type, layer: str) -> None:
+    for name, value in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(value) or getattr(value, "__traced__", False):
+            continue
+        setattr(cls, name, _trace_method(value, layer))
+
+
+def trace_methods(cls: type, layer: str) -> None:
+    """
+    Trace the public coroutine methods `cls` defines, with the model, method and row count of the result.
+
+    Called from `__init_subclass__` of `Repository` and `Service`. Methods are only wrapped once tracing
+    or metrics are enabled, see `instrument_methods`, so there is no overhead without them. Statements
+    run by a repository method are counted under it in `metrics.DB_STATEMENTS`.
+    """
+    state.classes.append((cls, layer))
+    if state.methods_instrumented:
+        _wrap_methods(cls, layer)
+
+
+def _before_cursor_execute(  # noqa: PLR0913
+    conn: Any,
+    cursor: Any,  # noqa: ARG001
+    statement: str,
+    parameters: Any,  # noqa: ARG001
+    context: Any,  # noqa: ARG001
+    executemany: bool,  # noqa: FBT001
+) -> None:
+    if not state.enabled:
+        return
+    span = logfire.span(
+        "{db_statement}",
+        _span_name="sql",
+        db_system=conn.dialect.name,
+        db_statement=statement,
+        db_executemany=executemany,
+    )
+    span.__enter__()
+    conn.info.setdefault(SPANS_KEY, []).append(span)
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, *args: Any) -> None:  # noqa: ARG001
+    if spans := conn.info.get(SPANS_KEY):
+        span = spans.pop()
+        if cursor.rowcount >= 0:
+            span.set_attribute("rows", cursor.rowcount)
+        span.__exit__(None, None, None)
+
+
+def _handle_error(exception_context: Any) -> None:
+    conn = exception_context.connection
+    if conn is not None and (spans := conn.info.get(SPANS_KEY)):
+        exc = exception_context.original_exception
+        spans.pop().__exit__(type(exc), exc, exc.__traceback__)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Trace statements executed by `engine`, each in a span with the SQL and the row count"""
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
+
+
+class TracingMiddleware:
+    """
+    A span per request, with the route and status code, parent of the spans made while handling it.
+
+    Continues the trace of the caller if the request has a `traceparent` header.
+
+    Args:
+        app (ASGIApp): The app.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not state.enabled:
+            return await self.app(scope, receive, send)
+
+        status_code: int | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        carrier = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        token = otel_context.attach(propagate.extract(carrier))
+        try:
+            with logfire.span(
+                "{http_method} {http_path}",
+                _span_name="request",
+                http_method=scope["method"],
+                http_path=scope["path"],
+            ) as span:
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    if (route := scope.get("route")) is not None:
+                        span.set_attribute("http_route", route.path)
+                    if status_code is not None:
+                        span.set_attribute("http_status_code", status_code)
+        finally:
+            otel_context.detach(token)
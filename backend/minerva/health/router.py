@@ -0,0 +1,46 @@
+import time
+
+from fastapi import APIRouter, Request, Response, status
+
+from minerva.core.health import HealthStatus, prober
+from minerva.core.middleware.drain import in_flight
+from minerva.health import schemas
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live", response_model=schemas.Liveness)
+async def live():
+    # Only says the event loop is responsive, a database outage must not get the process restarted
+    return {"status": HealthStatus.OK}
+
+
+@router.get(
+    "/ready",
+    response_model=schemas.Readiness,
+    responses={503: {"model": schemas.Readiness, "description": "Not ready to take traffic"}},
+)
+async def ready(request: Request, response: Response):
+    probe = prober.latest
+    reason = None
+    if not getattr(request.app.state, "ready", False):
+        reason = "Starting up"
+    elif in_flight.draining:
+        reason = "Shutting down"
+    elif not prober.is_fresh:
+        reason = "Health probe is stale"
+    elif probe.status == HealthStatus.FAILING:
+        reason = probe.error
+
+    if reason is not None:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return {
+        "ready": reason is None,
+        "status": HealthStatus.FAILING if reason is not None else probe.status,
+        "reason": reason,
+        "db_latency": probe.db_latency,
+        "pool_usage": probe.pool_usage,
+        "replicas_ejected": probe.replicas_ejected,
+        "probe_age": time.monotonic() - probe.checked_at,
+    }
@@ -0,0 +1,17 @@
+from minerva.core.health import HealthStatus
+from minerva.core.schemas import MinervaBaseModel
+
+
+class Liveness(MinervaBaseModel):
+    status: HealthStatus
+
+
+class Readiness(MinervaBaseModel):
+    ready: bool
+    status: HealthStatus
+    reason: str | None = None
+    db_latency: float | None = None
+    pool_usage: float
+    replicas_ejected: int
+    probe_age: float
+    """Seconds since the last probe"""
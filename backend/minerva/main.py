@@ -1,11 +1,88 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.exception_handlers import http_exception_handler
 from starlette.middleware.authentication import AuthenticationMiddleware
 
+from minerva.access_token.repository import AccessTokenRepository
+from minerva.core import exceptions as http_exceptions
+from minerva.core.config import settings
+from minerva.core.health import prober
+from minerva.core.lifespan import create_lifespan
+from minerva.core.metrics import MetricsMiddleware, registry
 from minerva.core.middleware import authentication
+from minerva.core.middleware.deadline import DeadlineMiddleware
+from minerva.core.middleware.drain import DrainMiddleware
+from minerva.core.middleware.load_shedding import AdaptiveLimit, Bulkhead, LoadSheddingMiddleware
+from minerva.core.repository import exceptions as repository_exceptions
+from minerva.core.service import exceptions as service_exceptions
+from minerva.core.tracing import TracingMiddleware
+from minerva.health.router import router as health_router
+from minerva.metrics.collectors import register_collectors
+from minerva.metrics.router import router as metrics_router
+from minerva.users.repository import UserRepository
 from minerva.users.router import router as users_router
 
-app = FastAPI()
+# Queries every request or sign-in makes, prepared on each pooled connection at startup
+HOT_QUERIES = (
+    (
+        lambda session: AccessTokenRepository(session).get_record_with_user(""),
+        lambda session: UserRepository(session).get_record_by_email(""),
+    )
+    if settings.DB_FAST_PATH
+    else (
+        lambda session: AccessTokenRepository(session).get_one_or_none(id="", load="with_user"),
+        lambda session: UserRepository(session).get_one_or_none_by_email(""),
+    )
+)
+
+# Per worker. Password hashing blocks the event loop, so sign-in and sign-up get a small bulkhead of
+# their own and can't take the worker from cheap reads.
+BULKHEADS = {
+    "default": Bulkhead("default", AdaptiveLimit(64, min_limit=8, max_limit=512, target_latency=0.25), max_queue=256),
+    "password": Bulkhead("password", AdaptiveLimit(4, min_limit=1, max_limit=16, target_latency=0.5), max_queue=16),
+}
+BULKHEAD_ROUTES = {
+    "/users/sign-in": "password",
+    "/users/sign-up": "password",
+}
+register_collectors(registry, BULKHEADS)
+
+# Seconds, `REQUEST_TIMEOUT` for the rest
+DEADLINE_ROUTES = {
+    "/users/sign-in": 5,
+    "/users/sign-up": 5,
+}
+
+app = FastAPI(lifespan=create_lifespan(HOT_QUERIES, prober=prober))
+# Outermost last: tracing and metrics, so they cover everything, drain, deadline so time spent queued
+# counts against the budget, then load shedding, so rejected requests never reach the token lookup
 app.add_middleware(AuthenticationMiddleware, backend=authentication.AuthenticationBackend())
+app.add_middleware(LoadSheddingMiddleware, bulkheads=BULKHEADS, routes=BULKHEAD_ROUTES)
+app.add_middleware(DeadlineMiddleware, routes=DEADLINE_ROUTES)
+app.add_middleware(DrainMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+
+
+@app.exception_handler(repository_exceptions.StaleVersionError)
+@app.exception_handler(service_exceptions.StaleVersionError)
+async def stale_version_handler(request: Request, exc: Exception) -> Response:  # noqa: ARG001
+    # Raised from any versioned update, including the deferred unit of work flush
+    conflict = http_exceptions.Conflict("Resource was modified by another request, reload it and try again")
+    return await http_exception_handler(request, conflict)
+
+
+@app.exception_handler(repository_exceptions.TransientError)
+async def transient_error_handler(request: Request, exc: Exception) -> Response:  # noqa: ARG001
+    # The write services already retried it (`retrying`), what gets here is for the client to retry
+    unavailable = http_exceptions.ServiceUnavailable("Database is busy, try again", headers={"Retry-After": "1"})
+    return await http_exception_handler(request, unavailable)
+
+
+@app.exception_handler(repository_exceptions.DeadlineExceededError)
+async def deadline_exceeded_handler(request: Request, exc: Exception) -> Response:  # noqa: ARG001
+    # `statement_timeout` fired, the request's budget ran out in the database
+    timeout = http_exceptions.GatewayTimeout("Request ran out of time")
+    return await http_exception_handler(request, timeout)
 
 
 @app.get("/")
@@ -13,6 +90,10 @@ def index():
     return {"msg": "Minerva API"}
 
 
+app.include_router(health_router)
+if settings.METRICS_ENABLED and settings.METRICS_ENDPOINT:
+    # Pool, bulkhead and replica internals, not for the public
+    app.include_router(metrics_router)
 app.include_router(users_router)
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy import QueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from minerva.core.cache.entity import entity_cache_counts
+from minerva.core.cache.query import query_cache_counts, query_cache_shape_counts
+from minerva.core.db import retry
+from minerva.core.db.engine import engine, replica_engines
+from minerva.core.db.routing import replicas
+from minerva.core.health import HealthStatus, prober
+from minerva.core.metrics import Counter, Gauge, Labels, Registry
+from minerva.core.middleware import deadline
+from minerva.core.middleware.load_shedding import Bulkhead
+from minerva.core.repository import unit_of_work
+
+
+def _pools() -> list[tuple[str, AsyncEngine]]:
+    return [("primary", engine), *((f"replica{i}", replica) for i, replica in enumerate(replica_engines))]
+
+
+def _pool_connections() -> Iterable[tuple[Labels, Any]]:
+    for name, pool_engine in _pools():
+        pool = pool_engine.sync_engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        yield (name, "checked_out"), pool.checkedout()
+        yield (name, "idle"), pool.checkedin()
+        yield (name, "overflow"), max(0, pool.overflow())
+        yield (name, "size"), pool.size()
+
+
+def _retries() -> Iterable[tuple[Labels, Any]]:
+    stats = retry.stats
+    yield ("transaction",), stats.transactions
+    yield ("retry",), stats.retries
+    yield ("recovered",), stats.recovered
+    yield ("exhausted",), stats.exhausted
+    yield ("budget_exhausted",), stats.budget_exhausted
+
+
+def _replica_reads() -> Iterable[tuple[Labels, Any]]:
+    for i, replica in enumerate(replicas.replicas):
+        yield (f"replica{i}",), replica.reads
+    yield ("primary_fallback",), replicas.primary_fallbacks
+
+
+def _cache_lookups() -> Iterable[tuple[Labels, Any]]:
+    for name, (hits, misses) in (("entity", entity_cache_counts()), ("query", query_cache_counts())):
+        yield (name, "hit"), hits
+        yield (name, "miss"), misses
+
+
+def _query_cache_lookups() -> Iterable[tuple[Labels, Any]]:
+    # One series per statement shape, their number is bounded by the repository templates
+    for statement, (hits, misses) in query_cache_shape_counts().items():
+        yield (statement, "hit"), hits
+        yield (statement, "miss"), misses
+
+
+def register_collectors(registry: Registry, bulkheads: Mapping[str, Bulkhead]) -> None:
+    """Expose the stats the components keep themselves, read when a snapshot is taken"""
+    for metric in (
+        Gauge("db_pool_connections", "Connections of each pool by state", ("pool", "state"), collect=_pool_connections),
+        Counter("db_transactions_total", "Retried transactions by outcome", ("event",), collect=_retries),
+        Counter(
+            "db_unit_of_work_statements_total",
+            "Statements sent by unit of work flushes",
+            collect=lambda: [((), unit_of_work.stats.statements)],
+        ),
+        Counter("db_replica_reads_total", "Reads by replica", ("replica",), collect=_replica_reads),
+        Counter(
+            "db_replica_ejections_total",
+            "Replicas ejected after a connection error",
+            ("replica",),
+            collect=lambda: [((f"replica{i}",), replica.ejections) for i, replica in enumerate(replicas.replicas)],
+        ),
+        Counter(
+            "http_deadline_events_total",
+            "Requests cancelled by their deadline or a client disconnect",
+            ("event",),
+            collect=lambda: [(("timeout",), deadline.stats.timeouts), (("disconnect",), deadline.stats.disconnects)],
+        ),
+        Counter(
+            "bulkhead_requests_total",
+            "Requests by bulkhead and admission",
+            ("bulkhead", "outcome"),
+            collect=lambda: [
+                ((name, outcome), getattr(bulkhead.stats, outcome))
+                for name, bulkhead in bulkheads.items()
+                for outcome in ("admitted", "queued", "rejected")
+            ],
+        ),
+        Gauge(
+            "bulkhead_in_flight",
+            "Requests running in each bulkhead",
+            ("bulkhead",),
+            collect=lambda: [((name,), bulkhead.in_flight) for name, bulkhead in bulkheads.items()],
+        ),
+        Gauge(
+            "bulkhead_limit",
+            "Current adaptive concurrency limit of each bulkhead",
+            ("bulkhead",),
+            collect=lambda: [((name,), bulkhead.limit.limit) for name, bulkhead in bulkheads.items()],
+        ),
+        Counter("cache_lookups_total", "Lookups by cache and result", ("cache", "result"), collect=_cache_lookups),
+        Counter(
+            "query_cache_lookups_total",
+            "Query cache lookups by statement shape and result",
+            ("statement", "result"),
+            collect=_query_cache_lookups,
+        ),
+        Gauge(
+            "health_status",
+            "1 for the status of the latest health probe",
+            ("status",),
+            collect=lambda: [((status.value,), int(prober.latest.status == status)) for status in HealthStatus],
+        ),
+    ):
+        registry.register(metric)
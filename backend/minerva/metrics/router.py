@@ -0,0 +1,15 @@
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from minerva.core.metrics import registry, render, snapshots
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(per_worker: bool = False):  # noqa: FBT001, FBT002
+    # Summed across the workers of `minerva.serve`, or apart with a `worker` label
+    worker_snapshots = await asyncio.to_thread(snapshots, registry.snapshot())
+    return PlainTextResponse(render(worker_snapshots, per_worker=per_worker), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,232 @@
+"""
+Pre-fork server: `python -m minerva.serve`.
+
+The master process binds the socket, imports the app and forks the workers, which accept connections
+on the shared socket, each running uvicorn on uvloop and httptools. Workers that exit, e.g. after
+`SERVER_MAX_REQUESTS` requests or above `SERVER_MAX_MEMORY_MB`, are replaced.
+
+Signals to the master:
+    SIGTERM, SIGINT: Graceful shutdown, workers drain their requests for up to `SHUTDOWN_DRAIN_TIMEOUT`.
+    SIGHUP: Graceful restart, new workers are started before the old ones are stopped.
+
+Workers share their metrics through `METRICS_DIR`, a temporary directory removed on exit if unset.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import random
+import resource
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import FrameType
+from typing import Any, Collection
+
+import uvicorn
+
+from minerva.core.config import settings
+from minerva.core.metrics import MultiProcessStore
+from minerva.core.middleware.drain import in_flight
+
+log = logging.getLogger("minerva.serve")
+
+MEMORY_CHECK_TICKS = 50
+"""Ticks of the uvicorn main loop, 0.1s each, between memory checks"""
+RESPAWN_BACKOFF = 1.0
+"""Seconds to wait before replacing a worker that exited right after it started"""
+
+
+def rss_bytes() -> int:
+    """Resident memory of the current process"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak rather than current usage, but still a cap
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class WorkerServer(uvicorn.Server):
+    def __init__(self, config: uvicorn.Config, max_memory: int = 0) -> None:
+        super().__init__(config)
+        self.max_memory = max_memory
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        # Readiness fails right away instead of once uvicorn is done, the lifespan shutdown comes too late
+        in_flight.start_draining()
+        super().handle_exit(sig, frame)
+
+    async def on_tick(self, counter: int) -> bool:
+        if self.max_memory and counter % MEMORY_CHECK_TICKS == 0 and (rss := rss_bytes()) > self.max_memory:
+            log.info("Worker %d uses %d MB, above the limit, restarting", os.getpid(), rss // 2**20)
+            return True
+        return await super().on_tick(counter)
+
+
+def worker_config(app: Any, max_requests: int, max_requests_jitter: int) -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        proxy_headers=True,
+        log_level="info",
+        timeout_graceful_shutdown=int(settings.SHUTDOWN_DRAIN_TIMEOUT),
+        # Jitter keeps workers started together from restarting together
+        limit_max_requests=max_requests + random.randint(0, max_requests_jitter) if max_requests else None,  # noqa: S311
+    )
+
+
+class Master:
+    def __init__(self, app: Any, sock: socket.socket, args: argparse.Namespace) -> None:
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers: dict[int, float] = {}
+        """Pid of each worker and when it was started"""
+        self.stopping = False
+        self.restarting = False
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.monotonic()
+            return pid
+
+        # Worker
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        random.seed()
+        gc.enable()
+        config = worker_config(self.app, self.args.max_requests, self.args.max_requests_jitter)
+        WorkerServer(config, max_memory=self.args.max_memory_mb * 2**20).run(sockets=[self.sock])
+        os._exit(0)
+
+    def _stop(self, signum: int, _: Any) -> None:
+        log.info("Received %s, shutting down", signal.Signals(signum).name)
+        self.stopping = True
+
+    def _restart(self, *_: Any) -> None:
+        self.restarting = True
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGHUP, self._restart)
+
+        for _ in range(self.args.workers):
+            self.spawn()
+        gc.enable()
+        log.info("Master %d serving on %s with %d workers", os.getpid(), self.sock.getsockname(), len(self.workers))
+
+        while not self.stopping:
+            if self.restarting:
+                self.restart()
+            self.reap()
+            time.sleep(0.2)
+
+        self.terminate(list(self.workers))
+
+    def reap(self, *, respawn_except: Collection[int] = ()) -> None:
+        """Collect exited workers and replace them, except `respawn_except`, e.g. the ones being stopped"""
+        while self.workers:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            started = self.workers.pop(pid, None)
+            if started is None or pid in respawn_except or self.stopping:
+                continue
+            if time.monotonic() - started < RESPAWN_BACKOFF:
+                # Failing on startup, don't fork in a tight loop
+                time.sleep(RESPAWN_BACKOFF)
+            self.spawn()
+
+    def restart(self) -> None:
+        self.restarting = False
+        old = list(self.workers)
+        log.info("Restarting %d workers", len(old))
+        for _ in old:
+            self.spawn()
+        self.terminate(old)
+
+    def terminate(self, pids: list[int]) -> None:
+        for pid in pids:
+            self._signal(pid, signal.SIGTERM)
+
+        # Workers started meanwhile, e.g. by a restart, are still replaced when they exit
+        stopped = set(pids)
+        deadline = time.monotonic() + settings.SHUTDOWN_DRAIN_TIMEOUT + 5
+        while any(pid in self.workers for pid in pids) and time.monotonic() < deadline:
+            self.reap(respawn_except=stopped)
+            time.sleep(0.1)
+
+        for pid in pids:
+            if pid in self.workers:
+                log.warning("Worker %d did not stop in time, killing it", pid)
+                self._signal(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                self.workers.pop(pid, None)
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+def bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m minerva.serve", description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--max-requests", type=int, default=settings.SERVER_MAX_REQUESTS)
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.SERVER_MAX_REQUESTS_JITTER)
+    parser.add_argument("--max-memory-mb", type=int, default=settings.SERVER_MAX_MEMORY_MB)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="[%(process)d] %(levelname)s %(name)s: %(message)s")
+    args = parse_args(argv)
+    sock = bind(args.host, args.port)
+
+    # Set before the import and the fork, every worker reads it. Leftovers of a previous run are dropped.
+    master_pid, metrics_dir = os.getpid(), None
+    if settings.METRICS_DIR is None:
+        metrics_dir = settings.METRICS_DIR = tempfile.mkdtemp(prefix="minerva-metrics-")
+    MultiProcessStore(Path(settings.METRICS_DIR)).clear()
+
+    # Import the app once in the master so workers share its pages. Collections would write to the
+    # objects' headers and copy the pages in every worker, so nothing is collected until the fork
+    # and the objects that exist by then are frozen out of collections for good.
+    gc.disable()
+    from minerva.main import app
+
+    gc.freeze()
+    try:
+        Master(app, sock, args).run()
+    finally:
+        if metrics_dir is not None and os.getpid() == master_pid:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,3 +4,9 @@ from minerva.core.service.exceptions import ServiceError as BaseServiceError
 
 
 class EmailAlreadyExistsError(BaseServiceError): ...
+
+
+class UserNotFoundError(BaseServiceError): ...
+
+
+class WrongPasswordError(BaseServiceError): ...
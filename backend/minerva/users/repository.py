@@ -1,15 +1,42 @@
+from dataclasses import dataclass
+from datetime import datetime
 from uuid import UUID
 
+from minerva.core.cache.entity import EntityCache
+from minerva.core.repository.fast_path import FastQuery
 from minerva.core.repository.sqlalchemy import SQLAlchemyRepository, sql_error_handler
 from minerva.users.models import User
 
 
+@dataclass(frozen=True, slots=True)
+class UserRecord:
+    """Read-only `User` row returned by the fast path"""
+
+    id: UUID
+    email: str
+    hashed_password: str
+    created_at: datetime
+    updated_at: datetime
+
+
+USER_BY_EMAIL = FastQuery(
+    "SELECT id, email, hashed_password, created_at, updated_at FROM users WHERE email = $1",
+    table=User.__table__,  # type: ignore[arg-type]
+    build=lambda row: UserRecord(*row),
+)
+
+
 class UserRepository(SQLAlchemyRepository[User, UUID]):
     model = User
+    # Per worker, a user changed in one worker is stale in the others for up to `ttl`
+    cache = EntityCache(ttl=30, maxsize=10_000)
 
     async def get_one_or_none_by_email(self, email: str) -> User | None:
-        stmt = self.statement.where(User.email == email)
-
         async with sql_error_handler():
-            result = await self.session.execute(stmt)
+            stmt, params = await self._build_statement("select", {"email": email})
+            result = await self.session.execute(stmt, params)
             return result.scalar_one_or_none()
+
+    async def get_record_by_email(self, email: str) -> UserRecord | None:
+        """`get_one_or_none_by_email` on the fast path, see `FastQuery`"""
+        return await USER_BY_EMAIL.fetch_one_or_none(self.session, email)
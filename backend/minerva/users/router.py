@@ -3,11 +3,10 @@ from fastapi import APIRouter, Request, Response, status
 from starlette.authentication import requires
 
 from minerva.access_token import dependencies as access_token_deps
-from minerva.access_token import models as access_token_models
 from minerva.core import exceptions as http_exceptions
 from minerva.core.config import settings
 from minerva.users import dependencies as user_deps
-from minerva.users import exceptions, schemas, security
+from minerva.users import exceptions, schemas
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -38,15 +37,14 @@ async def sign_in(
     user_service: user_deps.UserService,
     data: schemas.UserSignUpIn,
 ):
-    user = await user_service.get_one_or_none_by_email(data.email)
-    if not user:
-        raise http_exceptions.BadRequest("User with this email address doesn't exist")
-
-    is_password_correct = security.verify_password(data.password, hashed_password=user.hashed_password)
-    if not is_password_correct:
-        raise http_exceptions.BadRequest("Wrong password")
+    try:
+        user = await user_service.authenticate(data.email, data.password)
+    except exceptions.UserNotFoundError as exc:
+        raise http_exceptions.BadRequest("User with this email address doesn't exist") from exc
+    except exceptions.WrongPasswordError as exc:
+        raise http_exceptions.BadRequest("Wrong password") from exc
 
-    token = await access_token_service.create(access_token_models.AccessToken(user_id=user.id))
+    token = await access_token_service.create_for_user(user.id)
 
     response.set_cookie(
         settings.ACCESS_TOKEN_COOKIE_NAME,
@@ -1,11 +1,18 @@
 from passlib.context import CryptContext
 
+from minerva.core.metrics import PASSWORD_HASHING, timed
+from minerva.core.tracing import traced
+
 pwd_context = CryptContext(schemes=["argon2"])
 
 
+@traced("argon2 hash")
+@timed(PASSWORD_HASHING, "hash")
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+@traced("argon2 verify")
+@timed(PASSWORD_HASHING, "verify")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
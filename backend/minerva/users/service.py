@@ -1,7 +1,10 @@
+from minerva.core.config import settings
+from minerva.core.db.retry import retrying
+from minerva.core.repository.exceptions import ConflictError
 from minerva.core.service import Service
 from minerva.users import models, schemas, security
-from minerva.users.exceptions import EmailAlreadyExistsError
-from minerva.users.repository import UserRepository
+from minerva.users.exceptions import EmailAlreadyExistsError, UserNotFoundError, WrongPasswordError
+from minerva.users.repository import UserRecord, UserRepository
 
 
 class UserService(Service[models.User, str]):
@@ -9,14 +12,35 @@ class UserService(Service[models.User, str]):
         """UserService"""
         self.repository = repository
 
-    async def get_one_or_none_by_email(self, email: str) -> models.User | None:
+    async def get_one_or_none_by_email(self, email: str) -> models.User | UserRecord | None:
+        if settings.DB_FAST_PATH:
+            return await self.repository.get_record_by_email(email)
         return await self.repository.get_one_or_none_by_email(email)
 
+    async def authenticate(self, email: str, password: str) -> models.User | UserRecord:
+        user = await self.get_one_or_none_by_email(email)
+        if user is None:
+            raise UserNotFoundError()
+
+        # End the lookup's transaction, so its connection goes back to the pool during the argon2 verify
+        await self.repository.session.commit()
+        if not security.verify_password(password, hashed_password=user.hashed_password):
+            raise WrongPasswordError()
+        return user
+
     async def create_from_schema(self, schema: schemas.UserSignUpIn) -> models.User:
-        is_email_taken = await self.exists(email=schema.email)
+        # Hashed before the transaction starts, so it isn't held open (and the hash isn't repeated on a retry)
+        hashed_password = security.get_password_hash(schema.password)
+        return await self._create_user(schema.email, hashed_password)
+
+    @retrying
+    async def _create_user(self, email: str, hashed_password: str) -> models.User:
+        is_email_taken = await self.exists(email=email)
         if is_email_taken:
             raise EmailAlreadyExistsError()
 
-        hashed_password = security.get_password_hash(schema.password)
-        user = models.User(email=schema.email, hashed_password=hashed_password)
-        return await self.create(user)
+        try:
+            return await self.create(models.User(email=email, hashed_password=hashed_password))
+        except ConflictError as exc:
+            # Taken by a concurrent sign-up after the check
+            raise EmailAlreadyExistsError() from exc
@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from minerva.core.db.mixins import VersionMixin
 from minerva.core.repository.sqlalchemy import SQLAlchemyRepository
 from minerva.core.service import Service
 
@@ -26,6 +27,13 @@ class TodoItem(Base):
         return f"<TodoItem(id={self.id}, title={self.title}, description={self.description}, is_completed={self.is_completed})>"  # noqa: E501
 
 
+class VersionedTodoItem(Base, VersionMixin):
+    __tablename__ = "versioned_todo_items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(nullable=False)
+
+
 class TodoItemRepository(SQLAlchemyRepository[TodoItem, int]):
     model = TodoItem
 
@@ -33,3 +41,7 @@ class TodoItemRepository(SQLAlchemyRepository[TodoItem, int]):
 class TodoItemService(Service[TodoItem, int]):
     def __init__(self, repository: TodoItemRepository) -> None:
         super().__init__(repository)
+
+
+class VersionedTodoItemRepository(SQLAlchemyRepository[VersionedTodoItem, int]):
+    model = VersionedTodoItem
@@ -13,9 +13,11 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from minerva.access_token.models import AccessToken  # noqa: F401
 from minerva.access_token.repository import AccessTokenRepository
 from minerva.access_token.service import AccessTokenService
+from minerva.core.cache.entity import clear_entity_caches
+from minerva.core.cache.query import clear_query_caches
 from minerva.core.config import settings
 from minerva.core.db.dependencies import get_session as app_deps_get_session
-from minerva.core.db.engine import Base
+from minerva.core.db.engine import Base, engine_kwargs
 from minerva.core.repository.sqlalchemy import SQLAlchemyRepository
 from minerva.main import app
 from minerva.users.models import User  # noqa: F401
@@ -39,10 +41,14 @@ def faker():
 
 @pytest.fixture(scope="function", autouse=True)
 async def db():
+    await clear_entity_caches()
+    await clear_query_caches()
+
     with init_test_database():
         db_uri = str(settings.DB_URI)
         db_uri_sync = str(settings.DB_URI_SYNC)
-        engine = create_async_engine(db_uri, echo=False)
+        # Same options as the app engine, so `DB_PGBOUNCER=true` runs the suite through PgBouncer
+        engine = create_async_engine(db_uri, **{**engine_kwargs(), "echo": False})
         engine_sync = create_engine(db_uri_sync, echo=False)
 
         async with engine.begin() as conn:
@@ -0,0 +1,133 @@
+# ruff: noqa: ARG001
+import asyncio
+from unittest import mock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from minerva.core.cache.backends import MemoryCacheBackend
+from minerva.users.models import User
+from minerva.users.repository import UserRepository
+from tests._factories import UserFactory
+
+
+@pytest.fixture(scope="function")
+def session_factory(session: AsyncSession) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(session.bind, expire_on_commit=False)
+
+
+async def test_memory_cache_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(maxsize=2)
+    await backend.set("a", 1)
+    await backend.set("b", 2)
+    await backend.get("a")
+    await backend.set("c", 3)
+
+    assert await backend.get("a") == 1
+    assert await backend.get("b") is None
+    assert await backend.get("c") == 3  # noqa: PLR2004
+
+
+async def test_memory_cache_backend_expires_entries():
+    backend = MemoryCacheBackend(ttl=60)
+    await backend.set("a", 1, ttl=-1)
+    await backend.set("b", 2)
+
+    assert await backend.get("a") is None
+    assert await backend.get("b") == 2  # noqa: PLR2004
+
+
+async def test_entity_cache_hit_skips_query(
+    user_factory: UserFactory, session_factory: async_sessionmaker[AsyncSession]
+):
+    user = await user_factory.create()
+
+    async with session_factory() as session:
+        await UserRepository(session).get(user.id)
+
+    async with session_factory() as session:
+        with mock.patch.object(session, "execute", wraps=session.execute) as execute:
+            cached_user = await UserRepository(session).get_one_or_none(user.id)
+
+        execute.assert_not_called()
+        assert cached_user is not None
+        assert cached_user in session
+        assert cached_user.email == user.email
+
+
+async def test_entity_cache_writes_through_after_commit(
+    user_factory: UserFactory, session_factory: async_sessionmaker[AsyncSession]
+):
+    user = await user_factory.create()
+
+    async with session_factory() as session:
+        repository = UserRepository(session)
+        db_user = await repository.get(user.id)
+        db_user.email = "updated@example.com"
+        await repository.update(db_user)
+        await session.commit()
+
+    async with session_factory() as session:
+        with mock.patch.object(session, "execute", wraps=session.execute) as execute:
+            cached_user = await UserRepository(session).get(user.id)
+
+        execute.assert_not_called()
+        assert cached_user.email == "updated@example.com"
+
+
+async def test_entity_cache_auto_commit_update_and_delete(
+    user_factory: UserFactory, session_factory: async_sessionmaker[AsyncSession]
+):
+    user = await user_factory.create()
+
+    async with session_factory() as session:
+        await UserRepository(session).get(user.id)  # fills the cache
+
+    async with session_factory() as session:
+        repository = UserRepository(session)
+        db_user = await repository.get(user.id)
+        db_user.email = "auto-commit@example.com"
+        await repository.update(db_user, auto_commit=True, auto_refresh=False)
+
+    async with session_factory() as session:
+        assert (await UserRepository(session).get(user.id)).email == "auto-commit@example.com"
+        await UserRepository(session).delete(user.id, auto_commit=True)
+
+    async with session_factory() as session:
+        assert await UserRepository(session).get_one_or_none(user.id) is None
+
+
+async def test_entity_cache_rollback_discards_staged_writes(
+    user_factory: UserFactory, session_factory: async_sessionmaker[AsyncSession]
+):
+    user = await user_factory.create()
+
+    async with session_factory() as session:
+        repository = UserRepository(session)
+        db_user = await repository.get(user.id)
+        db_user.email = "rolled-back@example.com"
+        await repository.update(db_user)
+        await session.rollback()
+
+    await asyncio.sleep(0)
+
+    async with session_factory() as session:
+        cached_user = await UserRepository(session).get(user.id)
+        assert cached_user.email == user.email
+
+
+async def test_entity_cache_coalesces_concurrent_misses(
+    user_factory: UserFactory, session_factory: async_sessionmaker[AsyncSession]
+):
+    user = await user_factory.create()
+    sessions = [session_factory() for _ in range(5)]
+    coalesced = UserRepository.cache.coalesced  # type: ignore[union-attr]
+
+    try:
+        users = await asyncio.gather(*(UserRepository(session).get_one_or_none(user.id) for session in sessions))
+    finally:
+        for session in sessions:
+            await session.close()
+
+    assert all(isinstance(u, User) and u.id == user.id for u in users)
+    assert UserRepository.cache.coalesced - coalesced == len(sessions) - 1  # type: ignore[union-attr]
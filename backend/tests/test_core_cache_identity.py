@@ -0,0 +1,105 @@
+# ruff: noqa: ARG001
+from unittest import mock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from minerva.core.cache.identity import IdentityCache, drop_identity_cache, install_identity_cache
+from tests._utils import TodoItem, TodoItemRepository
+
+
+@pytest.fixture(scope="function")
+def identity_cache(session: AsyncSession):
+    cache = install_identity_cache(session)
+    yield cache
+    drop_identity_cache(session)
+
+
+@pytest.fixture(scope="function")
+async def todo_item(session: AsyncSession) -> TodoItem:
+    item = TodoItem(title="Test identity cache", description="test identity cache desc", is_completed=False)
+    session.add(item)
+    await session.commit()
+    return item
+
+
+async def test_repeated_reads_cost_no_round_trips(
+    session: AsyncSession,
+    identity_cache: IdentityCache,
+    todo_item: TodoItem,
+    todo_item_repository: TodoItemRepository,
+):
+    item = await todo_item_repository.get(todo_item.id)
+
+    with mock.patch.object(session, "execute", wraps=session.execute) as execute:
+        assert await todo_item_repository.get(todo_item.id) is item
+        assert await todo_item_repository.get_one(todo_item.id) is item
+        assert await todo_item_repository.get_one_or_none(todo_item.id) is item
+        assert await TodoItemRepository(session).get(todo_item.id) is item
+        assert await todo_item_repository.get_many([todo_item.id]) == [item]
+
+    execute.assert_not_called()
+    assert identity_cache.hits == 5  # noqa: PLR2004
+
+
+async def test_get_with_filters_skips_identity_cache(
+    session: AsyncSession,
+    identity_cache: IdentityCache,
+    todo_item: TodoItem,
+    todo_item_repository: TodoItemRepository,
+):
+    await todo_item_repository.get(todo_item.id)
+
+    with mock.patch.object(session, "execute", wraps=session.execute) as execute:
+        await todo_item_repository.get(todo_item.id, title=todo_item.title)
+
+    execute.assert_called_once()
+
+
+async def test_writes_invalidate_identity_cache(
+    session: AsyncSession,
+    identity_cache: IdentityCache,
+    todo_item: TodoItem,
+    todo_item_repository: TodoItemRepository,
+):
+    item = await todo_item_repository.get(todo_item.id)
+    assert len(identity_cache) == 1
+
+    item.title = "Test identity cache updated"
+    await todo_item_repository.update(item)
+    assert len(identity_cache) == 0
+
+    await todo_item_repository.get(todo_item.id)
+    await todo_item_repository.delete(todo_item.id)
+    assert len(identity_cache) == 0
+
+
+async def test_identity_cache_not_used_without_request_scope(
+    session: AsyncSession,
+    todo_item: TodoItem,
+    todo_item_repository: TodoItemRepository,
+):
+    await todo_item_repository.get(todo_item.id)
+
+    with mock.patch.object(session, "execute", wraps=session.execute) as execute:
+        await todo_item_repository.get(todo_item.id)
+
+    execute.assert_called_once()
+
+
+async def test_auto_expunge_skips_identity_cache(
+    session: AsyncSession,
+    identity_cache: IdentityCache,
+    todo_item: TodoItem,
+    todo_item_repository: TodoItemRepository,
+):
+    item = await todo_item_repository.get(todo_item.id)
+
+    expunged = await todo_item_repository.get(todo_item.id, auto_expunge=True)
+    assert expunged is item
+    assert expunged not in session
+    assert identity_cache.hits == 0
+
+    # The expunged instance left the cache, the next read loads one of the session again
+    item = await todo_item_repository.get_one(todo_item.id)
+    assert item in session
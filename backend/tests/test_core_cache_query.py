@@ -0,0 +1,140 @@
+# ruff: noqa: ARG001
+from unittest import mock
+
+import pytest
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from minerva.core.cache import query
+from minerva.core.cache.query import CachePolicy, QueryCache
+from tests._utils import TodoItem, TodoItemRepository, TodoItemService
+from tests.conftest import DUMMY_COUNT
+
+POLICY = CachePolicy(ttl=60)
+
+
+@pytest.fixture(scope="function")
+def session_factory(session: AsyncSession) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(session.bind, expire_on_commit=False)
+
+
+@pytest.fixture(scope="function")
+def query_cache(monkeypatch: pytest.MonkeyPatch) -> QueryCache:
+    cache = QueryCache()
+    monkeypatch.setattr(TodoItemRepository, "query_cache", cache)
+    return cache
+
+
+async def test_count_is_cached(
+    insert_dummy: list[TodoItem],
+    query_cache: QueryCache,
+    session_factory: async_sessionmaker[AsyncSession],
+):
+    for _ in range(2):
+        async with session_factory() as session:
+            with mock.patch.object(session, "execute", wraps=session.execute) as execute:
+                count = await TodoItemRepository(session).count(cache_policy=POLICY)
+            assert count == DUMMY_COUNT
+
+    execute.assert_not_called()
+    [stats] = query_cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+async def test_count_cache_key_includes_parameters(insert_dummy: list[TodoItem], query_cache: QueryCache, session):
+    repository = TodoItemRepository(session)
+
+    assert await repository.count(cache_policy=POLICY, title=insert_dummy[0].title) == 1
+    assert await repository.count(cache_policy=POLICY, title="Missing") == 0
+
+
+async def test_list_is_cached(
+    insert_dummy: list[TodoItem],
+    query_cache: QueryCache,
+    session_factory: async_sessionmaker[AsyncSession],
+):
+    async with session_factory() as session:
+        items = await TodoItemRepository(session).list_(cache_policy=POLICY)
+
+    async with session_factory() as session:
+        with mock.patch.object(session, "execute", wraps=session.execute) as execute:
+            cached_items = await TodoItemRepository(session).list_(cache_policy=POLICY)
+
+        execute.assert_not_called()
+        assert [item.id for item in cached_items] == [item.id for item in items]
+        assert all(item in session for item in cached_items)
+
+    [stats] = query_cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+async def test_list_max_rows(insert_dummy: list[TodoItem], query_cache: QueryCache, session):
+    repository = TodoItemRepository(session)
+    policy = CachePolicy(ttl=60, max_rows=DUMMY_COUNT - 1)
+
+    await repository.list_(cache_policy=policy)
+    await repository.list_(cache_policy=policy)
+
+    [stats] = query_cache.stats()
+    assert (stats.hits, stats.misses) == (0, 2)
+
+
+async def test_writes_invalidate_cached_queries(
+    insert_dummy: list[TodoItem],
+    query_cache: QueryCache,
+    session_factory: async_sessionmaker[AsyncSession],
+):
+    async with session_factory() as session:
+        repository = TodoItemRepository(session)
+        assert await repository.count(cache_policy=POLICY) == DUMMY_COUNT
+
+        await repository.create(TodoItem(title="Test query cache", description="", is_completed=False))
+        # Writing session reads its own writes
+        assert await repository.count(cache_policy=POLICY) == DUMMY_COUNT + 1
+        await session.commit()
+
+    async with session_factory() as session:
+        assert await TodoItemRepository(session).count(cache_policy=POLICY) == DUMMY_COUNT + 1
+
+
+async def test_auto_commit_writes_invalidate_cached_queries(
+    insert_dummy: list[TodoItem],
+    query_cache: QueryCache,
+    session_factory: async_sessionmaker[AsyncSession],
+):
+    async with session_factory() as session:
+        repository = TodoItemRepository(session)
+        assert await repository.count(cache_policy=POLICY) == DUMMY_COUNT
+        item = TodoItem(title="Auto commit", description="", is_completed=False)
+        await repository.create(item, auto_commit=True)
+
+    async with session_factory() as session:
+        repository = TodoItemRepository(session)
+        assert await repository.count(cache_policy=POLICY) == DUMMY_COUNT + 1
+        await repository.delete(item.id, auto_commit=True)
+
+    async with session_factory() as session:
+        assert await TodoItemRepository(session).count(cache_policy=POLICY) == DUMMY_COUNT
+
+
+async def test_service_count_passes_cache_policy(
+    insert_dummy: list[TodoItem], query_cache: QueryCache, todo_item_service: TodoItemService
+):
+    await todo_item_service.count(cache_policy=POLICY)
+    await todo_item_service.count(cache_policy=POLICY)
+
+    [stats] = query_cache.stats()
+    assert stats.hits == 1
+
+
+def test_statement_key_compiles_each_shape_once():
+    statement = select(TodoItem).where(TodoItem.title == bindparam("title"))
+
+    with mock.patch.object(Select, "compile", autospec=True, side_effect=Select.compile) as compile_:
+        first = query._statement_key(statement, {"title": "a"})
+        second = query._statement_key(select(TodoItem).where(TodoItem.title == bindparam("title")), {"title": "b"})
+        literal = query._statement_key(select(TodoItem).where(TodoItem.title == "c"), {})
+
+    assert compile_.call_count == 2  # noqa: PLR2004
+    assert first[0] == second[0]
+    assert (first[1], second[1], literal[1]) == (["a"], ["b"], ["c"])
@@ -0,0 +1,73 @@
+import pytest
+from pydantic import ValidationError
+
+from minerva.core.config import POOL_PRESETS, Environment, Settings
+from minerva.core.db.engine import engine_kwargs
+
+DB_SETTINGS = {"DB_HOST": "localhost", "DB_DATABASE": "minerva_test", "DB_USER": "minerva", "DB_PASSWORD": "minerva"}
+
+
+@pytest.mark.parametrize("environment", list(Environment))
+def test_pool_profile_defaults_to_environment_preset(environment: Environment):
+    settings = Settings(**DB_SETTINGS, ENVIRONMENT=environment)  # type: ignore[arg-type]
+    assert settings.DB_POOL == POOL_PRESETS[environment]
+
+
+def test_pool_profile_overrides():
+    settings = Settings(
+        **DB_SETTINGS,  # type: ignore[arg-type]
+        ENVIRONMENT=Environment.PRODUCTION,
+        DB_POOL_SIZE=40,
+        DB_POOL_PRE_PING=False,
+        DB_SERVER_SETTINGS={"statement_timeout": "5000"},
+    )
+    preset = POOL_PRESETS[Environment.PRODUCTION]
+
+    assert settings.DB_POOL.size == 40  # type: ignore[attr-defined]  # noqa: PLR2004
+    assert settings.DB_POOL.pre_ping is False  # type: ignore[attr-defined]
+    assert settings.DB_POOL.max_overflow == preset.max_overflow  # type: ignore[attr-defined]
+    assert settings.DB_POOL.server_settings == {**preset.server_settings, "statement_timeout": "5000"}  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize(("name", "value"), [("DB_POOL_SIZE", 0), ("DB_POOL_TIMEOUT", 0), ("DB_POOL_RECYCLE", -2)])
+def test_pool_profile_validation(name: str, value: int):
+    with pytest.raises(ValidationError):
+        Settings(**DB_SETTINGS, **{name: value})  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    ("name", "value"),
+    [
+        ("DB_RETRY_ATTEMPTS", 0),
+        ("DB_RETRY_BACKOFF_BASE", -1),
+        ("DB_RETRY_BUDGET_RATIO", -0.1),
+        ("DB_RETRY_BUDGET_CAPACITY", 0),
+        ("DB_FAN_OUT_CONCURRENCY", 0),
+        ("DB_FAN_OUT_MAX_CONNECTIONS", 0),
+        ("DB_REPLICA_EJECT_SECONDS", 0),
+    ],
+)
+def test_db_settings_validation(name: str, value: float):
+    with pytest.raises(ValidationError):
+        Settings(**DB_SETTINGS, **{name: value})  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    ("environment", "echo", "expected"),
+    [
+        (Environment.LOCAL, None, True),
+        (Environment.STAGING, None, False),
+        (Environment.STAGING, True, True),
+    ],
+)
+def test_echo_sql(environment: Environment, echo: bool | None, expected: bool):  # noqa: FBT001
+    settings = Settings(**DB_SETTINGS, ENVIRONMENT=environment, DB_ECHO=echo)  # type: ignore[arg-type]
+    assert settings.DB_ECHO_SQL is expected
+
+
+def test_engine_kwargs():
+    preset = POOL_PRESETS[Environment.PRODUCTION]
+    kwargs = engine_kwargs(preset)
+    assert kwargs["pool_size"] == preset.size
+    assert kwargs["pool_pre_ping"] is preset.pre_ping
+    assert kwargs["connect_args"]["server_settings"] == preset.server_settings
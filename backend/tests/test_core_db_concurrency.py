@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from minerva.core.db.concurrency import gather_reads
+from tests._database import Session
+from tests._utils import TodoItemRepository
+
+
+@pytest.fixture(scope="function")
+def sessionmaker() -> async_sessionmaker[AsyncSession]:
+    # `db`, which binds `Session`, is autouse
+    return async_sessionmaker(Session.session_factory.kw["bind"], expire_on_commit=False)
+
+
+async def test_gather_reads_runs_each_call_in_its_own_session(
+    sessionmaker: async_sessionmaker[AsyncSession], insert_dummy
+):
+    sessions: list[AsyncSession] = []
+
+    async def count(session: AsyncSession) -> int:
+        sessions.append(session)
+        return await TodoItemRepository(session).count()
+
+    async def completed(session: AsyncSession) -> int:
+        sessions.append(session)
+        return await TodoItemRepository(session).count(is_completed=True)
+
+    total, total_completed = await gather_reads(count, completed, sessionmaker=sessionmaker)
+    assert total == len(insert_dummy)
+    assert total_completed == sum(item.is_completed for item in insert_dummy)
+    assert len(set(sessions)) == 2  # noqa: PLR2004
+
+
+async def test_gather_reads_limits_concurrency(sessionmaker: async_sessionmaker[AsyncSession]):
+    running = peak = 0
+
+    async def read(session: AsyncSession) -> None:  # noqa: ARG001
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await gather_reads(*[read] * 6, limit=2, sessionmaker=sessionmaker)
+    assert peak == 2  # noqa: PLR2004
+
+
+async def test_gather_reads_cancels_other_calls_on_error(sessionmaker: async_sessionmaker[AsyncSession]):
+    cancelled = asyncio.Event()
+
+    async def slow(session: AsyncSession) -> None:  # noqa: ARG001
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def failing(session: AsyncSession) -> None:  # noqa: ARG001
+        msg = "Test gather reads"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="Test gather reads"):
+        await gather_reads(slow, failing, sessionmaker=sessionmaker)
+    assert cancelled.is_set()
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+
+from minerva.core.config import settings
+from minerva.core.db.dependencies import get_read_only_session, get_session
+from minerva.core.db.engine import engine
+from tests._utils import TodoItem
+
+
+@pytest.mark.skipif(settings.DB_PGBOUNCER, reason="No client side pool behind PgBouncer")
+async def test_get_session_checks_out_connection_on_first_use():
+    checked_out = engine.pool.checkedout()  # type: ignore[attr-defined]
+    dependency = get_session()
+    session = await anext(dependency)
+    assert engine.pool.checkedout() == checked_out  # type: ignore[attr-defined]
+
+    await session.execute(select(1))
+    assert engine.pool.checkedout() == checked_out + 1  # type: ignore[attr-defined]
+
+    with pytest.raises(StopAsyncIteration):
+        await anext(dependency)
+    assert engine.pool.checkedout() == checked_out  # type: ignore[attr-defined]
+
+
+async def test_get_session_without_statements_does_not_commit():
+    dependency = get_session()
+    session = await anext(dependency)
+    assert not session.in_transaction()
+
+    with pytest.raises(StopAsyncIteration):
+        await anext(dependency)
+
+
+async def test_read_only_session_rejects_writes():
+    dependency = get_read_only_session()
+    session = await anext(dependency)
+    session.add(TodoItem(title="Test read only", description="test read only"))
+
+    with pytest.raises(DBAPIError, match="read-only transaction"):
+        await session.flush()
+    await dependency.aclose()
@@ -0,0 +1,17 @@
+from sqlalchemy import NullPool
+
+from minerva.core.config import POOL_PRESETS, Environment
+from minerva.core.db.engine import engine_kwargs
+
+
+def test_engine_kwargs_pgbouncer():
+    preset = POOL_PRESETS[Environment.PRODUCTION]
+    kwargs = engine_kwargs(preset, pgbouncer=True)
+    connect_args = kwargs["connect_args"]
+
+    assert kwargs["poolclass"] is NullPool
+    assert "pool_size" not in kwargs
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+    assert connect_args["server_settings"] == {"application_name": preset.server_settings["application_name"]}
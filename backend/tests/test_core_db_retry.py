@@ -0,0 +1,143 @@
+from unittest import mock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from minerva.core.db import retry
+from minerva.core.repository.base import is_transient
+from minerva.core.repository.exceptions import TransientError
+from tests._database import Session
+from tests._utils import TodoItem
+
+
+class _SQLStateError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+def _dbapi_error(sqlstate: str) -> OperationalError:
+    return OperationalError("SELECT 1", {}, _SQLStateError(sqlstate))
+
+
+@pytest.fixture(scope="function")
+def sessionmaker() -> async_sessionmaker[AsyncSession]:
+    # `db`, which binds `Session`, is autouse
+    return async_sessionmaker(Session.session_factory.kw["bind"], expire_on_commit=False)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def no_backoff():
+    with (
+        mock.patch.object(retry, "stats", retry.RetryStats()),
+        mock.patch.object(retry, "budget", retry.RetryBudget(ratio=0.1, capacity=10)),
+        mock.patch.object(retry, "backoff", return_value=0),
+    ):
+        yield
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        (_dbapi_error("40001"), True),
+        (_dbapi_error("40P01"), True),
+        (_dbapi_error("08006"), True),
+        (_dbapi_error("42P01"), False),
+        (IntegrityError("INSERT", {}, _SQLStateError("23505")), False),
+        (TransientError(sqlstate="40001"), True),
+        (ValueError(), False),
+    ],
+)
+def test_is_transient(exc: Exception, expected: bool):  # noqa: FBT001
+    assert is_transient(exc) is expected
+
+
+async def test_run_in_transaction_retries_transient_errors(sessionmaker: async_sessionmaker[AsyncSession]):
+    calls = 0
+
+    async def work(session: AsyncSession) -> int:
+        nonlocal calls
+        calls += 1
+        session.add(TodoItem(title=f"Test retry {calls}", description="test retry"))
+        if calls == 1:
+            exc = _dbapi_error("40001")
+            raise exc
+        return calls
+
+    assert await retry.run_in_transaction(work, sessionmaker=sessionmaker) == 2  # noqa: PLR2004
+    assert retry.stats.retries == 1
+    assert retry.stats.recovered == 1
+    assert retry.stats.sqlstates == {"40001": 1}
+
+    async with sessionmaker() as session:
+        titles = (await session.scalars(select(TodoItem.title))).all()
+    assert titles == ["Test retry 2"]  # the first attempt was rolled back
+
+
+async def test_run_in_transaction_does_not_retry_other_errors(sessionmaker: async_sessionmaker[AsyncSession]):
+    work = mock.AsyncMock(side_effect=_dbapi_error("42P01"))
+    with pytest.raises(OperationalError):
+        await retry.run_in_transaction(work, sessionmaker=sessionmaker)
+    work.assert_awaited_once()
+    assert retry.stats.retries == 0
+
+
+async def test_run_in_transaction_gives_up_after_attempts(sessionmaker: async_sessionmaker[AsyncSession]):
+    work = mock.AsyncMock(side_effect=_dbapi_error("40P01"))
+    with pytest.raises(OperationalError):
+        await retry.run_in_transaction(work, attempts=3, sessionmaker=sessionmaker)
+    assert work.await_count == 3  # noqa: PLR2004
+    assert retry.stats.exhausted == 1
+
+
+async def test_run_in_transaction_respects_retry_budget(sessionmaker: async_sessionmaker[AsyncSession]):
+    retry.budget.tokens = 0
+    work = mock.AsyncMock(side_effect=_dbapi_error("40001"))
+    with pytest.raises(OperationalError):
+        await retry.run_in_transaction(work, sessionmaker=sessionmaker)
+    work.assert_awaited_once()
+    assert retry.stats.budget_exhausted == 1
+
+
+async def test_run_in_transaction_validates_attempts(sessionmaker: async_sessionmaker[AsyncSession]):
+    work = mock.AsyncMock()
+    with pytest.raises(ValueError, match="attempts"):
+        await retry.run_in_transaction(work, attempts=0, sessionmaker=sessionmaker)
+    work.assert_not_awaited()
+
+
+async def test_retry_in_session_retries_only_the_work(sessionmaker: async_sessionmaker[AsyncSession]):
+    async with sessionmaker() as session:
+        session.add(TodoItem(title="Test before", description="test retry"))
+        calls = 0
+
+        async def work() -> int:
+            nonlocal calls
+            calls += 1
+            session.add(TodoItem(title=f"Test retry {calls}", description="test retry"))
+            await session.flush()
+            if calls == 1:
+                raise TransientError(sqlstate="40001")
+            return calls
+
+        assert await retry.retry_in_session(session, work) == 2  # noqa: PLR2004
+        assert not session.in_transaction()
+
+    assert retry.stats.recovered == 1
+    async with sessionmaker() as session:
+        titles = (await session.scalars(select(TodoItem.title).order_by(TodoItem.title))).all()
+    assert titles == ["Test before", "Test retry 2"]  # committed before the work, the first attempt rolled back
+
+
+async def test_retry_in_session_nested_runs_in_the_outer_transaction(sessionmaker: async_sessionmaker[AsyncSession]):
+    async with sessionmaker() as session:
+        inner = mock.AsyncMock(return_value=1)
+
+        async def work() -> int:
+            return await retry.retry_in_session(session, inner)
+
+        assert await retry.retry_in_session(session, work) == 1
+    inner.assert_awaited_once()
+    assert retry.stats.transactions == 1
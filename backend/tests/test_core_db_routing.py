@@ -0,0 +1,109 @@
+from unittest import mock
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from minerva.core.config import settings
+from minerva.core.db import routing
+from minerva.core.db.engine import engine_kwargs
+from minerva.core.db.routing import ReplicaSet, RoutingSession, use_primary
+from tests._utils import TodoItem
+
+
+@pytest.fixture(scope="function")
+async def engines():
+    primary, *replica_engines = (create_async_engine(str(settings.DB_URI), **engine_kwargs()) for _ in range(3))
+    yield primary, replica_engines
+    for engine in (primary, *replica_engines):
+        await engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def replicas(engines: tuple[AsyncEngine, list[AsyncEngine]]):
+    replica_set = ReplicaSet(engines[1])
+    with mock.patch.object(routing, "replicas", replica_set):
+        yield replica_set
+
+
+@pytest.fixture(scope="function")
+def routing_session(engines: tuple[AsyncEngine, list[AsyncEngine]], replicas: ReplicaSet) -> AsyncSession:  # noqa: ARG001
+    return async_sessionmaker(engines[0], sync_session_class=RoutingSession, replica_reads=True)()
+
+
+def test_replica_set_round_robin(engines: tuple[AsyncEngine, list[AsyncEngine]]):
+    replica_set = ReplicaSet(engines[1])
+    chosen = [replica_set.choose() for _ in range(4)]
+    assert chosen == [engine.sync_engine for engine in engines[1]] * 2
+
+
+def test_replica_set_least_busy(engines: tuple[AsyncEngine, list[AsyncEngine]]):
+    replica_set = ReplicaSet(engines[1], selection="least_busy")
+    with mock.patch.object(type(replica_set.replicas[0]), "busy", new_callable=mock.PropertyMock) as busy:
+        busy.side_effect = [3, 1]
+        assert replica_set.choose() is engines[1][1].sync_engine
+
+
+def test_replica_set_ejects_and_falls_back_to_primary(engines: tuple[AsyncEngine, list[AsyncEngine]]):
+    replica_set = ReplicaSet(engines[1], eject_seconds=60)
+    first, second = (engine.sync_engine for engine in engines[1])
+
+    replica_set.eject(first)
+    assert {replica_set.choose() for _ in range(3)} == {second}
+
+    replica_set.eject(second)
+    assert replica_set.choose() is None
+    assert replica_set.primary_fallbacks == 1
+
+
+def test_routing_session_sends_reads_to_replicas(
+    engines: tuple[AsyncEngine, list[AsyncEngine]], routing_session: AsyncSession
+):
+    bind = routing_session.sync_session.get_bind(clause=select(TodoItem))
+    assert bind in {engine.sync_engine for engine in engines[1]}
+
+
+def test_routing_session_pins_one_replica(
+    engines: tuple[AsyncEngine, list[AsyncEngine]], routing_session: AsyncSession, replicas: ReplicaSet
+):
+    binds = {routing_session.sync_session.get_bind(clause=select(TodoItem)) for _ in range(3)}
+    assert len(binds) == 1
+
+    replicas.eject(binds.pop())
+    primary = engines[0].sync_engine
+    assert routing_session.sync_session.get_bind(clause=select(TodoItem)) is primary
+    replicas.replicas[0].ejected_until = replicas.replicas[1].ejected_until = 0
+    assert routing_session.sync_session.get_bind(clause=select(TodoItem)) is primary
+
+
+def test_routing_session_that_may_write_reads_from_primary(
+    engines: tuple[AsyncEngine, list[AsyncEngine]],
+    replicas: ReplicaSet,  # noqa: ARG001
+):
+    session = async_sessionmaker(engines[0], sync_session_class=RoutingSession)()
+    assert session.sync_session.get_bind(clause=select(TodoItem)) is engines[0].sync_engine
+
+
+def test_routing_session_sticks_to_primary_after_write(
+    engines: tuple[AsyncEngine, list[AsyncEngine]], routing_session: AsyncSession
+):
+    primary = engines[0].sync_engine
+    assert routing_session.sync_session.get_bind(clause=insert(TodoItem)) is primary
+    assert routing_session.sync_session.get_bind(clause=select(TodoItem)) is primary
+
+
+def test_routing_session_locking_reads_and_use_primary(
+    engines: tuple[AsyncEngine, list[AsyncEngine]], routing_session: AsyncSession
+):
+    primary = engines[0].sync_engine
+    assert routing_session.sync_session.get_bind(clause=select(TodoItem).with_for_update()) is primary
+
+    other = async_sessionmaker(engines[0], sync_session_class=RoutingSession, replica_reads=True)()
+    use_primary(other)
+    assert other.sync_session.get_bind(clause=select(TodoItem)) is primary
+
+
+async def test_routing_session_executes_on_replica(routing_session: AsyncSession, replicas: ReplicaSet):
+    await routing_session.execute(select(TodoItem))
+    assert sum(replica.reads for replica in replicas.replicas) == 1
+    await routing_session.close()
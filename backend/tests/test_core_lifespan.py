@@ -0,0 +1,54 @@
+from unittest import mock
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from minerva.core.config import settings
+from minerva.core.lifespan import check_schema, warm_up
+from minerva.core.middleware.drain import DrainMiddleware, InFlightRequests
+from tests._database import Session
+
+
+@pytest.fixture(scope="function")
+def engine() -> AsyncEngine:
+    # `db`, which binds `Session`, is autouse
+    return Session.session_factory.kw["bind"]
+
+
+@pytest.mark.skipif(settings.DB_PGBOUNCER, reason="No client side pool behind PgBouncer")
+async def test_warm_up_opens_pool_connections(engine: AsyncEngine):
+    primer = mock.AsyncMock()
+    with mock.patch.object(settings, "DB_WARMUP_CONNECTIONS", 3):
+        warmed = await warm_up(engine, [primer])
+
+    assert warmed == 3  # noqa: PLR2004
+    assert primer.await_count == 3  # noqa: PLR2004
+    assert engine.pool.checkedin() >= 3  # type: ignore[attr-defined]  # noqa: PLR2004
+
+
+async def test_check_schema(engine: AsyncEngine):
+    async with engine.connect() as connection:
+        await check_schema(connection)
+
+        await connection.execute(text("DROP TABLE access_tokens"))
+        with pytest.raises(RuntimeError, match="access_tokens"):
+            await check_schema(connection)
+
+
+async def test_drain_middleware_rejects_requests_while_draining():
+    requests = InFlightRequests()
+    app = DrainMiddleware(Starlette(routes=[Route("/", lambda _: PlainTextResponse("ok"))]), requests=requests)
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/")).status_code == 200  # noqa: PLR2004
+        requests.start_draining()
+        response = await client.get("/")
+
+    assert response.status_code == 503  # noqa: PLR2004
+    assert response.headers["Retry-After"] == "1"
+    assert requests.count == 0
@@ -0,0 +1,184 @@
+import fcntl
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from minerva.core import metrics
+from minerva.core.cache import query
+from minerva.core.cache.query import QueryCache, QueryCacheStats
+from minerva.core.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsMiddleware,
+    MultiProcessStore,
+    Registry,
+    disable_metrics,
+    enable_metrics,
+    merge,
+    render,
+    timed,
+)
+from minerva.metrics.collectors import register_collectors
+from minerva.metrics.router import router as metrics_router
+
+DEAD_PID = "999999999"
+
+
+@pytest.fixture(scope="function")
+def enabled():
+    metrics.registry.reset()
+    enable_metrics()
+    yield
+    disable_metrics()
+    metrics.registry.reset()
+
+
+@pytest.fixture(scope="function")
+def registry() -> Registry:
+    registry = Registry()
+    requests = registry.register(Counter("requests_total", "Requests", ("route",)))
+    requests.inc(("/a",))
+    requests.inc(("/a",))
+    requests.inc(('/"b"',))
+    latency = registry.register(Histogram("latency_seconds", "Latency", buckets=(0.1, 1)))
+    latency.observe((), 0.05)
+    latency.observe((), 0.5)
+    latency.observe((), 5)
+    registry.register(Gauge("in_flight", "In flight")).set((), 3)
+    return registry
+
+
+def test_render(registry: Registry):
+    text = render({"1": registry.snapshot()})
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/a"} 2' in text
+    assert 'requests_total{route="/\\"b\\""} 1' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_sum 5.55" in text
+    assert "latency_seconds_count 3" in text
+    assert "in_flight 3" in text
+
+
+def test_render_aggregates_workers(registry: Registry):
+    snapshot = registry.snapshot()
+    text = render({"1": snapshot, "2": snapshot})
+    assert 'requests_total{route="/a"} 4' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 6' in text
+    assert "in_flight 6" in text
+
+    text = render({"1": snapshot, "2": snapshot}, per_worker=True)
+    assert 'requests_total{route="/a",worker="1"} 2' in text
+    assert 'requests_total{route="/a",worker="2"} 2' in text
+
+
+def test_merge_new_labels(registry: Registry):
+    other = Registry()
+    other.register(Counter("requests_total", "Requests", ("route",))).inc(("/c",))
+    [*samples] = merge([registry.snapshot(), other.snapshot()])["requests_total"]["samples"]
+    assert sorted(samples) == [[['/"b"'], 1], [["/a"], 2], [["/c"], 1]]
+
+
+def test_store_archives_exited_workers(tmp_path: Path, registry: Registry):
+    store = MultiProcessStore(tmp_path)
+    store.write(registry.snapshot())
+    store.write(registry.snapshot(), worker=DEAD_PID)
+
+    snapshots = store.read()
+    assert set(snapshots) == {str(os.getpid()), "archive"}
+    assert not (tmp_path / f"{DEAD_PID}.json").exists()
+    assert "in_flight" not in snapshots["archive"]
+
+    store.write(registry.snapshot(), worker=DEAD_PID)
+    text = render(store.read())
+    assert 'requests_total{route="/a"} 6' in text
+    assert "in_flight 3" in text
+
+
+def test_store_read_waits_for_archiving(tmp_path: Path, registry: Registry):
+    store = MultiProcessStore(tmp_path)
+    store.write(registry.snapshot(), worker=DEAD_PID)
+
+    with (tmp_path / ".lock").open("w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)  # another worker archiving
+        reader = ThreadPoolExecutor(1)
+        read = reader.submit(store.read)
+        time.sleep(0.05)
+        assert not read.done()
+
+    assert set(read.result(timeout=1)) == {"archive"}
+    reader.shutdown()
+
+
+def test_timed(enabled):  # noqa: ARG001
+    histogram = Histogram("work_seconds", "Work")
+
+    @timed(histogram, "op")
+    def work() -> int:
+        return 1
+
+    assert work() == 1
+    assert histogram.values[("op",)][-1] >= 0
+    assert sum(histogram.values[("op",)][:-1]) == 1
+
+
+def test_statements_by_operation(enabled):  # noqa: ARG001
+    engine = create_engine("sqlite://")
+    metrics.instrument_engine(engine)
+    token = metrics.operation.set("TodoItemRepository.get")
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    finally:
+        metrics.operation.reset(token)
+
+    assert sum(metrics.DB_STATEMENTS.values[("TodoItemRepository.get",)][:-1]) == 1
+
+
+async def test_middleware_and_endpoint(enabled):  # noqa: ARG001
+    api = FastAPI()
+    api.include_router(metrics_router)
+
+    @api.get("/items/{id}")
+    def item(id: int):  # noqa: A002
+        return {"id": id}
+
+    async with httpx.AsyncClient(app=MetricsMiddleware(api), base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        await client.get("/missing")
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200  # noqa: PLR2004
+    assert 'http_requests_total{method="GET",route="/items/{id}",status="200"} 2' in response.text
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{id}"} 2' in response.text
+
+
+def test_collectors():
+    registry = Registry()
+    register_collectors(registry, {})
+    text = render({"1": registry.snapshot()})
+    assert "# TYPE db_pool_connections gauge" in text
+    assert 'db_transactions_total{event="retry"}' in text
+    assert 'health_status{status="ok"}' in text
+
+
+def test_query_cache_lookups_by_statement(monkeypatch: pytest.MonkeyPatch):
+    cache = QueryCache()
+    cache._stats["SELECT 1\nFROM t"] = QueryCacheStats("SELECT 1\nFROM t", hits=3, misses=1)
+    monkeypatch.setattr(query, "_caches", [cache])
+
+    registry = Registry()
+    register_collectors(registry, {})
+    text = render({"1": registry.snapshot()})
+    assert 'query_cache_lookups_total{statement="SELECT 1 FROM t",result="hit"} 3' in text
+    assert 'query_cache_lookups_total{statement="SELECT 1 FROM t",result="miss"} 1' in text
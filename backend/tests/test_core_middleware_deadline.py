@@ -0,0 +1,163 @@
+import asyncio
+from unittest import mock
+
+import httpx
+import pytest
+from fastapi import Request, status
+from sqlalchemy.exc import OperationalError
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+from starlette.types import Message
+
+from minerva.core import deadline as request_deadline
+from minerva.core.middleware import deadline
+from minerva.core.middleware.deadline import DeadlineMiddleware
+from minerva.core.repository.base import sql_error_handler
+from minerva.core.repository.exceptions import DeadlineExceededError
+from minerva.main import deadline_exceeded_handler
+
+
+class _SQLStateError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+@pytest.fixture(scope="function", autouse=True)
+def deadline_stats(monkeypatch: pytest.MonkeyPatch) -> deadline.DeadlineStats:
+    stats = deadline.DeadlineStats()
+    monkeypatch.setattr(deadline, "stats", stats)
+    return stats
+
+
+async def slow(_):
+    await asyncio.sleep(1)
+    return PlainTextResponse("ok")
+
+
+async def budget(_):
+    return JSONResponse({"remaining": request_deadline.remaining()})
+
+
+@pytest.fixture(scope="function")
+async def client():
+    app = DeadlineMiddleware(
+        Starlette(routes=[Route("/slow", slow), Route("/budget", budget)]),
+        routes={"/slow": 0.01},
+    )
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+async def test_deadline_times_out(client: httpx.AsyncClient, deadline_stats: deadline.DeadlineStats):
+    response = await client.get("/slow")
+    assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+    assert deadline_stats.timeouts == 1
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, 10),
+        ("2.5", 2.5),
+        ("1000", 60),
+        ("0", 10),
+        ("soon", 10),
+    ],
+)
+async def test_deadline_budget(client: httpx.AsyncClient, header: str | None, expected: float):
+    headers = {} if header is None else {"X-Request-Timeout": header}
+    response = await client.get("/budget", headers=headers)
+    assert expected - 1 < response.json()["remaining"] <= expected
+
+
+async def test_deadline_from_header_overrides_route(client: httpx.AsyncClient):
+    response = await client.get("/slow", headers={"X-Request-Timeout": "5"})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_no_deadline_outside_of_request():
+    assert request_deadline.remaining() is None
+    assert request_deadline.statement_timeout_ms() is None
+
+
+async def test_statement_timeout_is_positive():
+    async def run():
+        request_deadline.set_deadline(-1)
+        return request_deadline.statement_timeout_ms()
+
+    assert await asyncio.create_task(run()) == 1
+
+
+async def test_statement_timeout_is_a_bound_parameter():
+    connection = mock.Mock()
+    connection.dialect.name = "postgresql"
+
+    async def run():
+        for timeout in (1, 2):
+            request_deadline.set_deadline(timeout)
+            request_deadline._set_statement_timeout(mock.Mock(), mock.Mock(), connection)
+
+    await asyncio.create_task(run())
+
+    statements = {call.args[0] for call in connection.execute.call_args_list}
+    assert statements == {request_deadline.SET_STATEMENT_TIMEOUT}
+    assert all(call.args[1]["timeout"].isdigit() for call in connection.execute.call_args_list)
+
+
+async def test_disconnect_cancels_request(deadline_stats: deadline.DeadlineStats):
+    cancelled = asyncio.Event()
+
+    async def app(*_):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    messages = [{"type": "http.request", "body": b"", "more_body": False}, {"type": "http.disconnect"}]
+    sent: list[Message] = []
+
+    async def receive() -> Message:
+        return messages.pop(0)
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    scope = {"type": "http", "path": "/", "headers": []}
+    await DeadlineMiddleware(app)(scope, receive, send)
+    assert cancelled.is_set()
+    assert not sent
+    assert deadline_stats.disconnects == 1
+
+
+async def test_background_task_outlives_deadline():
+    done = asyncio.Event()
+
+    async def background():
+        await asyncio.sleep(0.05)
+        done.set()
+
+    async def endpoint(_):
+        return PlainTextResponse("ok", background=BackgroundTask(background))
+
+    app = DeadlineMiddleware(Starlette(routes=[Route("/", endpoint)]), routes={"/": 0.01})
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert done.is_set()
+
+
+async def test_query_canceled_is_deadline_exceeded():
+    exc = OperationalError("SELECT pg_sleep(10)", {}, _SQLStateError("57014"))
+    with pytest.raises(DeadlineExceededError):
+        async with sql_error_handler():
+            raise exc
+
+
+async def test_deadline_exceeded_is_gateway_timeout():
+    response = await deadline_exceeded_handler(Request({"type": "http"}), DeadlineExceededError())
+    assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
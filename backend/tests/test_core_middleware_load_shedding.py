@@ -0,0 +1,128 @@
+import asyncio
+from unittest import mock
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from minerva.core.db.engine import current_pool_wait
+from minerva.core.middleware import load_shedding
+from minerva.core.middleware.load_shedding import AdaptiveLimit, Bulkhead, LoadSheddingMiddleware
+
+
+def test_adaptive_limit_grows_when_fast():
+    limit = AdaptiveLimit(10, target_latency=0.5)
+    limit.update(0.1, in_flight=9)
+    assert limit.limit == pytest.approx(10.1)
+
+    limit.update(0.1, in_flight=0)  # not in use, no signal
+    assert limit.limit == pytest.approx(10.1)
+
+
+def test_adaptive_limit_shrinks_when_slow():
+    limit = AdaptiveLimit(10, min_limit=8.5, target_latency=0.5)
+    limit.update(1, in_flight=9)
+    assert limit.limit == pytest.approx(9)
+
+    limit.update(1, in_flight=9)  # same window
+    assert limit.limit == pytest.approx(9)
+
+    limit._last_decrease = 0
+    limit.update(1, in_flight=9)
+    assert limit.limit == 8.5  # noqa: PLR2004
+
+
+def test_adaptive_limit_shrinks_on_pool_wait():
+    limit = AdaptiveLimit(10, target_latency=0.5, target_pool_wait=0.05)
+    limit.update(0.1, in_flight=9, pool_wait=0.1)  # fast, but waited for a connection
+    assert limit.limit == pytest.approx(9)
+
+
+async def test_bulkhead_queues_over_limit():
+    bulkhead = Bulkhead("test", AdaptiveLimit(1), max_queue=1, queue_timeout=1)
+    assert await bulkhead.acquire()
+
+    queued = asyncio.create_task(bulkhead.acquire())
+    await asyncio.sleep(0)
+    assert not await bulkhead.acquire()  # queue is full
+
+    bulkhead.release()
+    assert await queued
+    assert bulkhead.in_flight == 1
+    assert (bulkhead.stats.admitted, bulkhead.stats.queued, bulkhead.stats.rejected) == (2, 1, 1)
+
+
+async def test_bulkhead_queue_timeout():
+    bulkhead = Bulkhead("test", AdaptiveLimit(1), max_queue=1, queue_timeout=0.01)
+    assert await bulkhead.acquire()
+    assert not await bulkhead.acquire()
+    assert bulkhead.in_flight == 1
+    assert not bulkhead._waiters
+
+
+async def test_bulkhead_slot_handed_over_as_queue_times_out(monkeypatch: pytest.MonkeyPatch):
+    bulkhead = Bulkhead("test", AdaptiveLimit(1), max_queue=1, queue_timeout=1)
+    assert await bulkhead.acquire()
+
+    async def wait_for(future: asyncio.Future[None], timeout: float) -> None:  # noqa: ARG001
+        bulkhead.release()  # hands the slot to the waiter
+        future.cancel()
+        raise TimeoutError
+
+    monkeypatch.setattr(load_shedding.asyncio, "wait_for", wait_for)
+    assert await bulkhead.acquire()
+    assert bulkhead.in_flight == 1
+
+    bulkhead.release()
+    assert bulkhead.in_flight == 0
+
+
+@pytest.fixture(scope="function")
+def bulkheads() -> dict[str, Bulkhead]:
+    return {
+        "default": Bulkhead("default", AdaptiveLimit(10), max_queue=0),
+        "password": Bulkhead("password", AdaptiveLimit(1), max_queue=0),
+    }
+
+
+@pytest.fixture(scope="function")
+async def client(bulkheads: dict[str, Bulkhead]):
+    async def endpoint(_):
+        return PlainTextResponse("ok")
+
+    app = LoadSheddingMiddleware(
+        Starlette(routes=[Route("/", endpoint), Route("/sign-in", endpoint)]),
+        bulkheads=bulkheads,
+        routes={"/sign-in": "password"},
+    )
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+async def test_load_shedding_isolates_routes(client: httpx.AsyncClient, bulkheads: dict[str, Bulkhead]):
+    assert await bulkheads["password"].acquire()  # the sign-in bulkhead is busy
+
+    response = await client.get("/sign-in")
+    assert response.status_code == 503  # noqa: PLR2004
+    assert response.headers["Retry-After"] == "1"
+
+    assert (await client.get("/")).status_code == 200  # noqa: PLR2004
+
+
+async def test_load_shedding_when_pool_is_exhausted(client: httpx.AsyncClient):
+    with mock.patch.object(load_shedding, "pool_usage", return_value=1.0):
+        response = await client.get("/")
+    assert response.status_code == 503  # noqa: PLR2004
+
+
+async def test_load_shedding_feeds_pool_wait_to_the_limit(bulkheads: dict[str, Bulkhead]):
+    async def endpoint(_):
+        current_pool_wait().seconds += 1  # type: ignore[union-attr]  # as `TimedQueuePool` would
+        return PlainTextResponse("ok")
+
+    app = LoadSheddingMiddleware(Starlette(routes=[Route("/", endpoint)]), bulkheads=bulkheads, routes={})
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/")).status_code == 200  # noqa: PLR2004
+    assert bulkheads["default"].limit.limit == pytest.approx(9)
@@ -0,0 +1,74 @@
+from dataclasses import fields
+from unittest import mock
+
+import asyncpg
+import pytest
+
+from minerva.access_token.models import AccessToken
+from minerva.access_token.repository import AccessTokenRecord, AccessTokenRepository
+from minerva.access_token.service import AccessTokenService
+from minerva.core.config import settings
+from minerva.core.repository.exceptions import (
+    ConflictError,
+    DeadlineExceededError,
+    RepositoryError,
+    TransientError,
+)
+from minerva.core.repository.fast_path import driver_error_handler
+from minerva.users.models import User
+from minerva.users.repository import UserRecord
+from tests._factories import AccessTokenFactory
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        (asyncpg.exceptions.QueryCanceledError("canceled"), DeadlineExceededError),
+        (asyncpg.exceptions.SerializationError("serialization"), TransientError),
+        (asyncpg.exceptions.ConnectionDoesNotExistError("closed"), TransientError),
+        (ConnectionResetError(), TransientError),
+        (asyncpg.exceptions.UniqueViolationError("unique"), ConflictError),
+        (asyncpg.exceptions.UndefinedTableError("table"), RepositoryError),
+    ],
+)
+async def test_driver_error_handler(exc: Exception, expected: type[Exception]):
+    with pytest.raises(expected):
+        async with driver_error_handler():
+            raise exc
+
+
+@pytest.mark.parametrize(
+    ("record", "model"),
+    [(UserRecord, User), (AccessTokenRecord, AccessToken)],
+)
+def test_records_have_model_columns(record: type, model: type):
+    columns = {field.name for field in fields(record)} - {"user"}
+    assert columns == set(model.__table__.c.keys())
+
+
+async def test_get_record_with_user(
+    access_token_factory: type[AccessTokenFactory], access_token_repository: AccessTokenRepository
+):
+    token = await access_token_factory.create()
+
+    record = await access_token_repository.get_record_with_user(token.token)
+    assert record is not None
+    assert record.token == token.token
+    assert record.expiration_date == token.expiration_date
+    assert record.user.id == token.user_id
+    assert record.user.email == token.user.email
+
+
+async def test_get_record_with_user_none(access_token_repository: AccessTokenRepository):
+    assert await access_token_repository.get_record_with_user("missing") is None
+
+
+async def test_validate_access_token_fast_path(
+    access_token_factory: type[AccessTokenFactory], access_token_service: AccessTokenService
+):
+    token = await access_token_factory.create()
+
+    with mock.patch.object(settings, "DB_FAST_PATH", True):  # noqa: FBT003
+        record = await access_token_service.validate_access_token(token.token)
+    assert isinstance(record, AccessTokenRecord)
+    assert record.user.email == token.user.email
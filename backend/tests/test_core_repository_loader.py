@@ -0,0 +1,46 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from minerva.core.repository.loader import DataLoader
+
+
+async def test_data_loader_batches_loads_from_same_tick():
+    batch_load_fn = mock.AsyncMock(side_effect=lambda keys: [key * 10 for key in keys])
+    loader = DataLoader(batch_load_fn)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+
+    assert results == [10, 20, 10]
+    batch_load_fn.assert_awaited_once_with([1, 2])
+
+
+async def test_data_loader_load_many():
+    batch_load_fn = mock.AsyncMock(side_effect=lambda keys: [None if key == 2 else key for key in keys])  # noqa: PLR2004
+    loader = DataLoader(batch_load_fn)
+
+    assert await loader.load_many([1, 2, 3]) == [1, None, 3]
+    batch_load_fn.assert_awaited_once()
+
+
+async def test_data_loader_max_batch_size():
+    batch_load_fn = mock.AsyncMock(side_effect=lambda keys: keys)
+    loader = DataLoader(batch_load_fn, max_batch_size=2)
+
+    assert await loader.load_many([1, 2, 3]) == [1, 2, 3]
+    assert batch_load_fn.await_count == 2  # noqa: PLR2004
+
+
+async def test_data_loader_propagates_exception():
+    loader = DataLoader(mock.AsyncMock(side_effect=RuntimeError("boom")))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await asyncio.gather(loader.load(1), loader.load(2))
+
+
+async def test_data_loader_raises_on_wrong_number_of_values():
+    loader = DataLoader(mock.AsyncMock(return_value=[1]))
+
+    with pytest.raises(ValueError, match="must return 2 values"):
+        await loader.load_many([1, 2])
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from minerva.access_token.models import AccessToken
+from minerva.access_token.repository import AccessTokenRepository
+from minerva.core.repository.exceptions import RepositoryError
+from tests._factories import AccessTokenFactory
+
+
+class StrictAccessTokenRepository(AccessTokenRepository):
+    strict_loading = True
+
+
+async def test_relationship_is_not_loaded_by_default(
+    session: AsyncSession,
+    access_token_factory: type[AccessTokenFactory],
+    access_token_repository: AccessTokenRepository,
+):
+    access_token = await access_token_factory.create()
+    session.expunge_all()
+
+    token = await access_token_repository.get(access_token.token)
+    with pytest.raises(InvalidRequestError):
+        token.user  # noqa: B018
+
+
+@pytest.mark.parametrize("load", ["with_user", "joinedload", "selectinload", [selectinload(AccessToken.user)]])
+async def test_load_profiles(
+    load,
+    session: AsyncSession,
+    access_token_factory: type[AccessTokenFactory],
+    access_token_repository: AccessTokenRepository,
+):
+    access_token = await access_token_factory.create()
+    session.expunge_all()
+
+    token = await access_token_repository.get_one_or_none(access_token.token, load=load)
+    assert token is not None
+    assert token.user.id == access_token.user_id
+
+    [token] = await access_token_repository.list_(user_id=access_token.user_id, load=load)
+    assert token.user.id == access_token.user_id
+
+
+async def test_noload_profile(
+    session: AsyncSession,
+    access_token_factory: type[AccessTokenFactory],
+    access_token_repository: AccessTokenRepository,
+):
+    access_token = await access_token_factory.create()
+    session.expunge_all()
+
+    token = await access_token_repository.get_one(access_token.token, load="noload")
+    assert token.user is None
+
+
+async def test_strict_loading_raises_on_relationships_not_loaded(
+    session: AsyncSession, access_token_factory: type[AccessTokenFactory]
+):
+    access_token = await access_token_factory.create()
+    session.expunge_all()
+    repository = StrictAccessTokenRepository(session)
+
+    [token] = await repository.list_(user_id=access_token.user_id)
+    with pytest.raises(InvalidRequestError):
+        token.user  # noqa: B018
+
+    token = await repository.get(access_token.token, load="with_user")
+    assert token.user.id == access_token.user_id
+
+
+async def test_unknown_load_profile_raises_repository_error(access_token_repository: AccessTokenRepository):
+    with pytest.raises(RepositoryError, match="Unknown load profile 'unknown', expected one of: with_user, noload"):
+        await access_token_repository.list_(load="unknown")
@@ -1,11 +1,17 @@
 # ruff: noqa: ARG001
+import asyncio
+from dataclasses import dataclass
+from typing import NamedTuple
 from unittest import mock
 
 import pytest
-from sqlalchemy import select
+from pydantic import BaseModel
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from minerva.core.repository.exceptions import NotFoundError, RepositoryError
+from minerva.core.repository.filters import Filter
+from minerva.core.repository.projection import Projection
 from minerva.core.repository.sqlalchemy import SQLAlchemyRepository
 from tests._utils import TodoItem, TodoItemRepository
 from tests.conftest import DUMMY_COUNT
@@ -147,6 +153,55 @@ async def test_delete_many(session: AsyncSession, todo_item_repository: TodoItem
     assert items_from_db == []
 
 
+async def test_estimated_count(insert_dummy, session: AsyncSession, todo_item_repository: TodoItemRepository):
+    await session.execute(text("ANALYZE todo_items"))
+
+    with (
+        mock.patch.object(session, "execute", wraps=session.execute) as execute,
+        mock.patch.object(todo_item_repository, "count", wraps=todo_item_repository.count) as count,
+    ):
+        estimated_count = await todo_item_repository.estimated_count()
+    assert estimated_count == DUMMY_COUNT
+
+    execute.assert_called_once()  # only the `pg_class` lookup
+    assert "pg_class" in str(execute.call_args.args[0])
+    count.assert_not_called()
+
+
+async def test_estimated_count_not_analyzed_falls_back_to_count(
+    insert_dummy, session: AsyncSession, todo_item_repository: TodoItemRepository
+):
+    reltuples = (
+        await session.execute(text("SELECT reltuples FROM pg_class WHERE oid = 'todo_items'::regclass"))
+    ).scalar_one()
+    assert reltuples <= 0  # -1, or 0 before Postgres 14
+
+    with mock.patch.object(todo_item_repository, "count", wraps=todo_item_repository.count) as count:
+        estimated_count = await todo_item_repository.estimated_count()
+    assert estimated_count == DUMMY_COUNT
+    count.assert_awaited_once_with()
+
+
+async def test_estimated_count_empty_table_falls_back_to_count(
+    session: AsyncSession, todo_item_repository: TodoItemRepository
+):
+    await session.execute(text("ANALYZE todo_items"))
+
+    with mock.patch.object(todo_item_repository, "count", wraps=todo_item_repository.count) as count:
+        estimated_count = await todo_item_repository.estimated_count()
+    assert estimated_count == 0
+    count.assert_awaited_once_with()
+
+
+async def test_estimated_count_kwargs(
+    insert_dummy: list[TodoItem], session: AsyncSession, todo_item_repository: TodoItemRepository
+):
+    await session.execute(text("ANALYZE todo_items"))
+
+    estimated_count = await todo_item_repository.estimated_count(title=insert_dummy[0].title)
+    assert estimated_count == 1
+
+
 async def test_exists(session: AsyncSession, todo_item_repository: TodoItemRepository):
     item = TodoItem(
         title="Test exists",
@@ -185,6 +240,27 @@ async def test_get_raises_not_found(todo_item_repository: TodoItemRepository):
         await todo_item_repository.get(999999)
 
 
+async def test_get_many(insert_dummy: list[TodoItem], todo_item_repository: TodoItemRepository):
+    ids = [insert_dummy[2].id, 999999, insert_dummy[0].id, insert_dummy[2].id]
+
+    items = await todo_item_repository.get_many(ids)
+    assert [item.id if item else None for item in items] == ids[:1] + [None] + ids[2:]
+
+
+async def test_get_many_empty(todo_item_repository: TodoItemRepository):
+    assert await todo_item_repository.get_many([]) == []
+
+
+async def test_loader_batches_concurrent_loads(insert_dummy: list[TodoItem], todo_item_repository: TodoItemRepository):
+    ids = [item.id for item in insert_dummy[:5]]
+
+    with mock.patch.object(todo_item_repository, "get_many", wraps=todo_item_repository.get_many) as get_many:
+        items = await asyncio.gather(*(todo_item_repository.loader.load(item_id) for item_id in [*ids, 999999]))
+
+    get_many.assert_awaited_once_with([*ids, 999999])
+    assert [item.id if item else None for item in items] == [*ids, None]
+
+
 async def test_get_one_raises_not_found(
     session: AsyncSession,
     todo_item_repository: TodoItemRepository,
@@ -259,6 +335,157 @@ async def test_list_and_count(session: AsyncSession, todo_item_repository: TodoI
     assert count == len(items)
 
 
+async def test_list_filters(session: AsyncSession, todo_item_repository: TodoItemRepository):
+    items = [
+        TodoItem(
+            title=f"Test filters {i:02}",
+            description="test filters",
+            is_completed=i % 2 == 0,
+        )
+        for i in range(20)
+    ]
+    session.add_all(items)
+    await session.commit()
+
+    items_from_db = await todo_item_repository.list_(
+        filters=Filter(
+            where={"title__startswith": "Test filters 1", "is_completed": True},
+            order_by=["-title"],
+            limit=3,
+        )
+    )
+    assert [item.title for item in items_from_db] == ["Test filters 18", "Test filters 16", "Test filters 14"]
+
+
+async def test_list_and_count_filters_limit_does_not_apply_to_count(
+    session: AsyncSession, todo_item_repository: TodoItemRepository
+):
+    items = [TodoItem(title=f"Test filters {i}", description="test filters") for i in range(10)]
+    session.add_all(items)
+    await session.commit()
+
+    items_from_db, count = await todo_item_repository.list_and_count(
+        filters=Filter(where={"id__in": [item.id for item in items]}, order_by=["id"], limit=2)
+    )
+    assert [item.id for item in items_from_db] == [items[0].id, items[1].id]
+    assert count == len(items)
+
+
+async def test_filter_lookups(session: AsyncSession, todo_item_repository: TodoItemRepository):
+    items = [TodoItem(title=f"Test lookups {i}", description="test lookups") for i in range(10)]
+    session.add_all(items)
+    await session.commit()
+    ids = [item.id for item in items]
+
+    assert await todo_item_repository.count(id__gte=ids[2], id__lt=ids[5]) == 3  # noqa: PLR2004
+    assert await todo_item_repository.count(id__range=(ids[8], None)) == 2  # noqa: PLR2004
+    assert await todo_item_repository.count(id__in=ids, id__ne=ids[0]) == 9  # noqa: PLR2004
+    assert await todo_item_repository.count(title__startswith="Test lookups", description__is_null=True) == 0
+    assert await todo_item_repository.count(title__startswith="Test_lookups") == 0
+    assert await todo_item_repository.exists(filters=Filter(where={"id__not_in": ids[:9], "title__startswith": "Test"}))
+    assert not await todo_item_repository.exists(title__startswith="Test lookups 1", id__gt=ids[1])
+    assert (await todo_item_repository.get(ids[1], title__startswith="Test lookups")).id == ids[1]
+
+
+async def test_build_statement_reuses_template_per_filter_shape(todo_item_repository: TodoItemRepository):
+    statement, params = await todo_item_repository._build_statement("count", {"id__in": [1, 2], "title": "a"})
+    same_statement, same_params = await todo_item_repository._build_statement("count", {"id__in": [3], "title": "b"})
+    assert statement is same_statement
+    assert params == {"filter_0": [1, 2], "filter_1": "a"}
+    assert same_params == {"filter_0": [3], "filter_1": "b"}
+
+    other_shape, _ = await todo_item_repository._build_statement("count", {"title": "a", "id__in": [1, 2]})
+    assert other_shape is not statement
+
+    # SQL depending on the value or a custom statement are built on every call
+    for kwargs in (
+        {"description__is_null": True},
+        {"title": None},
+        {"statement": todo_item_repository.statement, "title": "a"},
+    ):
+        built, params = await todo_item_repository._build_statement("select", kwargs)  # type: ignore[arg-type]
+        rebuilt, _ = await todo_item_repository._build_statement("select", kwargs)  # type: ignore[arg-type]
+        assert built is not rebuilt
+        assert params == {}
+
+
+async def test_filter_unknown_attribute_raises_repository_error(todo_item_repository: TodoItemRepository):
+    with pytest.raises(RepositoryError, match="TodoItem has no attribute 'unknown' to filter by"):
+        await todo_item_repository.count(unknown__in=[1])
+
+    with pytest.raises(RepositoryError, match="TodoItem has no attribute 'unknown' to order by"):
+        await todo_item_repository.list_(filters=Filter(order_by=["-unknown"]))
+
+
+@dataclass(slots=True)
+class TodoItemRow:
+    id: int
+    title: str
+
+
+class TodoItemTuple(NamedTuple):
+    title: str
+    is_completed: bool
+
+
+class TodoItemSchema(BaseModel):
+    id: int
+    description: str
+
+
+async def test_list_projection(session: AsyncSession, todo_item_repository: TodoItemRepository):
+    items = [TodoItem(title=f"Test projection {i}", description="test projection") for i in range(3)]
+    session.add_all(items)
+    await session.commit()
+    session.expunge_all()
+
+    rows = await todo_item_repository.list_(projection=Projection(TodoItemRow), filters=Filter(order_by=["id"]))
+    assert rows == [TodoItemRow(id=item.id, title=item.title) for item in items]
+
+    tuples = await todo_item_repository.list_(projection=Projection(TodoItemTuple), title=items[0].title)
+    assert tuples == [TodoItemTuple(title=items[0].title, is_completed=False)]
+
+    schemas, count = await todo_item_repository.list_and_count(
+        projection=Projection(TodoItemSchema), filters=Filter(order_by=["-id"], limit=1)
+    )
+    assert schemas == [TodoItemSchema(id=items[-1].id, description="test projection")]
+    assert count == len(items)
+
+    # No ORM instances were loaded
+    assert len(session.identity_map) == 0
+
+
+async def test_list_projection_columns(session: AsyncSession, todo_item_repository: TodoItemRepository):
+    item = TodoItem(title="Test projection columns", description="test projection")
+    session.add(item)
+    await session.commit()
+
+    rows = await todo_item_repository.list_(
+        projection=Projection(TodoItemRow, columns=["title", "id"]), title="Test projection columns"
+    )
+    assert rows == [TodoItemRow(id=item.id, title=item.title)]
+
+
+async def test_get_projection(session: AsyncSession, todo_item_repository: TodoItemRepository):
+    item = TodoItem(title="Test get projection", description="test projection")
+    session.add(item)
+    await session.commit()
+
+    row = await todo_item_repository.get(item.id, projection=Projection(TodoItemRow))
+    assert row == TodoItemRow(id=item.id, title=item.title)
+
+    with pytest.raises(NotFoundError):
+        await todo_item_repository.get(999999, projection=Projection(TodoItemRow))
+
+
+async def test_projection_raises_repository_error(todo_item_repository: TodoItemRepository):
+    with pytest.raises(RepositoryError, match="Projection target must be a dataclass, NamedTuple or pydantic model"):
+        await todo_item_repository.list_(projection=Projection(dict))
+
+    with pytest.raises(RepositoryError, match="TodoItem has no attribute 'unknown' to project"):
+        await todo_item_repository.list_(projection=Projection(TodoItemRow, columns=["id", "unknown"]))
+
+
 async def test_update(session: AsyncSession, todo_item_repository: TodoItemRepository):
     item = TodoItem(title="Test update", description="test update desc", is_completed=False)
     session.add(item)
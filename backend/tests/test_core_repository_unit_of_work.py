@@ -0,0 +1,81 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from minerva.core.repository.unit_of_work import begin_unit_of_work, flush_unit_of_work, is_deferred
+from tests._utils import TodoItem, TodoItemRepository
+
+
+async def test_unit_of_work_stages_writes_until_flush(session: AsyncSession, todo_item_repository: TodoItemRepository):
+    begin_unit_of_work(session)
+
+    items = [TodoItem(title=f"Test unit of work {i}", description="test unit of work") for i in range(3)]
+    for item in items:
+        await todo_item_repository.create(item)
+    assert len(session.new) == len(items)
+
+    statements = await flush_unit_of_work(session)
+    assert statements == 1  # one batched INSERT
+    assert not session.new
+    assert not is_deferred(session)
+    assert all(item.id is not None for item in items)
+
+
+async def test_flush_unit_of_work_without_changes(session: AsyncSession):
+    begin_unit_of_work(session)
+    assert await flush_unit_of_work(session) == 0
+
+
+@contextmanager
+def _count_statements(session: AsyncSession) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:  # noqa: ARG001
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def test_unit_of_work_defers_update_many(session: AsyncSession, todo_item_repository: TodoItemRepository):
+    items = [TodoItem(title=f"Test update many {i}", description="test update many") for i in range(3)]
+    session.add_all(items)
+    await session.commit()
+
+    begin_unit_of_work(session)
+    for item in items:
+        item.is_completed = True
+
+    with _count_statements(session) as statements:
+        await todo_item_repository.update_many(items)
+        assert statements == []
+        assert len(session.dirty) == len(items)
+
+        count = await flush_unit_of_work(session)
+    assert count == len(statements) == 1  # one batched UPDATE
+    assert not session.dirty
+
+
+async def test_unit_of_work_defers_upsert_many(session: AsyncSession, todo_item_repository: TodoItemRepository):
+    item = TodoItem(title="Test upsert many", description="test upsert many")
+    session.add(item)
+    await session.commit()
+
+    begin_unit_of_work(session)
+    item.is_completed = True
+    new_items = [TodoItem(title=f"Test upsert many {i}", description="test upsert many") for i in range(3)]
+
+    with _count_statements(session) as statements:
+        instances = await todo_item_repository.upsert_many([item, *new_items])
+        assert statements == []
+
+        count = await flush_unit_of_work(session)
+    assert count == len(statements) == 2  # noqa: PLR2004  # one UPDATE, one batched INSERT
+    assert all(instance.id is not None for instance in instances)
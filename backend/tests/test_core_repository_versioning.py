@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from minerva.core.repository.exceptions import StaleVersionError
+from minerva.core.service import Service
+from minerva.core.service import exceptions as service_exceptions
+from tests._utils import VersionedTodoItem, VersionedTodoItemRepository
+
+
+@pytest.fixture(scope="function")
+async def versioned_item(session: AsyncSession) -> VersionedTodoItem:
+    item = VersionedTodoItem(title="Test versioning")
+    session.add(item)
+    await session.commit()
+    return item
+
+
+async def test_update_bumps_version(session: AsyncSession, versioned_item: VersionedTodoItem):
+    repository = VersionedTodoItemRepository(session)
+    assert versioned_item.version == 1
+
+    versioned_item.title = "Test versioning updated"
+    updated = await repository.update(versioned_item)
+    assert updated.version == 2  # noqa: PLR2004
+
+
+async def test_update_with_stale_version_raises(session: AsyncSession, versioned_item: VersionedTodoItem):
+    repository = VersionedTodoItemRepository(session)
+    versioned_item.title = "Test versioning first writer"
+    await repository.update(versioned_item)
+
+    stale = VersionedTodoItem(id=versioned_item.id, title="Test versioning second writer", version=1)
+    with pytest.raises(StaleVersionError):
+        await repository.update(stale)
+
+
+async def test_concurrent_write_is_detected_on_flush(session: AsyncSession, versioned_item: VersionedTodoItem):
+    repository = VersionedTodoItemRepository(session)
+    # Another transaction committed a write after `versioned_item` was read
+    await session.execute(
+        update(VersionedTodoItem)
+        .where(VersionedTodoItem.id == versioned_item.id)
+        .values(version=VersionedTodoItem.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    versioned_item.title = "Test versioning lost update"
+    with pytest.raises(StaleVersionError):
+        await repository.update(versioned_item)
+
+
+async def test_service_maps_stale_version(session: AsyncSession, versioned_item: VersionedTodoItem):
+    service = Service(VersionedTodoItemRepository(session))
+    stale = VersionedTodoItem(id=versioned_item.id, title="Test versioning stale", version=0)
+    with pytest.raises(service_exceptions.StaleVersionError):
+        await service.update(stale)
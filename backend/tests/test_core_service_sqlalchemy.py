@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from sqlalchemy.sql import select, text
 
@@ -47,6 +49,17 @@ async def test_service_sqlalchemy_delete_many(insert_dummy: list[TodoItem], todo
     await todo_item_service.delete_many([item.id for item in items])
 
 
+async def test_service_sqlalchemy_estimated_count(
+    session,
+    insert_dummy: list[TodoItem],  # noqa: ARG001
+    todo_item_service: TodoItemService,
+):
+    await session.execute(text("ANALYZE todo_items"))
+
+    estimated_count = await todo_item_service.estimated_count()
+    assert estimated_count == DUMMY_COUNT
+
+
 # TODO: is it possible to make repository.where rom kwargs type safe?
 async def test_service_sqlalchemy_exists(insert_dummy: list[TodoItem], todo_item_service: TodoItemService):
     item = insert_dummy[0]
@@ -112,6 +125,16 @@ async def test_service_sqlalchemy_list_and_count(insert_dummy: list[TodoItem], t
     assert items_and_count[1] == len(insert_dummy)
 
 
+async def test_service_sqlalchemy_load(insert_dummy: list[TodoItem], todo_item_service: TodoItemService):
+    items = await asyncio.gather(*(todo_item_service.load(item.id) for item in insert_dummy[:3]))
+    assert [item.id for item in items] == [item.id for item in insert_dummy[:3]]
+
+
+async def test_service_sqlalchemy_load_raises_not_found(todo_item_service: TodoItemService):
+    with pytest.raises(service_exceptions.NotFoundError):
+        await todo_item_service.load(99999)
+
+
 async def test_service_sqlalchemy_update(insert_dummy: list[TodoItem], todo_item_service: TodoItemService):
     item_ = insert_dummy[0]
     item_.title = "Updated"
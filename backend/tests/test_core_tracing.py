@@ -0,0 +1,93 @@
+from typing import Any
+from unittest import mock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from logfire.testing import CaptureLogfire
+from sqlalchemy import create_engine, text
+
+from minerva.core.tracing import TracingMiddleware, disable_tracing, enable_tracing, instrument_engine
+from minerva.users import security
+from tests._utils import TodoItem, TodoItemService
+
+
+@pytest.fixture(scope="function")
+def tracing(capfire: CaptureLogfire):
+    enable_tracing()
+    yield capfire
+    disable_tracing()
+
+
+def spans(capfire: CaptureLogfire, name: str) -> list[dict[str, Any]]:
+    return [span for span in capfire.exporter.exported_spans_as_dict() if span["name"] == name]
+
+
+@pytest.fixture(scope="function")
+def todo_item_service() -> TodoItemService:
+    repository = mock.AsyncMock()
+    repository.model = TodoItem
+    repository.list_.return_value = [TodoItem(title="a"), TodoItem(title="b")]
+    repository.list_and_count.return_value = ([TodoItem(title="a")], 1)
+    return TodoItemService(repository)
+
+
+async def test_service_methods_are_traced(tracing: CaptureLogfire, todo_item_service: TodoItemService):
+    await todo_item_service.list_()
+    await todo_item_service.list_and_count()
+
+    [list_span] = spans(tracing, "service.list_")
+    assert list_span["attributes"]["model"] == "TodoItem"
+    assert list_span["attributes"]["method"] == "list_"
+    assert list_span["attributes"]["rows"] == 2  # noqa: PLR2004
+    [list_and_count_span] = spans(tracing, "service.list_and_count")
+    assert list_and_count_span["attributes"]["rows"] == 1
+
+
+async def test_no_spans_when_disabled(capfire: CaptureLogfire, todo_item_service: TodoItemService):
+    await todo_item_service.list_()
+    security.get_password_hash("password")
+    assert not capfire.exporter.exported_spans_as_dict()
+
+
+def test_password_hashing_is_traced(tracing: CaptureLogfire):
+    hashed = security.get_password_hash("password")
+    assert security.verify_password("password", hashed)
+
+    assert spans(tracing, "argon2 hash")
+    assert spans(tracing, "argon2 verify")
+
+
+def test_sql_is_traced(tracing: CaptureLogfire):
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with pytest.raises(Exception, match="no such table"):
+            connection.execute(text("SELECT * FROM missing"))
+
+    ok, failed = spans(tracing, "sql")
+    assert ok["attributes"]["db_statement"] == "SELECT 1"
+    assert ok["attributes"]["db_system"] == "sqlite"
+    assert failed["events"][0]["name"] == "exception"
+
+
+async def test_request_is_traced(tracing: CaptureLogfire):
+    api = FastAPI()
+
+    @api.get("/items/{id}")
+    def item(id: int):  # noqa: A002
+        return {"id": id}
+
+    app = TracingMiddleware(api)
+    traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/items/1", headers={"traceparent": traceparent})
+    assert response.status_code == 200  # noqa: PLR2004
+
+    [span] = spans(tracing, "request")
+    assert span["attributes"]["http_method"] == "GET"
+    assert span["attributes"]["http_path"] == "/items/1"
+    assert span["attributes"]["http_route"] == "/items/{id}"
+    assert span["attributes"]["http_status_code"] == 200  # noqa: PLR2004
+    assert span["context"]["trace_id"] == int("0af7651916cd43dd8448eb211c80319c", 16)
@@ -0,0 +1,77 @@
+import time
+from unittest import mock
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from minerva.core.health import HealthProber, HealthStatus, Probe
+from minerva.main import app
+from tests._database import Session
+
+
+@pytest.fixture(scope="function")
+def probe():
+    with mock.patch("minerva.health.router.prober") as prober:
+        prober.is_fresh = True
+        prober.latest = Probe(HealthStatus.OK, time.monotonic(), db_latency=0.001)
+        yield prober
+
+
+@pytest.fixture(scope="function")
+def started():
+    app.state.ready = True
+    yield
+    app.state.ready = False
+
+
+async def test_live(client: AsyncClient):
+    response = await client.get("/health/live")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "ok"}
+
+
+async def test_ready(client: AsyncClient, probe, started):  # noqa: ARG001
+    response = await client.get("/health/ready")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["ready"] is True
+
+
+async def test_not_ready_before_startup(client: AsyncClient, probe):  # noqa: ARG001
+    response = await client.get("/health/ready")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["reason"] == "Starting up"
+
+
+async def test_not_ready_when_probe_is_stale(client: AsyncClient, probe, started):  # noqa: ARG001
+    probe.is_fresh = False
+    response = await client.get("/health/ready")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+async def test_degraded_is_still_ready(client: AsyncClient, probe, started):  # noqa: ARG001
+    probe.latest = Probe(HealthStatus.DEGRADED, time.monotonic(), db_latency=1.0, pool_usage=0.9)
+    response = await client.get("/health/ready")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "degraded"
+
+
+async def test_health_skips_authentication(client: AsyncClient, probe):  # noqa: ARG001
+    with mock.patch("minerva.core.middleware.authentication.AccessTokenService") as service:
+        await client.get("/health/live", headers={"Authentication": "token"})
+    service.assert_not_called()
+
+
+async def test_prober_probe():
+    prober = HealthProber(Session.session_factory.kw["bind"])
+    probe = await prober.probe()
+    assert probe.status in {HealthStatus.OK, HealthStatus.DEGRADED}
+    assert probe.db_latency is not None
+
+
+async def test_prober_reports_failures():
+    engine = mock.MagicMock()
+    engine.connect.side_effect = OSError("Connection refused")
+    probe = await HealthProber(engine).probe()
+    assert probe.status == HealthStatus.FAILING
+    assert "Connection refused" in probe.error  # type: ignore[operator]
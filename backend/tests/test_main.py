@@ -1,7 +1,15 @@
-from fastapi import status
+from fastapi import Request, status
 from httpx import AsyncClient
 
+from minerva.core.service.exceptions import StaleVersionError
+from minerva.main import stale_version_handler
+
 
 async def test_index(client: AsyncClient):
     response = await client.get("/")
     assert response.status_code == status.HTTP_200_OK
+
+
+async def test_stale_version_is_conflict():
+    response = await stale_version_handler(Request({"type": "http"}), StaleVersionError())
+    assert response.status_code == status.HTTP_409_CONFLICT
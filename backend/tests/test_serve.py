@@ -0,0 +1,55 @@
+import signal
+from unittest import mock
+
+from minerva import serve
+from minerva.core.middleware.drain import InFlightRequests
+from minerva.serve import Master, WorkerServer, parse_args, rss_bytes, worker_config
+
+
+def test_rss_bytes():
+    assert rss_bytes() > 0
+
+
+def test_worker_config():
+    config = worker_config(mock.MagicMock(), max_requests=1000, max_requests_jitter=100)
+    assert config.loop == "uvloop"
+    assert config.http == "httptools"
+    assert 1000 <= config.limit_max_requests <= 1100  # type: ignore[operator]  # noqa: PLR2004
+
+    assert worker_config(mock.MagicMock(), max_requests=0, max_requests_jitter=100).limit_max_requests is None
+
+
+async def test_worker_server_exits_above_memory_limit():
+    server = WorkerServer(worker_config(mock.MagicMock(), 0, 0), max_memory=1)
+    assert await server.on_tick(0) is True
+
+    server.max_memory = 0
+    assert await server.on_tick(0) is False
+
+
+async def test_worker_server_starts_draining_on_exit_signal():
+    server = WorkerServer(worker_config(mock.MagicMock(), 0, 0))
+    with mock.patch.object(serve, "in_flight", InFlightRequests()) as requests:
+        server.handle_exit(signal.SIGTERM, None)
+
+    assert requests.draining
+    assert server.should_exit
+
+
+def test_parse_args():
+    args = parse_args(["--workers", "4", "--max-requests", "10000", "--max-memory-mb", "512"])
+    assert (args.workers, args.max_requests, args.max_memory_mb) == (4, 10000, 512)
+
+
+def test_restart_replaces_new_workers_that_exit():
+    master = Master(mock.MagicMock(), mock.MagicMock(), parse_args(["--workers", "2"]))
+    master.workers = {1: 0.0, 2: 0.0, 3: 0.0, 4: 0.0}  # 1 and 2 are being replaced by 3 and 4
+
+    with (
+        mock.patch("os.waitpid", side_effect=[(1, 0), (3, 0), (0, 0)]),
+        mock.patch.object(master, "spawn") as spawn,
+    ):
+        master.reap(respawn_except={1, 2})
+
+    spawn.assert_called_once()
+    assert set(master.workers) == {2, 4}
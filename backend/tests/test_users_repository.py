@@ -1,6 +1,6 @@
 from faker import Faker
 
-from minerva.users.repository import UserRepository
+from minerva.users.repository import UserRecord, UserRepository
 from tests._factories import UserFactory
 
 fake = Faker()
@@ -17,3 +17,14 @@ async def test_get_one_or_none_by_email_email(user_factory: UserFactory, user_re
 async def test_get_one_or_none_by_email_none(user_repository: UserRepository):
     repo_user = await user_repository.get_one_or_none_by_email(fake.email())
     assert repo_user is None
+
+
+async def test_get_record_by_email(user_factory: UserFactory, user_repository: UserRepository):
+    user = await user_factory.create()
+
+    record = await user_repository.get_record_by_email(user.email)
+    assert record == UserRecord(user.id, user.email, user.hashed_password, user.created_at, user.updated_at)
+
+
+async def test_get_record_by_email_none(user_repository: UserRepository):
+    assert await user_repository.get_record_by_email(fake.email()) is None
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+from typing import Any
 from unittest import mock
 
 import freezegun
@@ -8,6 +9,10 @@ from httpx import AsyncClient
 
 from minerva.access_token.service import AccessTokenService
 from minerva.core.config import settings
+from minerva.core.db import retry
+from minerva.core.repository.exceptions import TransientError
+from minerva.users.models import User
+from minerva.users.repository import UserRepository
 from minerva.users.schemas import SignInResponse, UserRead
 from tests._factories import UserFactory
 
@@ -28,6 +33,32 @@ async def test_sign_up(client: AsyncClient):
     assert response_data["email"] == data["email"]
 
 
+async def test_sign_up_retries_transient_errors(client: AsyncClient):
+    create = UserRepository.create
+    calls = 0
+
+    async def flaky_create(self: UserRepository, *args: Any, **kwargs: Any) -> User:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise TransientError(sqlstate="40001")
+        return await create(self, *args, **kwargs)
+
+    data = {"email": fake.email(), "password": PASSWORD}
+    with (
+        mock.patch.object(UserRepository, "create", flaky_create),
+        mock.patch.object(retry, "stats", retry.RetryStats()),
+        mock.patch.object(retry, "backoff", return_value=0),
+    ):
+        response = await client.post("/users/sign-up", json=data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["email"] == data["email"]
+        assert calls == 2  # noqa: PLR2004
+        assert retry.stats.retries == 1
+        assert retry.stats.recovered == 1
+
+
 async def test_sign_up_checks_password_complexity(client: AsyncClient):
     data = {"email": fake.email(), "password": "abc123"}
     response = await client.post("/users/sign-up", json=data)
@@ -1,7 +1,11 @@
+from typing import Any
+from unittest import mock
+
 import pytest
 from faker import Faker
 
-from minerva.users.exceptions import EmailAlreadyExistsError
+from minerva.users import security
+from minerva.users.exceptions import EmailAlreadyExistsError, UserNotFoundError, WrongPasswordError
 from minerva.users.schemas import UserSignUpIn
 from minerva.users.security import verify_password
 from minerva.users.service import UserService
@@ -23,6 +27,30 @@ async def test_get_one_or_none_by_email_none(user_service: UserService):
     assert service_user is None
 
 
+async def test_authenticate(user_factory: UserFactory, user_service: UserService):
+    user = await user_factory.create()
+    session = user_service.repository.session
+
+    def verify_password(*args: Any, **kwargs: Any) -> bool:
+        assert not session.in_transaction()  # the connection is not held during the hashing
+        return security.verify_password(*args, **kwargs)
+
+    with mock.patch.object(security, "verify_password", verify_password):
+        authenticated = await user_service.authenticate(user.email, UserFactory._default_password)
+    assert authenticated.id == user.id
+
+
+async def test_authenticate_raises_user_not_found_error(user_service: UserService):
+    with pytest.raises(UserNotFoundError):
+        await user_service.authenticate(fake.email(), UserFactory._default_password)
+
+
+async def test_authenticate_raises_wrong_password_error(user_factory: UserFactory, user_service: UserService):
+    user = await user_factory.create()
+    with pytest.raises(WrongPasswordError):
+        await user_service.authenticate(user.email, "wrong password")
+
+
 async def test_create_from_schema(user_service: UserService):
     password = "password123!@#"  # noqa: S105
     schema = UserSignUpIn(email=fake.email(), password=password)